@@ -6,8 +6,30 @@ minimax search algorithm. The evaluation function considers multiple factors
 including material advantage, king positioning, and board control.
 """
 
-from constants import BLACK, RED, ROWS, COLS
-from checker import GameState, Move
+import math
+import time
+
+from constants import BLACK, RED
+from checker import GameState, Move, NodeStatus
+from bitboard import BitBoard
+from evaluation import MOBILITY
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from ordering import MoveOrderer, MAX_PLY
+
+# Iterative deepening never goes deeper than this, even with time left
+MAX_SEARCH_DEPTH = 64
+
+# Scores of a won and a lost game; every evaluation lies strictly between
+SCORE_MAX = 1000
+SCORE_MIN = -SCORE_MAX
+
+# Half-width of the PVS aspiration window around the previous iteration's
+# score (a third of a man)
+ASPIRATION_WINDOW = 2.0
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move time budget runs out."""
 
 
 class Agent:
@@ -18,9 +40,38 @@ class Agent:
       color: The color of pieces this agent controls (BLACK or RED)
       depth: How many moves ahead the agent should search (default: 4)
       game_state: GameState instance for move generation and evaluation
+      movetime: Seconds per move for iterative deepening, or None for fixed depth
+      tt: Transposition table shared by every search of this agent
+      orderer: Move ordering (killer moves and history) used by minimax
+      move_buffers: One reusable packed-move list per ply of the search
+      parallel: ParallelRootSearch splitting root moves over processes, or None
+      smp: LazySMP helpers sharing this agent's transposition table, or None
+      stop_event: multiprocessing.Event that aborts the search when set, or None
+      profiler: SearchProfiler timing the phases of each search, or None
+      tablebase: Endgame Tablebase probed by minimax, or None
+      book: OpeningBook consulted before searching, or None
+      star2: Whether expectimax chance nodes probe their children first
+      quiescence_depth: Plies minimax searches captures past its depth
+      last_score: Score of the last move chosen (searched, or from the book
+                  or tablebase), where MTD(f) starts
     """
 
-    def __init__(self, color, depth=4, search_type="minimax"):
+    def __init__(
+        self,
+        color,
+        depth=4,
+        search_type="minimax",
+        tt_size=1 << 18,
+        movetime=None,
+        workers=1,
+        parallel_mode="root",
+        profile=False,
+        tablebase=None,
+        book=None,
+        book_rng=None,
+        star2=False,
+        quiescence=0,
+    ):
         """
         Initialize the AI agent.
 
@@ -29,15 +80,103 @@ class Agent:
           depth: Search depth for minimax algorithm (default: 4)
                  Higher depth = stronger play but slower decisions
                  Recommended range: 3-6
+          search_type: "minimax", "expectimax", "pvs" (principal
+                 variation search) or "mtdf" (null-window searches only);
+                 pvs and mtdf give the same result as minimax, see pvs()
+                 and mtdf()
+          tt_size: Number of transposition table entries (default: 262144)
+          movetime: Wall-clock budget per move in seconds (default: None).
+                    When set, the agent deepens iteratively until the budget
+                    runs out and `depth` is ignored.
+          workers: Number of processes to search with (default: 1).
+                   The chosen move is the same as with a single process.
+          parallel_mode: How `workers` > 1 processes share the work:
+                   "root" splits the root moves across them, "lazy_smp" runs
+                   workers - 1 helpers on the whole tree that share one
+                   transposition table with this agent (not for expectimax)
+          profile: Time the phases of every search and count nodes per ply
+                   (default: False). The results are added to
+                   get_statistics(); searching is slower while profiling.
+          tablebase: Endgame tablebase directory (or a tablebase.Tablebase)
+                   with exact results for positions with few pieces
+                   (default: None). Minimax returns a win or loss score for
+                   covered positions without searching them, and plays won
+                   and lost root positions by distance to the end.
+          book: Opening book file (or a book.OpeningBook) (default: None).
+                While the position is in the book its move is played
+                without searching.
+          book_rng: random.Random for a weighted random choice among book
+                moves (default: None, always the highest-weight move)
+          star2: Let expectimax chance nodes probe one move of every child
+                for a lower bound before searching them (default: False)
+          quiescence: Most plies minimax searches on past `depth` while
+                the side to move has captures, instead of evaluating in the
+                middle of an exchange (default: 0, off). See quiescence().
         """
         self.color = color
         self.depth = depth
         self.search_type = search_type
+        self.star2 = star2
+        if not 0 <= quiescence < MAX_PLY - MAX_SEARCH_DEPTH:
+            raise ValueError(f"Quiescence depth out of range: {quiescence}")
+        self.quiescence_depth = quiescence
+        self.movetime = movetime
         self.game_state = GameState()
+        self.tt = TranspositionTable(tt_size)
+        self.orderer = MoveOrderer()
+        self.move_buffers = [[] for _ in range(MAX_PLY)]
+        self.parallel = None
+        self.smp = None
+        self.stop_event = None
+        if parallel_mode not in ("root", "lazy_smp"):
+            raise ValueError(f"Unknown parallel mode: {parallel_mode}")
+        if workers > 1 and parallel_mode == "root":
+            from parallel import ParallelRootSearch
+
+            self.parallel = ParallelRootSearch(self, workers)
+        elif workers > 1:
+            if search_type == "expectimax":
+                raise ValueError("Lazy SMP needs the transposition table of minimax, PVS or MTD(f)")
+            from smp import LazySMP
+
+            self.smp = LazySMP(self, workers - 1)
+
+        if isinstance(tablebase, str):
+            from tablebase import Tablebase
+
+            tablebase = Tablebase(tablebase)
+        self.tablebase = tablebase
+
+        if isinstance(book, str):
+            from book import OpeningBook
+
+            book = OpeningBook(book)
+        self.book = book
+        self.book_rng = book_rng
+
+        self.profiler = None
+        if profile:
+            from instrumentation import SearchProfiler, ProfilingGameState
+
+            self.profiler = SearchProfiler()
+            self.game_state = ProfilingGameState(self.profiler)
+            self.evaluate = self.profiler.timed("eval", self.evaluate)
+            self.get_best_move = self.profiler.search(self.get_best_move)
+
+        self.last_score = 0
+
+        # perf_counter() time at which the running search must stop, if any
+        self._deadline = None
 
         # Statistics for analysis (can be logged later)
         self.nodes_explored = 0
         self.pruning_count = 0
+        self.tt_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.depth_reached = 0
+        self.helper_nodes = 0
+        self.tablebase_hits = 0
+        self.book_move = False
 
     def evaluate(self, board):
         """
@@ -53,137 +192,46 @@ class Agent:
         7. Non-edge penalty: Minor penalty for pieces not on edges/corners to discourage overexposure
         8. Advanced king positioning: Kings further toward opponent's back row are more threatening
 
+        The weights live in evaluation.py. All factors except mobility are
+        maintained incrementally by the BitBoard, so a call costs two mobility
+        counts plus a few additions.
+
         Args:
-          board: The Board object to evaluate
+          board: The Board or BitBoard to evaluate
 
         Returns:
           float: Positive score favors this agent, negative favors opponent
                  Score range typically: -100 to +100
         """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+
         # Get opponent color
         opponent_color = RED if self.color == BLACK else BLACK
 
-        # Get all pieces for both players
-        my_pieces = self.game_state.get_all_pieces(self.color, board)
-        opp_pieces = self.game_state.get_all_pieces(opponent_color, board)
-
-        # Material Score: Count pieces with kings worth more
-        my_material = 0
-        opp_material = 0
-
-        for piece in my_pieces:
-            if piece.king:
-                my_material += 1.5  # Kings are worth 1.5x regular pieces
-            else:
-                my_material += 1.0
-
-        for piece in opp_pieces:
-            if piece.king:
-                opp_material += 1.5
-            else:
-                opp_material += 1.0
-
-        material_score = (my_material - opp_material) * 6
-
-        # Positional Score: Reward pieces closer to promotion
-        positional_score = 0
-
-        for piece in my_pieces:
-            if not piece.king:
-                if self.color == BLACK:
-                    # BLACK moves toward row 7
-                    positional_score += piece.row * 0.5
-                else:
-                    # RED moves toward row 0
-                    positional_score += (ROWS - 1 - piece.row) * 0.5
-
-        for piece in opp_pieces:
-            if not piece.king:
-                if opponent_color == BLACK:
-                    positional_score -= piece.row * 0.5
-                else:
-                    positional_score -= (ROWS - 1 - piece.row) * 0.5
-
-        # King Count: Additional bonus for having kings
-        my_kings = sum(1 for p in my_pieces if p.king)
-        opp_kings = sum(1 for p in opp_pieces if p.king)
-        king_score = (my_kings - opp_kings) * 5
+        # Factors 1-3 and 5-8 depend only on where each piece stands; the
+        # board keeps their piece-square sums up to date as moves are made
+        if self.color == BLACK:
+            static_score = board.balance + board.own_black
+        else:
+            static_score = -board.balance + board.own_red
 
         # Mobility Score: More available moves = better position
-        my_moves = self.game_state.get_legal_actions(self.color, board)
-        opp_moves = self.game_state.get_legal_actions(opponent_color, board)
-
-        my_move_count = len(my_moves) if my_moves else 0
-        opp_move_count = len(opp_moves) if opp_moves else 0
-
-        mobility_score = (my_move_count - opp_move_count) * 0.5
-
-
-        # Center Control: Pieces in center squares are more valuable
-        center_score = 0
-        center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
-
-        for piece in my_pieces:
-            if (piece.row, piece.col) in center_squares:
-                center_score += 2
-
-        for piece in opp_pieces:
-            if (piece.row, piece.col) in center_squares:
-                center_score -= 2
-
-        # Corner and Edge Safety: Pieces on corners and edges are much safer and at less risk to be captured
-
-        edge_bonus = 0
-        corner_bonus = 0
-        non_edge_penalty = 0
+        mobility = board.count_moves(self.color) - board.count_moves(opponent_color)
 
-        for piece in my_pieces:
-            row, col = piece.row, piece.col
+        # Scores are kept in tenths of a point so the sums stay exact
+        return (static_score + MOBILITY * mobility) / 10
 
-            # if the piece is on an edge
-            if col == 0 or col == COLS - 1:
-                edge_bonus += 1
-
-            elif (row,col) in [(0,0, (0, COLS-1), (ROWS-1,0), (ROWS-1, COLS-1))]:
-                corner_bonus += 3
-
-            else:
-                if not piece.king:
-                    non_edge_penalty -= 0.5
-
-
-        edge_corner_score = edge_bonus + corner_bonus
-
-        # King Bonus: reward king pieces that are closer to the opponet's back row to make more threatening moves
-        king_position_score = 0
-
-        for piece in my_pieces:
-            if piece.king:
-                # toggle between color since color of agent determines how "far back" you are on the board
-                # reward further back rows
-
-                if self.color == BLACK:
-                    king_position_score += piece.row * 0.3
-                else:
-                    king_position_score += ((ROWS-1) - piece.row) * 0.3
-
-
-
-        # Total evaluation
-        total_score = (
-            material_score
-            + positional_score
-            + king_score
-            + mobility_score
-            + center_score
-            + edge_corner_score
-            + non_edge_penalty
-            + king_position_score
-        )
+    def _check_deadline(self):
+        # Reading the clock every node is too slow; check every 1024 nodes
+        if self.nodes_explored & 1023:
+            return
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
 
-        return total_score
-
-    def minimax(self, board, depth, alpha, beta, maximizing_player):
+    def minimax(self, board, depth, alpha, beta, maximizing_player, ply=1):
         """
         Minimax algorithm with alpha-beta pruning for optimal move selection.
 
@@ -194,90 +242,331 @@ class Agent:
         Alpha-beta pruning significantly reduces the number of nodes explored
         by eliminating branches that cannot affect the final decision.
 
+        Every searched node is stored in the transposition table and probed
+        before searching. Stored bounds are only used for cutoffs at the same
+        remaining depth, so a table hit never changes the result of a
+        fixed-depth search; entries of any depth still supply the best move,
+        which is searched first. The remaining moves are ordered by the
+        agent's MoveOrderer: captures and promotions, killer moves, then
+        history.
+
         Args:
-          board: Current board state to evaluate
+          board: Current BitBoard position (moves are made and unmade in place)
           depth: Remaining search depth (counts down to 0)
           alpha: Best value maximizer can guarantee (used for pruning)
           beta: Best value minimizer can guarantee (used for pruning)
           maximizing_player: True if current player is maximizing, False otherwise
+          ply: Distance from the root (root moves lead to ply 1)
 
         Returns:
           float: The evaluation score of the best move from this position
         """
         self.nodes_explored += 1
+        self._check_deadline()
 
         # Determine current player color based on maximizing/minimizing
         current_color = (
             self.color if maximizing_player else (RED if self.color == BLACK else BLACK)
         )
 
+        # Endgame tablebase: the exact result, whatever the remaining depth
+        if self.tablebase is not None:
+            result = self.tablebase.probe_board(board, current_color)
+            if result is not None:
+                self.tablebase_hits += 1
+                return self._terminal_score(result[0], current_color)
+
         # Reached maximum depth
         if depth == 0:
+            if self.quiescence_depth:
+                return self.quiescence(
+                    board, alpha, beta, maximizing_player, self.quiescence_depth, ply
+                )
             return self.evaluate(board)
 
-        # Game is over (win, loss, or draw)
-        if self.game_state.is_terminal(current_color, board):
-            # Heavily reward wins, penalize losses
-            if self.game_state.is_win(current_color, board):
-                # If it's our agent winning, return large positive value
-                return 1000 if current_color == self.color else -1000
-            elif self.game_state.is_lose(current_color, board):
-                # If it's our agent losing, return large negative value
-                return -1000 if current_color == self.color else 1000
-            else:
-                # Draw
-                return 0
-        
-        # Get all legal moves
-        moves = self.game_state.get_legal_actions(current_color, board)
+        # Transposition table: reuse a result for this position if we have one
+        key = board.key(current_color)
+        cutoff, alpha, beta, tt_move = self._probe_tt(key, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
 
-        if not moves:
-            # No legal moves available (should be caught by is_terminal, but safety check)
-            return -1000 if maximizing_player else 1000
+        # Get all legal moves and check whether the game is over (win, loss, or draw)
+        moves = self.move_buffers[ply]
+        status = self.game_state.get_packed_node_status(current_color, board, moves)
+        if status != NodeStatus.ONGOING:
+            return self._terminal_score(status, current_color)
+
+        # Table move, captures and promotions, killers, then history
+        self.orderer.order(board, current_color, moves, ply, tt_move)
+
+        # Window this node is searched with, for classifying the result
+        alpha_searched, beta_searched = alpha, beta
+        best_move = None
 
         if maximizing_player:
             # Maximizing player: try to maximize the score
             max_eval = float("-inf")
 
-            for move in moves:
-                successor_board = self.game_state.generate_successor(board, move)
+            for i, move in enumerate(moves):
+                # Play the move in place, search it, then take it back
+                self.game_state.make_packed_move(board, move)
+                eval_score = self.minimax(board, depth - 1, alpha, beta, False, ply + 1)
+                self.game_state.unmake_move(board)
 
-                # Recursively evaluate this move
-                eval_score = self.minimax(
-                    successor_board, depth - 1, alpha, beta, False
-                )
-
-                max_eval = max(max_eval, eval_score)
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = move
                 alpha = max(alpha, eval_score)
 
                 # Beta cutoff
                 if beta <= alpha:
-                    self.pruning_count += 1
+                    self._record_cutoff(current_color, move, depth, ply, i)
                     break
 
-            return max_eval
+            best_eval = max_eval
 
         else:
             # Minimizing player: try to minimize the score
             min_eval = float("inf")
 
-            for move in moves:
-                successor_board = self.game_state.generate_successor(board, move)
+            for i, move in enumerate(moves):
+                # Play the move in place, search it, then take it back
+                self.game_state.make_packed_move(board, move)
+                eval_score = self.minimax(board, depth - 1, alpha, beta, True, ply + 1)
+                self.game_state.unmake_move(board)
 
-                # Recursively evaluate this move
-                eval_score = self.minimax(successor_board, depth - 1, alpha, beta, True)
-
-                min_eval = min(min_eval, eval_score)
+                if eval_score < min_eval:
+                    min_eval = eval_score
+                    best_move = move
                 beta = min(beta, eval_score)
 
                 # Alpha cutoff
                 if beta <= alpha:
-                    self.pruning_count += 1
+                    self._record_cutoff(current_color, move, depth, ply, i)
                     break
 
-            return min_eval
+            best_eval = min_eval
+
+        if best_eval <= alpha_searched:
+            flag = UPPER
+        elif best_eval >= beta_searched:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, best_eval, flag, best_move)
+
+        return best_eval
+
+    def quiescence(self, board, alpha, beta, maximizing_player, depth, ply):
+        """
+        Score a node at the search horizon, resolving pending captures first.
+
+        Captures are mandatory, so a side that can capture has only capture
+        moves, and a static score taken in the middle of an exchange misses
+        the pieces about to change hands. Such a node searches its captures
+        with alpha-beta, each child being a quiescence node again, for at
+        most `depth` more plies. A quiet node (no capture for the side to
+        move), or one where the extension is used up, stands pat: its score
+        is evaluate(). Quiescence nodes are not stored in the transposition
+        table.
+
+        The caller has already counted this node in nodes_explored; the
+        captured children are counted here.
+
+        Args:
+          board: Current BitBoard position (moves are made and unmade in place)
+          alpha, beta: Search window, as in minimax
+          maximizing_player: True if the agent is to move
+          depth: Capture plies this node may still search
+          ply: Distance from the root
+
+        Returns:
+          float: Score of the position after the capture sequence
+        """
+        current_color = (
+            self.color if maximizing_player else (RED if self.color == BLACK else BLACK)
+        )
+        if depth == 0 or not board.jumpers(current_color):
+            return self.evaluate(board)
+
+        # Every legal move captures; the game may still be drawn by rule
+        moves = self.move_buffers[ply]
+        status = self.game_state.get_packed_node_status(current_color, board, moves)
+        if status != NodeStatus.ONGOING:
+            return self._terminal_score(status, current_color)
+        self.orderer.order(board, current_color, moves, ply)
+
+        best_eval = float("-inf") if maximizing_player else float("inf")
+        for i, move in enumerate(moves):
+            self.nodes_explored += 1
+            self._check_deadline()
+
+            self.game_state.make_packed_move(board, move)
+            eval_score = self.quiescence(
+                board, alpha, beta, not maximizing_player, depth - 1, ply + 1
+            )
+            self.game_state.unmake_move(board)
+
+            if maximizing_player:
+                best_eval = max(best_eval, eval_score)
+                alpha = max(alpha, eval_score)
+            else:
+                best_eval = min(best_eval, eval_score)
+                beta = min(beta, eval_score)
+            if beta <= alpha:
+                self._record_cutoff(current_color, move, 0, ply, i)
+                break
+
+        return best_eval
+
+    def _terminal_score(self, status, current_color):
+        """Score of a finished game; `status` is from `current_color`'s point of view."""
+        if status == NodeStatus.DRAW:
+            return 0
+        # Heavily reward wins, penalize losses
+        won = (status == NodeStatus.WIN) == (current_color == self.color)
+        return SCORE_MAX if won else SCORE_MIN
+
+    def _probe_tt(self, key, depth, alpha, beta):
+        """
+        Look up a position in the transposition table before searching it.
+
+        Only an entry searched to exactly `depth` is used: an exact score,
+        or a bound that closes the window, is returned as the node's score,
+        and any other bound narrows the window. The entry's best move is
+        returned whatever its depth, to be searched first.
+
+        Returns:
+          tuple: (score, alpha, beta, tt_move); score is None unless the
+                 entry settles the node
+        """
+        entry = self.tt.probe(key)
+        if entry is None:
+            return None, alpha, beta, None
+        _, entry_depth, entry_score, entry_flag, tt_move, _ = entry
+        if entry_depth == depth:
+            if entry_flag == EXACT:
+                self.tt_cutoffs += 1
+                return entry_score, alpha, beta, tt_move
+            elif entry_flag == LOWER:
+                alpha = max(alpha, entry_score)
+            else:
+                beta = min(beta, entry_score)
+            if beta <= alpha:
+                self.tt_cutoffs += 1
+                return entry_score, alpha, beta, tt_move
+        return None, alpha, beta, tt_move
+
+    def _record_cutoff(self, color, move, depth, ply, move_index):
+        self.pruning_count += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+        self.orderer.record_cutoff(color, move, depth, ply)
+
+    def pvs(self, board, depth, alpha, beta, maximizing_player, ply=1):
+        """
+        Principal variation search: alpha-beta in negamax form that tries to
+        prove, rather than measure, that later moves are worse.
+
+        The first (best-ordered) move of a node is searched with the full
+        window. Every later move is first searched with a null window just
+        above alpha, which only tells whether it beats alpha and cuts off
+        much more; only a move that does is searched again with the full
+        window to get its score. With good move ordering few moves need
+        the second search.
+
+        Scores are for the side to move (the agent's score negated when the
+        opponent is to move), so every level maximizes. The result equals
+        minimax's over the same window: the transposition table, move
+        ordering, tablebase and quiescence are used the same way, and
+        table entries hold side-to-move scores.
+
+        Args:
+          board: Current BitBoard position (moves are made and unmade in place)
+          depth: Remaining search depth (counts down to 0)
+          alpha, beta: Search window, for the side to move
+          maximizing_player: True if the agent is to move
+          ply: Distance from the root (root moves lead to ply 1)
+
+        Returns:
+          float: The score of the position for the side to move
+        """
+        self.nodes_explored += 1
+        self._check_deadline()
+
+        current_color = (
+            self.color if maximizing_player else (RED if self.color == BLACK else BLACK)
+        )
+        sign = 1 if maximizing_player else -1
+
+        # Endgame tablebase: the exact result, whatever the remaining depth
+        if self.tablebase is not None:
+            result = self.tablebase.probe_board(board, current_color)
+            if result is not None:
+                self.tablebase_hits += 1
+                return sign * self._terminal_score(result[0], current_color)
+
+        if depth == 0:
+            if not self.quiescence_depth:
+                return sign * self.evaluate(board)
+            if maximizing_player:
+                return self.quiescence(board, alpha, beta, True, self.quiescence_depth, ply)
+            return -self.quiescence(board, -beta, -alpha, False, self.quiescence_depth, ply)
+
+        # Transposition table: reuse a result for this position if we have one
+        key = board.key(current_color)
+        cutoff, alpha, beta, tt_move = self._probe_tt(key, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
+
+        moves = self.move_buffers[ply]
+        status = self.game_state.get_packed_node_status(current_color, board, moves)
+        if status != NodeStatus.ONGOING:
+            return sign * self._terminal_score(status, current_color)
+
+        self.orderer.order(board, current_color, moves, ply, tt_move)
+
+        alpha_searched, beta_searched = alpha, beta
+        best_score = float("-inf")
+        best_move = None
+
+        for i, move in enumerate(moves):
+            self.game_state.make_packed_move(board, move)
+            if i == 0:
+                score = -self.pvs(board, depth - 1, -beta, -alpha, not maximizing_player, ply + 1)
+            else:
+                # Null window: no score lies strictly between alpha and its successor
+                null_beta = math.nextafter(alpha, math.inf)
+                score = -self.pvs(
+                    board, depth - 1, -null_beta, -alpha, not maximizing_player, ply + 1
+                )
+                if alpha < score < beta:
+                    score = -self.pvs(
+                        board, depth - 1, -beta, -alpha, not maximizing_player, ply + 1
+                    )
+            self.game_state.unmake_move(board)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self._record_cutoff(current_color, move, depth, ply, i)
+                break
+
+        if best_score <= alpha_searched:
+            flag = UPPER
+        elif best_score >= beta_searched:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, best_score, flag, best_move)
+
+        return best_score
 
-    def expectimax(self, board, depth, maximizing_player):
+    def expectimax(
+        self, board, depth, maximizing_player, alpha=-math.inf, beta=math.inf, ply=1
+    ):
         """
         Expectimax algorithm for decision making.
 
@@ -288,15 +577,32 @@ class Agent:
         The search alternates between maximizing player nodes and chance
         nodes, and returns the expected evaluation for the present position.
 
+        Both node types are pruned against an (alpha, beta) window. Max
+        nodes cut off like alpha-beta. Chance nodes use the fact that every
+        score lies between SCORE_MIN and SCORE_MAX (the terminal scores):
+        after some children are searched, the average is bounded by assuming
+        the worst and best values for the rest, and the node stops as soon
+        as that bound leaves the window (Star1). With `star2`, chance nodes
+        first probe one move of each child for a lower bound, which can cut
+        off before any child is searched fully and tightens the Star1 bounds
+        (Star2). Values are stored in the transposition table like minimax
+        results, for max and chance nodes alike.
+
+        A value strictly inside the window is exact; otherwise it is a bound
+        on the same side of the window as the exact value.
+
         Args:
-          board: Current board state to evaluate
+          board: Current BitBoard position (moves are made and unmade in place)
           depth: Remaining search depth (counts down to 0)
           maximizing_player: True if current node is for the maximizing player
+          alpha, beta: Search window (default: unbounded)
+          ply: Distance from the root (root moves lead to ply 1)
 
         Returns:
           float: The expected evaluation score of the position
         """
         self.nodes_explored += 1
+        self._check_deadline()
 
         current_color = (
             self.color if maximizing_player else (RED if self.color == BLACK else BLACK)
@@ -306,33 +612,116 @@ class Agent:
         if depth == 0:
             return self.evaluate(board)
 
-        if self.game_state.is_terminal(current_color, board):
-            if self.game_state.is_win(current_color, board):
-                return 1000 if current_color == self.color else -1000
-            elif self.game_state.is_lose(current_color, board):
-                return -1000 if current_color == self.color else 1000
-            else:
-                return 0
+        # Transposition table: reuse a result for this position if we have one
+        key = board.key(current_color)
+        cutoff, alpha, beta, tt_move = self._probe_tt(key, depth, alpha, beta)
+        if cutoff is not None:
+            return cutoff
 
-        moves = self.game_state.get_legal_actions(current_color, board)
-        if not moves:
-            return -1000 if maximizing_player else 1000
+        moves = self.move_buffers[ply]
+        status = self.game_state.get_packed_node_status(current_color, board, moves)
+        if status != NodeStatus.ONGOING:
+            return self._terminal_score(status, current_color)
+
+        alpha_searched, beta_searched = alpha, beta
+        best_move = None
 
         if maximizing_player:
-            best = float("-inf")
-            for move in moves:
-                succ = self.game_state.generate_successor(board, move)
-                val = self.expectimax(succ, depth - 1, False)
-                if val > best:
-                    best = val
-            return best
+            self.orderer.order(board, current_color, moves, ply, tt_move)
+            value = float("-inf")
+            for i, move in enumerate(moves):
+                self.game_state.make_packed_move(board, move)
+                val = self.expectimax(board, depth - 1, False, max(alpha, value), beta, ply + 1)
+                self.game_state.unmake_move(board)
+                if val > value:
+                    value = val
+                    best_move = move
+                if value >= beta:
+                    self._record_cutoff(current_color, move, depth, ply, i)
+                    break
         else:
             # Chance node: average value of successors
-            total = 0.0
-            for move in moves:
-                succ = self.game_state.generate_successor(board, move)
-                total += self.expectimax(succ, depth - 1, True)
-            return total / len(moves)
+            value = self._chance_node(board, depth, moves, alpha, beta, ply)
+
+        if value <= alpha_searched:
+            flag = UPPER
+        elif value >= beta_searched:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, value, flag, best_move)
+
+        return value
+
+    def _chance_node(self, board, depth, moves, alpha, beta, ply):
+        """
+        Average value of the successors of a chance node, pruned by Star1/Star2.
+
+        Children are averaged in generation order, so an exact result is the
+        same float the unpruned average gives.
+        """
+        n = len(moves)
+        # Lower bound of every child's value, and their sum
+        lows = [SCORE_MIN] * n
+        low_total = SCORE_MIN * n
+
+        # Star2: one move of each child (a max node) gives a lower bound on it
+        if self.star2 and depth > 1 and beta < SCORE_MAX:
+            for i, move in enumerate(moves):
+                self.game_state.make_packed_move(board, move)
+                lows[i] = self._probe(board, depth - 1, n * beta - low_total + SCORE_MIN, ply + 1)
+                self.game_state.unmake_move(board)
+                low_total += lows[i] - SCORE_MIN
+                if low_total >= n * beta:
+                    self.pruning_count += 1
+                    return max(low_total / n, beta)
+
+        # Star1: search each child with the window that can still move the
+        # average out of (alpha, beta), the unsearched children at their bounds
+        total = 0.0
+        for i, move in enumerate(moves):
+            low_total -= lows[i]
+            rest = n - i - 1
+            child_alpha = n * alpha - total - SCORE_MAX * rest
+            child_beta = n * beta - total - low_total
+
+            self.game_state.make_packed_move(board, move)
+            val = self.expectimax(board, depth - 1, True, child_alpha, child_beta, ply + 1)
+            self.game_state.unmake_move(board)
+
+            if val <= child_alpha:
+                self.pruning_count += 1
+                return min((total + val + SCORE_MAX * rest) / n, alpha)
+            if val >= child_beta:
+                self.pruning_count += 1
+                return max((total + val + low_total) / n, beta)
+            total += val
+
+        return total / n
+
+    def _probe(self, board, depth, beta, ply):
+        """
+        Lower bound on the max node at `board` from searching one of its moves.
+
+        The move is the first in MoveOrderer order. Its chance node is
+        searched with an open alpha, so the result is exact or at least beta.
+        """
+        self.nodes_explored += 1
+        self._check_deadline()
+
+        moves = self.move_buffers[ply]
+        status = self.game_state.get_packed_node_status(self.color, board, moves)
+        if status != NodeStatus.ONGOING:
+            return self._terminal_score(status, self.color)
+
+        entry = self.tt.probe(board.key(self.color))
+        tt_move = entry[4] if entry is not None else None
+        move = self.orderer.order(board, self.color, moves, ply, tt_move)[0]
+
+        self.game_state.make_packed_move(board, move)
+        value = self.expectimax(board, depth - 1, False, -math.inf, beta, ply + 1)
+        self.game_state.unmake_move(board)
+        return value
 
     def get_best_move(self, board):
         """
@@ -340,9 +729,20 @@ class Agent:
 
         This is the main method called to get the agent's move decision.
         It evaluates all legal moves and returns the one with the best score.
+        When several moves share the best score, the one generated first by
+        get_legal_actions is returned, so move ordering only changes how fast
+        the answer is found, never which move is played.
+
+        With a fixed depth the root is searched once to `depth`. When the
+        agent has a `movetime` budget it deepens iteratively instead (see
+        iterative_deepening). Lazy SMP helpers, if any, search the same
+        position for as long as this search runs.
+
+        The search itself works on packed moves (see bitboard.py); only the
+        chosen move is turned into a Move.
 
         Args:
-          board: Current board state
+          board: Current board state (Board or BitBoard)
 
         Returns:
           Move: The best move to make (Move object with start and end positions)
@@ -353,47 +753,387 @@ class Agent:
         # Reset statistics
         self.nodes_explored = 0
         self.pruning_count = 0
+        self.tt_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.depth_reached = 0
+        self.helper_nodes = 0
+        self.tablebase_hits = 0
+        self.book_move = False
+        self.tt.new_search()
+        self.orderer.new_search()
+
+        # Search on a private bitboard copy; moves are made and unmade in place
+        board = BitBoard.from_board(board) if not isinstance(board, BitBoard) else board.copy()
 
         # Get all legal moves
-        moves = self.game_state.get_legal_actions(self.color, board)
+        moves = self.game_state.get_packed_actions(self.color, board, [])
 
         if not moves:
             return None, 0
 
-        # Evaluate each move using minimax
-        best_move = None
-        best_score = float("-inf")
+        # Book moves are played without searching
+        if self.book is not None:
+            choice = self.book.choose(board, self.color, self.book_rng)
+            if choice is not None and choice[0].pack() in moves:
+                self.book_move = True
+                self.last_score = choice[1]
+                return choice
+
+        # Won and lost endgames are played from the tablebase
+        if self.tablebase is not None and self.search_type != "expectimax":
+            choice = self.tablebase_move(board, moves)
+            if choice is not None:
+                self.last_score = choice[1]
+                return Move.from_packed(choice[0]), choice[1]
+
+        if self.smp is not None:
+            self.smp.start(board)
+        try:
+            if self.movetime is not None:
+                best_move, best_score = self.iterative_deepening(board, moves)
+            else:
+                # Search the move the table remembers for this position first
+                entry = self.tt.probe(board.key(self.color))
+                first_move = entry[4] if entry is not None else None
+
+                self.depth_reached = self.depth
+                if self.search_type == "mtdf":
+                    best_move, best_score = self.mtdf(
+                        board, moves, self.depth, first_move, self.last_score
+                    )
+                else:
+                    best_move, best_score = self.search_root(
+                        board, moves, self.depth, first_move
+                    )
+        finally:
+            if self.smp is not None:
+                self.helper_nodes = self.smp.stop()
+        self.last_score = best_score
+        return Move.from_packed(best_move), best_score
+
+    def tablebase_move(self, board, moves):
+        """
+        Pick a root move by tablebase distance, if the position is won or lost.
 
-        # Initial alpha-beta values
-        alpha = float("-inf")
-        beta = float("inf")
+        In a won position the move to the opponent's quickest loss is played,
+        so the win makes progress; in a lost position the move that delays
+        the loss longest. Ties go to the move generated first. Drawn and
+        uncovered positions are left to the search.
 
+        Args:
+          board: Root BitBoard position
+          moves: Legal root moves (packed)
+
+        Returns:
+          int, float: The packed move and its score (+/-1000), or None
+        """
+        result = self.tablebase.probe_board(board, self.color)
+        if result is None or result[0] == NodeStatus.DRAW:
+            return None
+
+        opponent = RED if self.color == BLACK else BLACK
+        won = result[0] == NodeStatus.WIN
+        best_move, best_distance = None, None
         for move in moves:
-            successor_board = self.game_state.generate_successor(board, move)
+            self.game_state.make_packed_move(board, move)
+            reply = self.tablebase.probe_board(board, opponent)
+            self.game_state.unmake_move(board)
+            if reply is None:
+                return None
+            status, distance = reply
+            if won and status == NodeStatus.LOSE:
+                if best_distance is None or distance < best_distance:
+                    best_move, best_distance = move, distance
+            elif not won and (best_distance is None or distance > best_distance):
+                best_move, best_distance = move, distance
+
+        self.tablebase_hits += len(moves) + 1
+        self.depth_reached = best_distance + 1
+        return best_move, (1000 if won else -1000)
+
+    def iterative_deepening(self, board, moves):
+        """
+        Search depth 1, 2, 3, ... until the agent's `movetime` budget runs out.
+
+        Each iteration searches the previous iteration's best move first. An
+        iteration interrupted by the deadline is thrown away, so the result
+        always comes from the deepest completed iteration. Depth 1 is always
+        completed so there is a move to return. No new iteration is started
+        once half the budget is spent (it would most likely not finish), or
+        once a forced win or loss has been found.
+
+        With PVS, iterations from depth 3 on first search an aspiration
+        window of +/-ASPIRATION_WINDOW around an earlier score (see
+        aspiration_search). The score of two iterations back is used
+        rather than the last one: the evaluation swings with the side to
+        move at the horizon, so scores of equal depth parity are much closer.
+        MTD(f) starts from the same score, or from the previous move's score
+        for depths 1 and 2.
 
-            if self.search_type == "expectimax":
-                move_score = self.expectimax(successor_board, self.depth - 1, False)
+        Args:
+          board: Root BitBoard position
+          moves: Legal root moves (packed)
+
+        Returns:
+          int, float: Best packed move and score of the last completed iteration
+        """
+        start_time = time.perf_counter()
+        best_move, best_score = None, 0
+        scores = []
+
+        for depth in range(1, MAX_SEARCH_DEPTH + 1):
+            # Depth 1 runs without a deadline; the board copy is discarded on timeout
+            self._deadline = start_time + self.movetime if depth > 1 else None
+            try:
+                if self.search_type == "pvs" and depth > 2:
+                    best_move, best_score = self.aspiration_search(
+                        board, moves, depth, best_move, scores[-2]
+                    )
+                elif self.search_type == "mtdf":
+                    guess = scores[-2] if depth > 2 else self.last_score
+                    best_move, best_score = self.mtdf(board, moves, depth, best_move, guess)
+                else:
+                    best_move, best_score = self.search_root(board, moves, depth, best_move)
+            except SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+            self.depth_reached = depth
+            scores.append(best_score)
+
+            if abs(best_score) >= 1000:
+                break
+            if time.perf_counter() - start_time >= self.movetime / 2:
+                break
+
+        return best_move, best_score
+
+    def aspiration_search(self, board, moves, depth, first_move, guess):
+        """
+        Search the root with a narrow window around `guess`.
+
+        The window is guess +/- ASPIRATION_WINDOW. A result outside it is only
+        a bound, so the search is repeated with the window opened on the side
+        that failed; the table entries of the failed search speed that up.
+
+        Worker processes search their root moves with the full window, so
+        with a process pool the root is searched once as by search_root.
+
+        Args:
+          board: Root BitBoard position
+          moves: Legal packed root moves, in generation order
+          depth: Search depth
+          first_move: Packed move to search first
+          guess: Expected score, e.g. from an earlier iteration
+
+        Returns:
+          int, float: Best packed move and its exact score, as search_root
+        """
+        if self.parallel is not None:
+            return self.search_root(board, moves, depth, first_move)
+
+        alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        while True:
+            move, score = self.search_root(board, moves, depth, first_move, alpha, beta)
+            if score <= alpha:
+                alpha = -math.inf
+            elif score >= beta:
+                beta = math.inf
             else:
-                move_score = self.minimax(
-                    successor_board, self.depth - 1, alpha, beta, False
-                )
+                return move, score
+            first_move = move
+
+    def mtdf(self, board, moves, depth, first_move, guess):
+        """
+        MTD(f): converge on the root score with null-window searches only.
+
+        Each pass tests whether the score is at least some beta: a search
+        with no score strictly inside its window fails high (the score is a
+        lower bound) or low (an upper bound). The next test is at the bound
+        just returned, so the two bounds close in on the score from `guess`;
+        the transposition table keeps most of the tree of earlier passes.
+        A last pass with the window just around the score finds the move
+        generated first among those that reach it, as search_root would.
+
+        Worker processes search their root moves with the full window, so
+        with a process pool the root is searched once as by search_root.
 
-            if move_score > best_score:
+        Args:
+          board: Root BitBoard position
+          moves: Legal packed root moves, in generation order
+          depth: Search depth
+          first_move: Packed move to search first
+          guess: Expected score, e.g. of the previous move
+
+        Returns:
+          int, float: Best packed move and its exact score, as search_root
+        """
+        if self.parallel is not None:
+            return self.search_root(board, moves, depth, first_move)
+
+        lower, upper = -math.inf, math.inf
+        score = guess
+        while lower < upper:
+            beta = max(score, math.nextafter(lower, math.inf))
+            first_move, score = self.search_root(
+                board, moves, depth, first_move, math.nextafter(beta, -math.inf), beta
+            )
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+
+        move, best_score = self.search_root(
+            board,
+            moves,
+            depth,
+            first_move,
+            math.nextafter(score, -math.inf),
+            math.nextafter(score, math.inf),
+        )
+        if best_score != score:
+            # Table entries of other passes made the searches disagree
+            return self.search_root(board, moves, depth, move)
+        return move, best_score
+
+    def search_root(self, board, moves, depth, first_move=None, alpha=-math.inf, beta=math.inf):
+        """
+        Search every root move to `depth` and return the best one.
+
+        Root moves are searched in MoveOrderer order (with `first_move` at the
+        front), but ties are broken by their position in `moves`. To detect
+        ties each move is searched with alpha just below the best score so
+        far, so a move that equals it gets its exact score back.
+
+        A narrower (alpha, beta) window, as used by aspiration search, makes
+        the search cheaper but may fail: if the best score is at most alpha
+        it is only an upper bound, and if it is at least beta the search stops
+        at that move and the score is only a lower bound. Only a score inside
+        the window is exact.
+
+        Args:
+          board: Root BitBoard position
+          moves: Legal packed root moves, in generation order
+          depth: Search depth (the root move itself counts as one ply)
+          first_move: Packed move to search first, e.g. the previous iteration's best
+          alpha, beta: Root search window (default: unbounded)
+
+        Returns:
+          int, float: Best packed move and its score
+        """
+        rank = {move: i for i, move in enumerate(moves)}
+        ordered = self.orderer.order(board, self.color, list(moves), 0, first_move)
+        alpha_searched = alpha
+
+        # With worker processes, every root move is scored up front
+        scores = None
+        if self.parallel is not None and len(ordered) > 1:
+            scores = self.parallel.search_root(board, ordered, depth)
+
+        best_move = None
+        best_score = float("-inf")
+
+        for i, move in enumerate(ordered):
+            if scores is not None:
+                move_score = scores[i]
+            else:
+                self.game_state.make_packed_move(board, move)
+                move_score = self.score_root_move(board, depth, alpha, beta, first=i == 0)
+                self.game_state.unmake_move(board)
+
+            if move_score > best_score or (
+                move_score == best_score
+                and rank[move] < rank[best_move]
+            ):
                 best_score = move_score
                 best_move = move
 
             alpha = max(alpha, move_score)
+            if best_score >= beta:
+                break
+
+        if best_score <= alpha_searched:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(board.key(self.color), depth, best_score, flag, best_move)
 
         return best_move, best_score
 
+    def score_root_move(self, board, depth, alpha, beta, first=False):
+        """
+        Search the position after a root move, for the agent's score.
+
+        The window runs from just below `alpha` (so a move that ties alpha
+        gets its exact score) to `beta`. With PVS, moves after the first are
+        tested with a null window at alpha first and only searched with the
+        full window if they reach it. MTD(f) searches with pvs() too: its
+        windows are null windows already.
+
+        Args:
+          board: BitBoard with the root move played (the opponent to move)
+          depth: Root search depth (the root move counts as one ply)
+          alpha: Best score of the root so far, or the window's lower end
+          beta: Upper end of the root window
+          first: Whether this is the first root move searched
+
+        Returns:
+          float: The move's score: exact if it is at least alpha and below
+          beta, else a bound on the same side
+        """
+        low = math.nextafter(alpha, -math.inf)
+        if self.search_type == "expectimax":
+            return self.expectimax(board, depth - 1, False, low, beta)
+        if self.search_type == "minimax":
+            return self.minimax(board, depth - 1, low, beta, False)
+        if self.search_type == "pvs" and not first and alpha > -math.inf:
+            score = -self.pvs(board, depth - 1, -alpha, -low, False)
+            if score < alpha or score >= beta:
+                return score
+        return -self.pvs(board, depth - 1, -beta, -low, False)
+
+    def close(self):
+        """Release the worker processes, tablebase and book files in use, if any."""
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.smp is not None:
+            self.smp.close()
+        if self.tablebase is not None:
+            self.tablebase.close()
+        if self.book is not None:
+            self.book.close()
+
     def get_statistics(self):
         """
         Get statistics about the last move search.
 
         Returns:
-          dict: Dictionary containing nodes_explored and pruning_count
+          dict: Dictionary containing nodes_explored, pruning_count,
+                transposition table probes, hits and cutoffs, the depth of
+                the last completed search, how many cutoffs came from
+                the first move searched at their node (count and rate), and
+                the nodes explored by Lazy SMP helpers, the number of
+                positions answered by the endgame tablebase, and whether the
+                move came from the opening book. A profiling agent
+                also reports a "profile" dict (see SearchProfiler.report).
         """
-        return {
+        stats = {
             "nodes_explored": self.nodes_explored,
             "pruning_count": self.pruning_count,
+            "tt_probes": self.tt.probes,
+            "tt_hits": self.tt.hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "depth_reached": self.depth_reached,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": (
+                self.first_move_cutoffs / self.pruning_count if self.pruning_count else 0.0
+            ),
+            "helper_nodes": self.helper_nodes,
+            "tablebase_hits": self.tablebase_hits,
+            "book_move": self.book_move,
         }
+        if self.profiler is not None:
+            stats["profile"] = self.profiler.report(self.depth_reached)
+        return stats
@@ -0,0 +1,223 @@
+"""
+Search Benchmark
+
+Runs Agent.get_best_move on a fixed set of opening, midgame and endgame
+positions at fixed depths, and records for each case the nodes explored,
+branches pruned, time, nodes per second, and the move and score chosen.
+
+Results are written to a JSON file and compared with a stored baseline.
+Node counts are deterministic, so any growth beyond the node threshold means
+the search got less efficient. Times depend on the machine, so the time
+threshold is looser and the baseline should be recorded on the machine it is
+compared on. A different move or score means the change altered the search
+result, which is reported separately.
+
+Usage:
+  python benchmark.py                         # compare with benchmark_baseline.json
+  python benchmark.py --update-baseline       # record a new baseline
+  python benchmark.py --output results.json --time-threshold 0.5
+"""
+
+import argparse
+import json
+import os
+import time
+
+from agent import Agent
+from bitboard import BitBoard
+from constants import BLACK, RED
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# name -> (position string as written by BitBoard.to_string, side to move)
+POSITIONS = {
+    "opening": ("bbbb/bbbb/bbbb/..../..../rrrr/rrrr/rrrr", BLACK),
+    "early": ("bbbb/b.bb/bb.b/b..b/r..r/rrr./.rrr/rrrr", BLACK),
+    "midgame": ("..R./.b.r/rbR./b.r./..../r.b./rbbr/r.r.", RED),
+    "crowded": ("..../bRbb/br../b.bb/rrrb/r.br/rB../..B.", BLACK),
+    "kings": ("R..b/...b/..bb/..../.b../r.r./r..r/..BB", BLACK),
+    "endgame": ("..../.B../..../..b./.r../..../R.../..R.", BLACK),
+}
+
+# (search type, depth) every position is searched with
+SEARCHES = (("minimax", 8), ("pvs", 8), ("mtdf", 8), ("expectimax", 5))
+
+# Allowed growth over the baseline, as a fraction
+NODE_THRESHOLD = 0.05
+TIME_THRESHOLD = 0.25
+
+
+def run_case(position, search_type, depth):
+    """
+    Search one benchmark position with a fresh agent.
+
+    Returns:
+      dict: position, search_type, depth, nodes, pruned, seconds,
+            nodes_per_second, move (its squares, start to end) and score
+    """
+    text, color = POSITIONS[position]
+    agent = Agent(color, depth=depth, search_type=search_type)
+    board = BitBoard.from_string(text)
+
+    start_time = time.perf_counter()
+    move, score = agent.get_best_move(board)
+    seconds = time.perf_counter() - start_time
+
+    stats = agent.get_statistics()
+    return {
+        "position": position,
+        "search_type": search_type,
+        "depth": depth,
+        "nodes": stats["nodes_explored"],
+        "pruned": stats["pruning_count"],
+        "seconds": seconds,
+        "nodes_per_second": stats["nodes_explored"] / seconds if seconds else 0.0,
+        "move": [list(square) for square in move.squares()] if move is not None else None,
+        "score": score,
+    }
+
+
+def run_benchmark(positions=None, searches=SEARCHES):
+    """
+    Run every (position, search) case.
+
+    Args:
+      positions: Names of POSITIONS to run (default: all)
+      searches: (search type, depth) pairs to run on each position
+
+    Returns:
+      list[dict]: run_case results, in order
+    """
+    names = positions if positions is not None else list(POSITIONS)
+    return [
+        run_case(name, search_type, depth) for name in names for search_type, depth in searches
+    ]
+
+
+def compare(results, baseline, node_threshold=NODE_THRESHOLD, time_threshold=TIME_THRESHOLD):
+    """
+    Compare benchmark results with a baseline.
+
+    Cases missing from the baseline are skipped.
+
+    Returns:
+      tuple: (regressions, changes), lists of messages. Regressions are
+             node counts or times above the thresholds; changes are cases
+             whose chosen move or score differs from the baseline.
+    """
+    reference = {(r["position"], r["search_type"], r["depth"]): r for r in baseline}
+    regressions, changes = [], []
+    for result in results:
+        case = (result["position"], result["search_type"], result["depth"])
+        old = reference.get(case)
+        if old is None:
+            continue
+        label = f"{case[0]} {case[1]} depth {case[2]}"
+
+        if result["nodes"] > old["nodes"] * (1 + node_threshold):
+            regressions.append(f"{label}: nodes {old['nodes']} -> {result['nodes']}")
+        if result["seconds"] > old["seconds"] * (1 + time_threshold):
+            regressions.append(
+                f"{label}: time {old['seconds']:.3f}s -> {result['seconds']:.3f}s"
+            )
+        if result["move"] != old["move"] or result["score"] != old["score"]:
+            changes.append(
+                f"{label}: move {old['move']} ({old['score']}) -> "
+                f"{result['move']} ({result['score']})"
+            )
+    return regressions, changes
+
+
+def summarize(results):
+    """Totals over all cases: nodes, pruned, seconds and nodes_per_second."""
+    nodes = sum(r["nodes"] for r in results)
+    seconds = sum(r["seconds"] for r in results)
+    return {
+        "nodes": nodes,
+        "pruned": sum(r["pruned"] for r in results),
+        "seconds": seconds,
+        "nodes_per_second": nodes / seconds if seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search on fixed positions")
+    parser.add_argument(
+        "--output", default=None, help="JSON file to write the results to (default: none)"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help="Baseline JSON file to compare with (default: benchmark_baseline.json)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--node-threshold",
+        type=float,
+        default=NODE_THRESHOLD,
+        help=f"Allowed node count growth as a fraction (default: {NODE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=TIME_THRESHOLD,
+        help=f"Allowed time growth as a fraction (default: {TIME_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--position",
+        choices=sorted(POSITIONS),
+        action="append",
+        help="Only run this position; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--fail-on-change",
+        action="store_true",
+        help="Also fail when a chosen move or score differs from the baseline",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(args.position)
+    for r in results:
+        print(
+            f"{r['position']:<10} {r['search_type']:<10} depth {r['depth']:>2}: "
+            f"{r['nodes']:>8} nodes {r['pruned']:>7} pruned {r['seconds']:7.3f}s "
+            f"{r['nodes_per_second']:>9.0f} nodes/s  move {r['move']}"
+        )
+    totals = summarize(results)
+    print(
+        f"Total: {totals['nodes']} nodes in {totals['seconds']:.3f}s "
+        f"({totals['nodes_per_second']:.0f} nodes/s)"
+    )
+
+    report = {"results": results, "totals": totals}
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions, changes = compare(results, baseline, args.node_threshold, args.time_threshold)
+    for message in changes:
+        print(f"CHANGED    {message}")
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions or (args.fail_on_change and changes):
+        raise SystemExit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
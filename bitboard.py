@@ -0,0 +1,532 @@
+"""
+Bitboard Position Representation for Checkers
+
+Packs the 32 dark squares of the board into three integers (black pieces,
+red pieces and kings) so that move generation and board queries are done
+with shifts and masks instead of scanning an 8x8 grid of Piece objects.
+
+Square numbering: square s sits on row s // 4. Dark squares are the ones with
+(row + col) odd, so col = 2 * (s % 4) + 1 on even rows and col = 2 * (s % 4)
+on odd rows. BLACK moves toward increasing rows, RED toward decreasing rows.
+
+The search works with packed moves: one int holding the from square (bits
+0-4), the to square (bits 5-9) and the mask of captured squares (bits 10 and
+up, 0 for a quiet move). They are hashable and cheap to compare, and are only
+turned into checker.Move objects at the engine's boundary.
+
+Captures are mandatory, and a capture is the whole multi-jump chain: the
+piece keeps jumping while it can, except that a man reaching the far row is
+crowned and stops. A chain is one move, whatever its number of jumps.
+"""
+
+from constants import BLACK, RED, ROWS, COLS
+from piece import Piece
+from transposition import PIECE_KEYS, SIDE_KEY
+from evaluation import build_piece_square_tables
+
+FULL = 0xFFFFFFFF
+
+# square index <-> (row, col) lookups
+SQUARE_COORDS = tuple(
+    (s // 4, 2 * (s % 4) + (1 if (s // 4) % 2 == 0 else 0)) for s in range(32)
+)
+SQUARE_INDEX = {coords: s for s, coords in enumerate(SQUARE_COORDS)}
+
+ROW_MASKS = tuple(0xF << (4 * r) for r in range(ROWS))
+EVEN_ROWS = sum(ROW_MASKS[r] for r in range(0, ROWS, 2))
+ODD_ROWS = sum(ROW_MASKS[r] for r in range(1, ROWS, 2))
+LEFT_EDGE = sum(1 << s for s, (r, c) in enumerate(SQUARE_COORDS) if c == 0)
+RIGHT_EDGE = sum(1 << s for s, (r, c) in enumerate(SQUARE_COORDS) if c == COLS - 1)
+EDGES = LEFT_EDGE | RIGHT_EDGE
+CENTER = sum(
+    1 << s for s, rc in enumerate(SQUARE_COORDS) if rc in [(3, 3), (3, 4), (4, 3), (4, 4)]
+)
+
+# Starting layout: BLACK on rows 0-2, RED on rows 5-7
+INITIAL_BLACK = ROW_MASKS[0] | ROW_MASKS[1] | ROW_MASKS[2]
+INITIAL_RED = ROW_MASKS[5] | ROW_MASKS[6] | ROW_MASKS[7]
+
+# A direction is two (source mask, shift) pairs, one per row parity, plus the
+# displacement of a jump (two steps) in that direction. The masks drop pieces
+# that would step off the left/right edge; shifting past bit 0 or bit 31 drops
+# pieces that would step off the top/bottom edge.
+DOWN_LEFT = ((EVEN_ROWS, 4), (ODD_ROWS & ~LEFT_EDGE, 3), 7)
+DOWN_RIGHT = ((EVEN_ROWS & ~RIGHT_EDGE, 5), (ODD_ROWS, 4), 9)
+UP_LEFT = ((EVEN_ROWS, -4), (ODD_ROWS & ~LEFT_EDGE, -5), -9)
+UP_RIGHT = ((EVEN_ROWS & ~RIGHT_EDGE, -3), (ODD_ROWS, -4), -7)
+
+# forward directions, then the backward ones only kings may use
+DIRECTIONS = {
+    BLACK: ((DOWN_LEFT, DOWN_RIGHT), (UP_LEFT, UP_RIGHT)),
+    RED: ((UP_LEFT, UP_RIGHT), (DOWN_LEFT, DOWN_RIGHT)),
+}
+
+# (start, end) of every jump -> square of the jumped piece
+JUMPED = {}
+for _s, (_r, _c) in enumerate(SQUARE_COORDS):
+    for _dr in (-1, 1):
+        for _dc in (-1, 1):
+            _end = SQUARE_INDEX.get((_r + 2 * _dr, _c + 2 * _dc))
+            if _end is not None:
+                JUMPED[(_s, _end)] = SQUARE_INDEX[(_r + _dr, _c + _dc)]
+
+
+def _jump_table(forward, king):
+    # [square] -> (jumped square, landing square) of every jump on the board,
+    # forward directions first, then the backward ones for kings
+    table = []
+    for r, c in SQUARE_COORDS:
+        jumps = []
+        for dr in (forward, -forward) if king else (forward,):
+            for dc in (-1, 1):
+                end = SQUARE_INDEX.get((r + 2 * dr, c + 2 * dc))
+                if end is not None:
+                    jumps.append((SQUARE_INDEX[(r + dr, c + dc)], end))
+        table.append(tuple(jumps))
+    return tuple(table)
+
+
+# JUMP_TABLES[color][is king][square], in the order chains are generated
+JUMP_TABLES = {
+    BLACK: (_jump_table(1, False), _jump_table(1, True)),
+    RED: (_jump_table(-1, False), _jump_table(-1, True)),
+}
+
+# packed move fields
+MOVE_TO_SHIFT = 5
+MOVE_CAPTURE_SHIFT = 10
+SQUARE_MASK = 31
+
+# the row on which a man of each color is crowned
+PROMOTION_ROW = {BLACK: ROW_MASKS[ROWS - 1], RED: ROW_MASKS[0]}
+
+# to_string characters, indexed by piece kind like PIECE_KEYS
+PIECE_CHARS = "brBR"
+
+# evaluation piece-square tables, indexed [kind][square] like PIECE_KEYS
+SHARED_TABLE, OWN_TABLE = build_piece_square_tables(SQUARE_COORDS)
+
+
+def _shift(bits, n):
+    return (bits << n) & FULL if n > 0 else bits >> -n
+
+
+def _step(bits, direction):
+    (mask_a, shift_a), (mask_b, shift_b), _ = direction
+    return _shift(bits & mask_a, shift_a) | _shift(bits & mask_b, shift_b)
+
+
+def pack_move(start, end, path=()):
+    """
+    Packed move start -> end.
+
+    Args:
+      start, end: From and to squares
+      path: Squares a capture chain lands on between `start` and `end`
+
+    Returns:
+      int: The packed move, with the square jumped by every hop captured
+    """
+    captured = 0
+    square = start
+    for landing in (*path, end):
+        jumped = JUMPED.get((square, landing))
+        if jumped is not None:
+            captured |= 1 << jumped
+        square = landing
+    return start | end << MOVE_TO_SHIFT | captured << MOVE_CAPTURE_SHIFT
+
+
+def unpack_move(move):
+    """(start, end) squares of a packed move."""
+    return move & SQUARE_MASK, move >> MOVE_TO_SHIFT & SQUARE_MASK
+
+
+def capture_path(move):
+    """
+    Squares a capture chain lands on between its start and end.
+
+    The packed move only records which squares were jumped; the path is
+    rebuilt by following jumps over exactly those squares. When several
+    orders capture the same pieces (a king going around a loop), any one
+    of them is returned: they all end in the same position.
+
+    Returns:
+      tuple[int, ...]: Intermediate landing squares, empty for a quiet move
+                       or a single jump
+    """
+    start, end = unpack_move(move)
+    captured = move >> MOVE_CAPTURE_SHIFT
+    if captured & (captured - 1) == 0:
+        return ()
+    # kings may jump in every direction; any order the chain was played in
+    # is among their jumps
+    jumps = JUMP_TABLES[BLACK][True]
+    path = []
+
+    def follow(square, remaining):
+        if not remaining:
+            return square == end
+        for jumped, landing in jumps[square]:
+            if remaining >> jumped & 1:
+                path.append(landing)
+                if follow(landing, remaining ^ 1 << jumped):
+                    return True
+                path.pop()
+        return False
+
+    follow(start, captured)
+    return tuple(path[:-1])
+
+
+def _capture_chains(moves, jumps, start, square, opp, empty, promotion, captured):
+    # Depth-first expansion of the chains through `square`: every jump over a
+    # piece still in `opp` is followed, with that piece taken off so it cannot
+    # be jumped twice. A chain ends where no jump is left, or where a man
+    # (promotion != 0) reaches its promotion row.
+    ended = True
+    for jumped, landing in jumps[square]:
+        if opp >> jumped & 1 and empty >> landing & 1:
+            ended = False
+            taken = captured | 1 << jumped
+            if promotion >> landing & 1:
+                moves.append(start | landing << MOVE_TO_SHIFT | taken << MOVE_CAPTURE_SHIFT)
+            else:
+                _capture_chains(
+                    moves, jumps, start, landing, opp ^ 1 << jumped, empty, promotion, taken
+                )
+    if ended and captured:
+        move = start | square << MOVE_TO_SHIFT | captured << MOVE_CAPTURE_SHIFT
+        # a king can take the same pieces around a loop in either direction
+        if promotion or move not in moves:
+            moves.append(move)
+
+
+def iter_squares(bits):
+    """Yield the square index of every set bit, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitBoard:
+    """
+    Checkers position stored as three 32-bit masks.
+
+    Attributes:
+      black: Squares holding BLACK pieces (men and kings)
+      red: Squares holding RED pieces (men and kings)
+      kings: Squares holding kings of either color
+      hash: Zobrist hash of the pieces, kept up to date by every move
+      balance: Shared piece-square score of BLACK minus that of RED
+      own_black: Own-only piece-square score of BLACK's pieces
+      own_red: Own-only piece-square score of RED's pieces
+      undo_stack: Masks, hash and scores saved by make_move, newest last
+
+    The three scores are the static (non-mobility) evaluation terms in
+    tenths of a point, maintained incrementally like the hash; see
+    evaluation.build_piece_square_tables.
+    """
+
+    __slots__ = ("black", "red", "kings", "hash", "balance", "own_black", "own_red", "undo_stack")
+
+    def __init__(self, black=INITIAL_BLACK, red=INITIAL_RED, kings=0):
+        self.black = black
+        self.red = red
+        self.kings = kings
+        self.hash = self.compute_hash()
+        self.balance, self.own_black, self.own_red = self.compute_static()
+        self.undo_stack = []
+
+    @classmethod
+    def from_board(cls, board):
+        """Build a BitBoard from a list-of-lists Board."""
+        black = red = kings = 0
+        for s, (r, c) in enumerate(SQUARE_COORDS):
+            p = board.get_piece(r, c)
+            if p == 0:
+                continue
+            bit = 1 << s
+            if p.color == BLACK:
+                black |= bit
+            else:
+                red |= bit
+            if p.king:
+                kings |= bit
+        return cls(black, red, kings)
+
+    def to_board(self):
+        """Build the equivalent list-of-lists Board."""
+        from board import Board
+
+        board = Board()
+        for r in range(ROWS):
+            for c in range(COLS):
+                board.set_piece(r, c, 0)
+        for p in self.get_all_pieces(BLACK) + self.get_all_pieces(RED):
+            board.set_piece(p.row, p.col, p)
+        return board
+
+    @classmethod
+    def from_string(cls, text):
+        """
+        Parse a position written by to_string.
+
+        Raises:
+          ValueError: If `text` is not 32 characters from "bBrR."
+        """
+        text = text.replace(" ", "").replace("/", "")
+        if len(text) != 32 or set(text) - set(PIECE_CHARS + "."):
+            raise ValueError(f"Not a position string: {text!r}")
+        black = red = kings = 0
+        for s, char in enumerate(text):
+            bit = 1 << s
+            if char in "bB":
+                black |= bit
+            elif char in "rR":
+                red |= bit
+            if char in "BR":
+                kings |= bit
+        return cls(black, red, kings)
+
+    def to_string(self):
+        """
+        One character per square in index order, rows separated by "/".
+
+        Men are "b" and "r", kings "B" and "R", empty squares ".".
+        """
+        chars = [
+            "." if not (self.black | self.red) >> s & 1 else PIECE_CHARS[self._kind(s)]
+            for s in range(32)
+        ]
+        return "/".join("".join(chars[r * 4 : r * 4 + 4]) for r in range(ROWS))
+
+    def copy(self):
+        """Copy of the position (the undo history is not copied)."""
+        board = BitBoard.__new__(BitBoard)
+        board.black = self.black
+        board.red = self.red
+        board.kings = self.kings
+        board.hash = self.hash
+        board.balance = self.balance
+        board.own_black = self.own_black
+        board.own_red = self.own_red
+        board.undo_stack = []
+        return board
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, BitBoard)
+            and self.black == other.black
+            and self.red == other.red
+            and self.kings == other.kings
+        )
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return f"BitBoard(black={self.black:#010x}, red={self.red:#010x}, kings={self.kings:#010x})"
+
+    def compute_hash(self):
+        """Zobrist hash of the pieces, computed from scratch."""
+        h = 0
+        for s in iter_squares(self.black | self.red):
+            h ^= PIECE_KEYS[self._kind(s)][s]
+        return h
+
+    def compute_static(self):
+        """Piece-square scores (balance, own_black, own_red), computed from scratch."""
+        balance = own_black = own_red = 0
+        for s in iter_squares(self.black):
+            kind = self._kind(s)
+            balance += SHARED_TABLE[kind][s]
+            own_black += OWN_TABLE[kind][s]
+        for s in iter_squares(self.red):
+            kind = self._kind(s)
+            balance -= SHARED_TABLE[kind][s]
+            own_red += OWN_TABLE[kind][s]
+        return balance, own_black, own_red
+
+    def key(self, color):
+        """Zobrist key of the position with `color` to move."""
+        return self.hash ^ SIDE_KEY if color == RED else self.hash
+
+    def _kind(self, s):
+        # index into PIECE_KEYS: BLACK_MAN, RED_MAN, BLACK_KING or RED_KING
+        return (0 if self.black >> s & 1 else 1) + (2 if self.kings >> s & 1 else 0)
+
+    def pieces(self, color):
+        """Mask of all squares occupied by `color`."""
+        return self.black if color == BLACK else self.red
+
+    def empty(self):
+        return ~(self.black | self.red) & FULL
+
+    def get_all_pieces(self, color):
+        """Return Piece objects for every piece of `color`, in board-scan order."""
+        pieces = []
+        for s in iter_squares(self.pieces(color)):
+            r, c = SQUARE_COORDS[s]
+            p = Piece(r, c, color)
+            if self.kings >> s & 1:
+                p.make_king()
+            pieces.append(p)
+        return pieces
+
+    def moves(self, color):
+        """
+        Generate every legal move for `color`.
+
+        Returns:
+          list[int]: Packed moves, as packed_moves() writes them
+        """
+        return self.packed_moves(color, [])
+
+    def packed_moves(self, color, buffer):
+        """
+        Write every legal move for `color` into `buffer` as packed moves.
+
+        When any capture exists only the capture chains are legal, grouped by
+        the square they start from; otherwise the steps come direction by
+        direction. The buffer is cleared first, so a search can reuse one list
+        per ply instead of allocating a new one at every node.
+
+        Returns:
+          list[int]: `buffer`
+        """
+        buffer.clear()
+        own = self.pieces(color)
+        opp = self.pieces(RED if color == BLACK else BLACK)
+        empty = self.empty()
+        forward, backward = DIRECTIONS[color]
+        kings = own & self.kings
+
+        jumpers = self.jumpers(color)
+        if jumpers:
+            men_jumps, king_jumps = JUMP_TABLES[color]
+            promotion = PROMOTION_ROW[color]
+            for s in iter_squares(jumpers):
+                if kings >> s & 1:
+                    _capture_chains(buffer, king_jumps, s, s, opp, empty | 1 << s, 0, 0)
+                else:
+                    _capture_chains(buffer, men_jumps, s, s, opp, empty, promotion, 0)
+            return buffer
+
+        for movers, directions in ((own, forward), (kings, backward)):
+            if not movers:
+                continue
+            for direction in directions:
+                for mask, shift in direction[:2]:
+                    for t in iter_squares(_shift(movers & mask, shift) & empty):
+                        buffer.append((t - shift) | t << MOVE_TO_SHIFT)
+        return buffer
+
+    def jumpers(self, color):
+        """Mask of the pieces of `color` that can capture (0 if its moves are quiet)."""
+        own = self.pieces(color)
+        opp = self.pieces(RED if color == BLACK else BLACK)
+        empty = self.empty()
+        forward, backward = DIRECTIONS[color]
+
+        jumpers = 0
+        for movers, directions in ((own, forward), (own & self.kings, backward)):
+            for direction in directions:
+                landing = _step(_step(movers, direction) & opp, direction) & empty
+                jumpers |= _shift(landing, -direction[2])
+        return jumpers
+
+    def count_moves(self, color):
+        """
+        Mobility of `color`: its steps plus its single jumps.
+
+        This ignores mandatory capture and counts every jump once rather than
+        every chain, which makes it a cheap evaluation term. It is zero
+        exactly when `color` has no legal move.
+        """
+        own = self.pieces(color)
+        opp = self.pieces(RED if color == BLACK else BLACK)
+        empty = self.empty()
+        forward, backward = DIRECTIONS[color]
+
+        count = 0
+        for movers, directions in ((own, forward), (own & self.kings, backward)):
+            if not movers:
+                continue
+            for direction in directions:
+                count += (_step(movers, direction) & empty).bit_count()
+                count += (_step(_step(movers, direction) & opp, direction) & empty).bit_count()
+        return count
+
+    def make_move(self, move):
+        """
+        Play a packed move in place, saving the previous state for unmake_move.
+
+        The three masks capture everything a move changes (the captured pieces
+        and whether the mover was promoted), so restoring them together with
+        the hash and scores derived from them is an exact undo.
+        """
+        self.undo_stack.append(
+            (self.black, self.red, self.kings, self.hash, self.balance, self.own_black, self.own_red)
+        )
+        self.apply(move)
+
+    def unmake_move(self):
+        """Revert the most recent make_move."""
+        (
+            self.black,
+            self.red,
+            self.kings,
+            self.hash,
+            self.balance,
+            self.own_black,
+            self.own_red,
+        ) = self.undo_stack.pop()
+
+    def apply(self, move):
+        """Play a packed move in place (captures and promotion included)."""
+        start = move & SQUARE_MASK
+        end = move >> MOVE_TO_SHIFT & SQUARE_MASK
+        start_bit = 1 << start
+        end_bit = 1 << end
+        is_black = self.black & start_bit
+        kind = self._kind(start)
+        h = self.hash ^ PIECE_KEYS[kind][start]
+        self._update_static(kind, start, -1)
+
+        captured = move >> MOVE_CAPTURE_SHIFT
+        if captured:
+            for s in iter_squares(captured):
+                h ^= PIECE_KEYS[self._kind(s)][s]
+                self._update_static(self._kind(s), s, -1)
+            keep = ~captured & FULL
+            self.black &= keep
+            self.red &= keep
+            self.kings &= keep
+
+        # a king's chain may end on its own start square
+        if is_black:
+            self.black = self.black & ~start_bit | end_bit
+            promotion = PROMOTION_ROW[BLACK]
+        else:
+            self.red = self.red & ~start_bit | end_bit
+            promotion = PROMOTION_ROW[RED]
+
+        if self.kings & start_bit:
+            self.kings = self.kings & ~start_bit | end_bit
+        elif end_bit & promotion:
+            self.kings |= end_bit
+            kind += 2  # man -> king of the same color
+
+        self.hash = h ^ PIECE_KEYS[kind][end]
+        self._update_static(kind, end, 1)
+
+    def _update_static(self, kind, s, sign):
+        # add (sign=1) or remove (sign=-1) a piece's piece-square scores
+        if kind & 1:
+            self.balance -= sign * SHARED_TABLE[kind][s]
+            self.own_red += sign * OWN_TABLE[kind][s]
+        else:
+            self.balance += sign * SHARED_TABLE[kind][s]
+            self.own_black += sign * OWN_TABLE[kind][s]
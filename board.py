@@ -1,19 +1,18 @@
 # board.py
-import pygame
 from constants import *
 from piece import Piece
 
 class Board:
   def __init__(self):
     self.board = []
+    # (move, [(square, captured piece)], promoted flag) for every make_move, newest last
+    self.undo_stack = []
     self.create_board()
 
+  #drawing needs pygame, which is only imported once something is drawn
   def draw_grid(self, win):
-    win.fill(BROWN)
-    for r in range(ROWS):
-      for c in range(COLS):
-        if(c + r) % 2 == 0:
-          pygame.draw.rect(win, BEIGE, (r*SQUARE_WIDTH, c*SQUARE_WIDTH, SQUARE_WIDTH,SQUARE_WIDTH))
+    from render import draw_grid
+    draw_grid(win)
 
   #The board's index: left top corner = (0,0) && right bottom = (7,7)
   def create_board(self):
@@ -31,25 +30,59 @@ class Board:
             self.board[r].append(0)
 
   def draw(self, win):
-    self.draw_grid(win)
-    for r in range(ROWS):
-      for c in range(COLS):
-        piece = self.get_piece(r, c)
-        if piece != 0:
-            piece.draw(win)
+    from render import draw_board
+    draw_board(win, self)
   
   def move(self, piece, row, col):
     self.board[piece.row][piece.col] = 0
     self.board[row][col] = piece
-    piece.move(row, col)
+    piece.row = row
+    piece.col = col
     
   def set_piece(self, row, col, piece):
     self.board[row][col] = piece
     if piece != 0:
-       piece.move(row, col)
+      piece.row = row
+      piece.col = col
 
   def get_piece(self, row, col):
     return self.board[row][col]
+
+  #apply a move in place and remember what it changed so unmake_move can revert it
+  def make_move(self, move):
+    sr, sc = move.start
+    er, ec = move.end
+    piece = self.board[sr][sc]
+
+    #a capture chain takes every piece it jumps
+    captured = []
+    for mr, mc in move.captures():
+      captured.append(((mr, mc), self.board[mr][mc]))
+      self.board[mr][mc] = 0
+
+    self.move(piece, er, ec)
+
+    promoted = not piece.king and (
+      (piece.color == RED and er == 0) or (piece.color == BLACK and er == ROWS - 1)
+    )
+    if promoted:
+      piece.make_king()
+
+    self.undo_stack.append((move, captured, promoted))
+
+  #revert the most recent make_move
+  def unmake_move(self):
+    move, captured, promoted = self.undo_stack.pop()
+    sr, sc = move.start
+    er, ec = move.end
+    piece = self.board[er][ec]
+
+    if promoted:
+      piece.king = False
+    self.move(piece, sr, sc)
+
+    for (mr, mc), p in captured:
+      self.set_piece(mr, mc, p)
   
   def deep_copy_board(self):
     new_board = Board()
@@ -60,8 +93,7 @@ class Board:
                 new_board.set_piece(r, c, 0)
             else:
                 p = Piece(cell.row, cell.col, cell.color)
-                if getattr(cell, 'king', True):
-                    p.make_king()
+                p.king = cell.king
                 new_board.set_piece(r, c, p)
     return new_board
   
@@ -0,0 +1,311 @@
+"""
+Opening Book
+
+Precomputed moves for the positions every game passes through, so the agent
+plays the opening instantly instead of searching the same positions again.
+
+A book file is a header followed by fixed-size records sorted by position
+key (BitBoard.key, which includes the side to move). Every record holds one
+book move of a position with its weight and score, so the moves of a
+position are adjacent and a probe is a binary search over the memory-mapped
+file.
+
+Books are built either by searching every book move deeply (build_from_search)
+or from the moves played in tournament game records (build_from_games).
+
+Usage:
+  python book.py search --depth 8 --plies 6 --output book.bin
+  python book.py games logs/tournament_*.jsonl --plies 12 --output book.bin
+  python book.py show book.bin
+"""
+
+import argparse
+import json
+import math
+import mmap
+import struct
+from collections import defaultdict
+
+from agent import Agent, SCORE_MAX
+from bitboard import BitBoard, pack_move
+from checker import GameState, Move, RULES_VERSION
+from constants import BLACK, RED
+
+MAGIC = b"CKBK"
+# magic, rules version, number of records
+HEADER = struct.Struct("<4sHI")
+# position key, packed move, weight, score
+RECORD = struct.Struct("<QQHf")
+
+MAX_WEIGHT = 0xFFFF
+
+# Score of a game-book move that won every game it was played in (minus
+# for one that lost them all): a few games prove nothing, so this stays well
+# inside the won and lost scores (+/-SCORE_MAX) the search reserves for proofs
+RESULT_SCALE = SCORE_MAX / 10
+
+
+def write_book(path, entries):
+    """
+    Write a book file.
+
+    Args:
+      path: Output file
+      entries: {position key: [(Move, weight, score), ...]}
+
+    Returns:
+      int: Number of records written
+    """
+    records = sorted(
+        (key, move.pack(), min(weight, MAX_WEIGHT), score)
+        for key, moves in entries.items()
+        for move, weight, score in moves
+        if weight > 0
+    )
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, RULES_VERSION, len(records)))
+        for record in records:
+            f.write(RECORD.pack(*record))
+    return len(records)
+
+
+class OpeningBook:
+    """
+    Read access to a book file.
+
+    Attributes:
+      path: The book file
+      size: Number of records (0 if the file was built under other rules)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size = HEADER.unpack_from(self._data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        # a book for other rules may suggest illegal moves: treat it as empty
+        self.size = size if version == RULES_VERSION else 0
+
+    def _key_at(self, i):
+        return struct.unpack_from("<Q", self._data, HEADER.size + i * RECORD.size)[0]
+
+    def probe(self, board, color):
+        """
+        Book moves of a position.
+
+        Args:
+          board: BitBoard position
+          color: Color to move
+
+        Returns:
+          list[tuple]: (Move, weight, score) for every book move, empty when
+                       the position is not in the book
+        """
+        key = board.key(color)
+        low, high = 0, self.size
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        moves = []
+        for i in range(low, self.size):
+            record_key, move, weight, score = RECORD.unpack_from(
+                self._data, HEADER.size + i * RECORD.size
+            )
+            if record_key != key:
+                break
+            moves.append((Move.from_packed(move), weight, score))
+        return moves
+
+    def choose(self, board, color, rng=None):
+        """
+        Pick a book move.
+
+        Args:
+          board: BitBoard position
+          color: Color to move
+          rng: random.Random for a weighted random choice; None picks the
+               highest weight (the first such move on ties)
+
+        Returns:
+          tuple: (Move, score), or None when the position is not in the book
+        """
+        moves = self.probe(board, color)
+        if not moves:
+            return None
+        if rng is None:
+            move, _, score = max(moves, key=lambda entry: entry[1])
+        else:
+            move, _, score = rng.choices(moves, weights=[w for _, w, _ in moves])[0]
+        return move, score
+
+    def close(self):
+        self._data.close()
+
+
+def build_from_search(depth=8, plies=6, margin=0.5, progress=None):
+    """
+    Build book entries by searching every move of the opening positions.
+
+    Starting from the initial position, every legal move is searched to
+    `depth`. Moves scoring within `margin` of the best go into the book,
+    weighted from 100 (the best move) down to 1 (`margin` worse), and the
+    positions after them are expanded in turn, up to `plies` moves deep.
+
+    Args:
+      depth: Search depth for scoring each move (the move counts as one ply)
+      plies: Book depth in moves from the initial position
+      margin: Largest score difference to the best move that is still booked
+      progress: Called with (positions searched, positions queued)
+
+    Returns:
+      dict: {position key: [(Move, weight, score), ...]} for write_book
+    """
+    agents = {color: Agent(color, depth=depth) for color in (BLACK, RED)}
+    game_state = GameState()
+    entries = {}
+    frontier = [(BitBoard(), BLACK)]
+
+    for ply in range(plies):
+        next_frontier = []
+        for board, color in frontier:
+            key = board.key(color)
+            if key in entries:
+                continue
+            agent = agents[color]
+            agent.tt.new_search()
+            agent.orderer.new_search()
+
+            scored = []
+            for move in game_state.get_legal_actions(color, board):
+                game_state.make_move(board, move)
+                score = agent.minimax(board, depth - 1, -math.inf, math.inf, False)
+                game_state.unmake_move(board)
+                scored.append((move, score))
+            if not scored:
+                continue
+
+            best = max(score for _, score in scored)
+            booked = []
+            for move, score in scored:
+                if best - score <= margin:
+                    weight = 1 + round(99 * (1 - (best - score) / margin)) if margin else 100
+                    booked.append((move, weight, score))
+                    next_frontier.append(
+                        (game_state.generate_successor(board, move), RED if color == BLACK else BLACK)
+                    )
+            entries[key] = booked
+            if progress is not None:
+                progress(len(entries), len(frontier) + len(next_frontier))
+        frontier = next_frontier
+
+    for agent in agents.values():
+        agent.close()
+    return entries
+
+
+def build_from_games(paths, plies=12, min_games=2):
+    """
+    Build book entries from recorded games.
+
+    Every move an engine played in the first `plies` moves of a game is
+    counted for its position; the random opening moves of tournament games
+    ("opening_plies") are skipped. A move's weight is the number of games
+    it was played in. Its score is the average result for the side that
+    played it, counting RESULT_SCALE for a win, 0 for a draw and
+    -RESULT_SCALE for a loss. Moves seen in fewer than `min_games` games
+    are left out.
+
+    Args:
+      paths: JSON lines files of game records with "moves" and "result",
+             and optionally "opening_plies" (as written by
+             tournament.run_tournament)
+      plies: Moves from the start of each game to take
+      min_games: Fewest games a move must appear in
+
+    Returns:
+      dict: {position key: [(Move, weight, score), ...]} for write_book
+    """
+    # (key, packed move) -> [games, total result for the mover (1, 0.5 or 0)]
+    counts = defaultdict(lambda: [0, 0.0])
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                game = json.loads(line)
+                board = BitBoard()
+                color = BLACK
+                random_plies = game.get("opening_plies", 0)
+                for ply, (start, *path, end) in enumerate(game.get("moves", [])[:plies]):
+                    move = pack_move(start, end, path)
+                    if ply >= random_plies:
+                        count = counts[(board.key(color), move)]
+                        count[0] += 1
+                        count[1] += game["result"] if color == BLACK else 1 - game["result"]
+                    board.apply(move)
+                    color = RED if color == BLACK else BLACK
+
+    entries = defaultdict(list)
+    for (key, move), (games, total) in counts.items():
+        if games >= min_games:
+            score = RESULT_SCALE * (2 * total / games - 1)
+            entries[key].append((Move.from_packed(move), games, score))
+    return dict(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect opening books")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Build a book from deep searches")
+    search.add_argument("--depth", type=int, default=8, help="Search depth (default: 8)")
+    search.add_argument("--plies", type=int, default=6, help="Book depth in moves (default: 6)")
+    search.add_argument(
+        "--margin",
+        type=float,
+        default=0.5,
+        help="Book moves scoring at most this much below the best (default: 0.5)",
+    )
+    search.add_argument("--output", default="book.bin", help="Book file (default: book.bin)")
+
+    games = commands.add_parser("games", help="Build a book from tournament game records")
+    games.add_argument("paths", nargs="+", help="JSON lines game records")
+    games.add_argument("--plies", type=int, default=12, help="Book depth in moves (default: 12)")
+    games.add_argument(
+        "--min-games", type=int, default=2, help="Fewest games per book move (default: 2)"
+    )
+    games.add_argument("--output", default="book.bin", help="Book file (default: book.bin)")
+
+    show = commands.add_parser("show", help="Print the book moves of the initial position")
+    show.add_argument("path", help="Book file")
+
+    args = parser.parse_args()
+
+    if args.command == "show":
+        book = OpeningBook(args.path)
+        print(f"{book.size} records")
+        for move, weight, score in book.probe(BitBoard(), BLACK):
+            print(f"  {move.start} -> {move.end}: weight {weight}, score {score:.2f}")
+        book.close()
+        return
+
+    if args.command == "search":
+
+        def progress(searched, queued):
+            print(f"\r  {searched} positions searched, {queued} queued", end="", flush=True)
+
+        entries = build_from_search(args.depth, args.plies, args.margin, progress)
+        print()
+    else:
+        entries = build_from_games(args.paths, args.plies, args.min_games)
+
+    records = write_book(args.output, entries)
+    print(f"{len(entries)} positions, {records} moves written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
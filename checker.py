@@ -4,12 +4,51 @@ from typing import Tuple
 from constants import *
 from board import Board
 from piece import Piece
+from bitboard import BitBoard, SQUARE_COORDS, SQUARE_INDEX, capture_path, pack_move, unpack_move
 
 Color = Tuple[int, int, int]
 
+#bump whenever the move rules change; files computed under other rules
+#(endgame tablebases, opening books) are then ignored
+RULES_VERSION = 2
+
+#MOVE_TABLES[color][is king][row][col]: the moves a piece may try from a dark
+#square, as (end, jumped square) pairs with jumped None for a plain step. Only
+#targets on the board are listed, in generation order: forward steps, forward
+#jumps, then for kings backward steps and backward jumps (left before right)
+def _build_move_tables(color):
+  fw = 1 if color == BLACK else -1
+  tables = []
+  for king in (False, True):
+    table = [[() for _ in range(COLS)] for _ in range(ROWS)]
+    for r, c in SQUARE_COORDS:
+      targets = []
+      for dr in ((fw, -fw) if king else (fw,)):
+        for dc in (-1, 1):
+          if 0 <= r + dr < ROWS and 0 <= c + dc < COLS:
+            targets.append(((r + dr, c + dc), None))
+        for dc in (-1, 1):
+          if 0 <= r + 2 * dr < ROWS and 0 <= c + 2 * dc < COLS:
+            targets.append(((r + 2 * dr, c + 2 * dc), (r + dr, c + dc)))
+      table[r][c] = tuple(targets)
+    tables.append(table)
+  return tables
+
+MOVE_TABLES = {BLACK: _build_move_tables(BLACK), RED: _build_move_tables(RED)}
+
+#result of GameState.get_node_status, from the point of view of the player to move
+class NodeStatus:
+  ONGOING = 0
+  WIN = 1
+  LOSE = 2
+  DRAW = 3
+
 class GameState:
   #return the list of pieces of the agent
   def get_all_pieces(self, color: Color, board: Board) -> list[Piece]:
+    if isinstance(board, BitBoard):
+      return board.get_all_pieces(color)
+
     pieces = []
 
     for r in range(ROWS):
@@ -20,70 +59,79 @@ class GameState:
 
     return pieces
   
-  #return all available legal action of the agent
+  #return all available legal action of the agent: if any capture exists only
+  #the capture chains, else the plain steps
   def get_legal_actions(self, color: Color, board: Board) ->list[Move]:
-    #black moves top to bottom
-    fw = 1 if color == BLACK else -1
-    bw = -1 if color == BLACK else 1
-    left = -1
-    right = 1
+    if isinstance(board, BitBoard):
+      return [Move.from_packed(m) for m in board.packed_moves(color, [])]
 
-    pieces = self.get_all_pieces(color, board)
+    #walk the precomputed targets of each piece: every target is on the board,
+    #so only the squares' contents need checking
+    tables = MOVE_TABLES[color]
+    grid = board.board
+    captures = []
+    for row in grid:
+      for p in row:
+        if p != 0 and p.color == color:
+          self.capture_chains(grid, p, (p.row, p.col), [], [], captures)
+    if captures:
+      return captures
 
     actions = []
-    for p in pieces:
-      r, c = p.row, p.col
-
-      #forward left
-      if self.range_check(r + fw, c + left) and board.get_piece(r + fw, c + left) == 0:
-        actions.append(Move(start=(r, c), end=(r + fw, c + left)))
-      #forward right
-      if self.range_check(r + fw, c + right) and board.get_piece(r + fw, c + right) == 0:
-        actions.append(Move(start=(r, c), end=(r + fw, c + right)))
-
-      
-      # check jumps
-      # forward left jump
-      mid_r_fl = r + fw
-      mid_c_fl = c + left
-      mid_p_fl = board.get_piece(mid_r_fl, mid_c_fl) if self.range_check(mid_r_fl, mid_c_fl) else 0
-      if self.jump_check(r + (fw * 2), c + (left * 2), p, mid_p_fl) and board.get_piece(r + (fw * 2), c + (left * 2)) == 0:
-        actions.append(Move(start=(r, c), end=(r + (fw * 2), c + (left * 2))))
-
-      # forward right jump
-      mid_r_fr = r + fw
-      mid_c_fr = c + right
-      mid_p_fr = board.get_piece(mid_r_fr, mid_c_fr) if self.range_check(mid_r_fr, mid_c_fr) else 0
-      if self.jump_check(r + (fw * 2), c + (right * 2), p, mid_p_fr) and board.get_piece(r + (fw * 2), c + (right * 2)) == 0:
-        actions.append(Move(start=(r, c), end=(r + (fw * 2), c + (right * 2))))
-
-      if(p.king):
-        # backward left
-        if self.range_check(r + bw, c + left) and board.get_piece(r + bw, c + left) == 0:
-          actions.append(Move(start=(r, c), end=(r + bw, c + left)))
-        # backward right
-        if self.range_check(r + bw, c + right) and board.get_piece(r + bw, c + right) == 0:
-          actions.append(Move(start=(r, c), end=(r + bw, c + right)))
-
-        # backward left jump
-        mid_r_bl = r + bw
-        mid_c_bl = c + left
-        mid_p_bl = board.get_piece(mid_r_bl, mid_c_bl) if self.range_check(mid_r_bl, mid_c_bl) else 0
-        if self.jump_check(r + (bw * 2), c + (left * 2), p, mid_p_bl) and board.get_piece(r + (bw * 2), c + (left * 2)) == 0:
-          actions.append(Move(start=(r, c), end=(r + (bw * 2), c + (left * 2))))
-
-        # backward right jump
-        mid_r_br = r + bw
-        mid_c_br = c + right
-        mid_p_br = board.get_piece(mid_r_br, mid_c_br) if self.range_check(mid_r_br, mid_c_br) else 0
-        if self.jump_check(r + (bw * 2), c + (right * 2), p, mid_p_br) and board.get_piece(r + (bw * 2), c + (right * 2)) == 0:
-          actions.append(Move(start=(r, c), end=(r + (bw * 2), c + (right * 2))))
+    for row in grid:
+      for p in row:
+        if p == 0 or p.color != color:
+          continue
+        start = (p.row, p.col)
+        for end, over in tables[p.king][p.row][p.col]:
+          if over is None and grid[end[0]][end[1]] == 0:
+            actions.append(Move(start=start, end=end))
 
     return actions
-  
+
+  #depth-first expansion of the capture chains of piece p that have landed on
+  #the squares in `path` so far (the last one is where p now stands). Jumped
+  #pieces are lifted off the grid while the chain continues, so none is taken
+  #twice, and p's own square is vacated; everything is put back on return.
+  #A chain ends where no jump is left or where a man is crowned.
+  def capture_chains(self, grid, p, start, path, captured, chains):
+    r, c = path[-1] if path else start
+    if not path:
+      grid[r][c] = 0
+    ended = True
+    for end, over in MOVE_TABLES[p.color][p.king][r][c]:
+      if over is None or grid[end[0]][end[1]] != 0:
+        continue
+      mid = grid[over[0]][over[1]]
+      if mid == 0 or mid.color == p.color:
+        continue
+      ended = False
+      grid[over[0]][over[1]] = 0
+      captured.append(over)
+      path.append(end)
+      crowned = not p.king and end[0] == (ROWS - 1 if p.color == BLACK else 0)
+      if crowned:
+        chains.append(Move(start=start, end=end, path=tuple(path[:-1])))
+      else:
+        self.capture_chains(grid, p, start, path, captured, chains)
+      path.pop()
+      captured.pop()
+      grid[over[0]][over[1]] = mid
+    if ended and path:
+      move = Move(start=start, end=path[-1], path=tuple(path[:-1]))
+      #a king can take the same pieces around a loop in either direction
+      taken = set(captured)
+      if not any(m.end == move.end and set(m.captures()) == taken for m in chains if m.start == start):
+        chains.append(move)
+    if not path:
+      grid[r][c] = p
+
   #In my turn, if opponent has no pieces left, I win
   def is_win(self, color: Color, board: Board):
     opponent_color = RED if color == BLACK else BLACK
+    if isinstance(board, BitBoard):
+      return board.pieces(opponent_color) == 0
+
     for r in range(ROWS):
       for c in range(COLS):
         p = board.get_piece(r, c)
@@ -93,6 +141,9 @@ class GameState:
 
   #In my turn, if I have no legal moves, I lose
   def is_lose(self, color: Color, board: Board):
+    if isinstance(board, BitBoard):
+      return board.count_moves(color) == 0
+
     moves = self.get_legal_actions(color, board)
     # Check if any piece has valid moves
     return len(moves) == 0
@@ -100,23 +151,47 @@ class GameState:
   #If the number of kings are the same and no one has won or lost, it's a draw
   def is_draw(self, color: Color, board: Board):
     if(self.is_win(color, board) == False and self.is_lose(color, board) == False):
-      opponent_color = RED if color == BLACK else BLACK
-
-      my_pieces = self.get_all_pieces(color, board)
-      opp_pieces = self.get_all_pieces(opponent_color, board)
-
-      my_king_count = sum(1 for p in my_pieces if p.king)
-      opp_king_count = sum(1 for p in opp_pieces if p.king)
-
-      if my_king_count == opp_king_count and len(my_pieces)-my_king_count == 0 and len(opp_pieces)-opp_king_count == 0:
-        return True
+      return self.equal_kings_only(color, board)
 
   #determine if the game has ended
   def is_terminal(self, color: Color, board: Board):
     return self.is_win(color, board) or self.is_lose(color, board) or self.is_draw(color, board)
 
+  #classify the position for the player to move, generating its legal moves only once
+  #returns (NodeStatus, legal moves); the checks match is_win, is_lose and is_draw
+  def get_node_status(self, color: Color, board: Board) -> tuple[int, list[Move]]:
+    moves = self.get_legal_actions(color, board)
+    if self.is_win(color, board):
+      return NodeStatus.WIN, moves
+    if not moves:
+      return NodeStatus.LOSE, moves
+    if self.equal_kings_only(color, board):
+      return NodeStatus.DRAW, moves
+    return NodeStatus.ONGOING, moves
+
+  #both players have only kings, and the same number of them
+  def equal_kings_only(self, color: Color, board: Board):
+    opponent_color = RED if color == BLACK else BLACK
+
+    if isinstance(board, BitBoard):
+      mine, theirs = board.pieces(color), board.pieces(opponent_color)
+      return (mine | theirs) & ~board.kings == 0 and mine.bit_count() == theirs.bit_count()
+
+    my_pieces = self.get_all_pieces(color, board)
+    opp_pieces = self.get_all_pieces(opponent_color, board)
+
+    my_king_count = sum(1 for p in my_pieces if p.king)
+    opp_king_count = sum(1 for p in opp_pieces if p.king)
+
+    return my_king_count == opp_king_count and len(my_pieces)-my_king_count == 0 and len(opp_pieces)-opp_king_count == 0
+
   #generate a new board state after applying the move
   def generate_successor(self, board: Board, move: Move) -> Board:
+    if isinstance(board, BitBoard):
+      new_board = board.copy()
+      new_board.apply(move.pack())
+      return new_board
+
     new_board = board.deep_copy_board()
 
     sr, sc = move.start
@@ -124,9 +199,7 @@ class GameState:
     p = new_board.get_piece(sr, sc)
 
     # remove captured pieces (if any)
-    if abs(sr-er) == 2 and abs(sc-ec) == 2:
-      mid_r = (sr + er) // 2
-      mid_c = (sc + ec) // 2
+    for mid_r, mid_c in move.captures():
       new_board.set_piece(mid_r, mid_c, 0)
 
     # perform the move on the copied piece
@@ -140,18 +213,65 @@ class GameState:
 
     return new_board
 
-  #helper functions
-  def range_check(self, row, col):
-    return 0 <= col and col < COLS and 0 <= row and row < ROWS 
-  
-  def jump_check(self, row, col, piece, mid_p):
-    return (self.range_check(row, col) and 
-            mid_p != 0 and
-            piece.color != mid_p.color
-            )
-  
+  #apply a move to the board in place; pair every call with unmake_move
+  def make_move(self, board: Board, move: Move):
+    if isinstance(board, BitBoard):
+      board.make_move(move.pack())
+    else:
+      board.make_move(move)
+
+  #undo the most recent make_move on the board
+  def unmake_move(self, board: Board):
+    board.unmake_move()
+
+  #packed-move versions of the above for the search, on BitBoards only:
+  #moves are ints (see bitboard.pack_move) written into a list the caller
+  #reuses, and unmake_move takes back make_packed_move as well
+  def get_packed_actions(self, color: Color, board: BitBoard, buffer: list[int]) -> list[int]:
+    return board.packed_moves(color, buffer)
+
+  def get_packed_node_status(self, color: Color, board: BitBoard, buffer: list[int]) -> int:
+    moves = self.get_packed_actions(color, board, buffer)
+    if board.pieces(RED if color == BLACK else BLACK) == 0:
+      return NodeStatus.WIN
+    if not moves:
+      return NodeStatus.LOSE
+    if self.equal_kings_only(color, board):
+      return NodeStatus.DRAW
+    return NodeStatus.ONGOING
+
+  def make_packed_move(self, board: BitBoard, move: int):
+    board.make_move(move)
+
+#(row, col) form of a move, used outside the search: by the UI, logging,
+#game records and the agent's get_best_move. A capture chain also lists the
+#squares it lands on between start and end in `path`
 @dataclass
 class Move:
   start: Tuple[int,int]
   end: Tuple[int,int]
-      
+  path: Tuple[Tuple[int,int], ...] = ()
+
+  #every square the piece stands on, from start to end
+  def squares(self) -> Tuple[Tuple[int,int], ...]:
+    return (self.start, *self.path, self.end)
+
+  #squares of the pieces this move jumps, in order
+  def captures(self) -> list[Tuple[int,int]]:
+    squares = self.squares()
+    return [
+      ((a[0] + b[0]) // 2, (a[1] + b[1]) // 2)
+      for a, b in zip(squares, squares[1:])
+      if abs(a[0] - b[0]) == 2
+    ]
+
+  def pack(self) -> int:
+    return pack_move(
+      SQUARE_INDEX[self.start], SQUARE_INDEX[self.end], [SQUARE_INDEX[s] for s in self.path]
+    )
+
+  @classmethod
+  def from_packed(cls, move: int) -> Move:
+    start, end = unpack_move(move)
+    path = tuple(SQUARE_COORDS[s] for s in capture_path(move))
+    return cls(start=SQUARE_COORDS[start], end=SQUARE_COORDS[end], path=path)
@@ -1,5 +1,3 @@
-import pygame
-
 WIDTH, HEIGHT = 800, 800
 ROWS, COLS = 8, 8
 SQUARE_WIDTH = WIDTH // COLS
@@ -10,5 +8,3 @@ BLACK = (0, 0, 0)
 #board
 BEIGE = (245, 241, 221)
 BROWN = (78,53,36)
-
-CROWN = pygame.transform.scale(pygame.image.load('assets/crown.bmp'), (44, 25))
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Evaluation Weights for the Checkers Agent
+
+Every term of Agent.evaluate except mobility depends only on which piece sits
+on which square, so it can be written as a piece-square table: one value per
+(piece kind, square). A position's score is then the sum of its pieces'
+table values, which BitBoard keeps up to date move by move.
+
+All weights are in tenths of a point so the running sums are exact integers;
+Agent.evaluate divides by 10 at the end.
+"""
+
+from constants import ROWS, COLS
+
+# Material: a man is worth 6 points, a king 1.5x as much
+MAN_VALUE = 60
+KING_VALUE = 90
+# Extra bonus for every king on the board
+KING_BONUS = 50
+# Men closer to promotion are more valuable: 0.5 per row advanced
+ADVANCE = 5
+# Pieces on the center squares
+CENTER_BONUS = 20
+# Own pieces on the left/right edge are safer
+EDGE_BONUS = 10
+# Own men away from the edges are more exposed
+EXPOSED_MAN = -5
+# Own kings closer to the opponent's back row are more threatening: 0.3 per row
+KING_ADVANCE = 3
+# Per legal move (mobility is not part of the tables)
+MOBILITY = 5
+
+CENTER_SQUARES = [(3, 3), (3, 4), (4, 3), (4, 4)]
+
+
+def build_piece_square_tables(square_coords):
+    """
+    Build the piece-square tables.
+
+    Each table is indexed [kind][square] with kinds ordered BLACK_MAN,
+    RED_MAN, BLACK_KING, RED_KING (as in transposition.PIECE_KEYS).
+
+    Shared values count for the piece's owner and against the opponent
+    (material, advancement, center). Own values only count when the owner
+    is the side being evaluated (edge safety, exposure, king advancement).
+
+    Args:
+      square_coords: (row, col) of every square index
+
+    Returns:
+      tuple: (shared table, own table)
+    """
+    shared = [[0] * len(square_coords) for _ in range(4)]
+    own = [[0] * len(square_coords) for _ in range(4)]
+
+    for s, (row, col) in enumerate(square_coords):
+        center = CENTER_BONUS if (row, col) in CENTER_SQUARES else 0
+        edge = col == 0 or col == COLS - 1
+
+        # rows advanced from the owner's back row: BLACK starts at row 0, RED at row 7
+        for kind, advanced in ((0, row), (1, ROWS - 1 - row), (2, row), (3, ROWS - 1 - row)):
+            if kind < 2:
+                shared[kind][s] = MAN_VALUE + ADVANCE * advanced + center
+                own[kind][s] = EDGE_BONUS if edge else EXPOSED_MAN
+            else:
+                shared[kind][s] = KING_VALUE + KING_BONUS + center
+                own[kind][s] = (EDGE_BONUS if edge else 0) + KING_ADVANCE * advanced
+
+    return tuple(map(tuple, shared)), tuple(map(tuple, own))
@@ -1,8 +1,8 @@
 # game.py
-import pygame
 from constants import *
 from board import Board
 from piece import Piece
+from checker import GameState, Move
 
 class Game:
   def __init__(self, win):
@@ -36,34 +36,36 @@ class Game:
   def get_current_player(self):
     return self.turn
 
-  def _move(self, row, col):
+  #move the selected piece to (row, col) if that is one of its legal moves.
+  #Captures are mandatory, and a capture chain is made in one go: pass the
+  #squares it lands on in between as `path` to pick one chain among several
+  #ending on the same square (without it the first such chain is played)
+  def _move(self, row, col, path=None):
     piece = self.selected
     if piece is None:
       return False
 
-    # Only allow moves to empty squares 
-    if self.board.get_piece(row, col) != 0:
-      return False
-
-    # Original coordinates
-    r0, c0 = piece.row, piece.col
+    start = (piece.row, piece.col)
+    for move in GameState().get_legal_actions(piece.color, self.board):
+      if move.start != start or move.end != (row, col):
+        continue
+      if path is not None and move.pack() != Move(start, (row, col), tuple(path)).pack():
+        continue
+      #every piece the chain jumps is captured
+      for mr, mc in move.captures():
+        self.board.set_piece(mr, mc, 0)
 
-    # Make a jump
-    dr, dc = row - r0, col - c0
-    if abs(dr) == 2 and abs(dc) == 2:
-      #The middle piece is captured
-      mr, mc = (r0 + row) // 2, (c0 + col) // 2
-      self.board.set_piece(mr, mc, 0)
+      self.board.move(piece, row, col)
 
-    self.board.move(piece, row, col)
+      # make it king if it reaches the opposite side 
+      if piece.color == RED and row == 0:
+        piece.make_king()
+      elif piece.color == BLACK and row == ROWS-1:
+        piece.make_king()
 
-    # make it king if it reaches the opposite side 
-    if piece.color == RED and row == 0:
-      piece.make_king()
-    elif piece.color == BLACK and row == ROWS-1:
-      piece.make_king()
+      return True
 
-    return True
+    return False
   
   #update the display
   def update(self): 
@@ -71,5 +73,6 @@ class Game:
     if self.win is None:
       return
 
+    import pygame
     self.board.draw(self.win)
     pygame.display.update()
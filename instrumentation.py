@@ -0,0 +1,178 @@
+"""
+Search Instrumentation
+
+Optional counters and timers that show where an Agent's search time goes.
+They split each get_best_move call into move generation, successor
+construction (making and unmaking moves), terminal checks and evaluation,
+and count the nodes searched at every ply.
+
+Nothing here runs unless the agent is created with profile=True. The agent
+then gets a ProfilingGameState instead of a GameState, and timed wrappers
+around its evaluate and get_best_move methods. The search code itself is
+unchanged, so a normal agent pays no cost at all.
+"""
+
+import functools
+import time
+
+from checker import GameState
+
+PHASES = ("movegen", "successor", "terminal", "eval")
+
+
+class SearchProfiler:
+    """
+    Phase timers and per-ply node counts of one agent's current search.
+
+    Attributes:
+      times: Phase name -> seconds spent in it, for every phase in PHASES
+      calls: Phase name -> number of timed calls
+      nodes_by_ply: nodes_by_ply[p] is the number of nodes searched p plies
+                    below the root, summed over iterative deepening
+                    iterations (the root itself counts once)
+      total: Seconds spent in the last get_best_move call
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all counters before a new search."""
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.nodes_by_ply = [1]
+        self.total = 0.0
+
+    def add(self, phase, seconds):
+        self.times[phase] += seconds
+        self.calls[phase] += 1
+
+    def count_node(self, ply):
+        """Count a node `ply` plies below the root."""
+        while len(self.nodes_by_ply) <= ply:
+            self.nodes_by_ply.append(0)
+        self.nodes_by_ply[ply] += 1
+
+    def timed(self, phase, func):
+        """Wrap `func` so that its calls are timed as `phase`."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+
+        return wrapper
+
+    def search(self, func):
+        """Wrap a get_best_move method: reset the counters, then time the call."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.reset()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.total = time.perf_counter() - start
+
+        return wrapper
+
+    def report(self, depth):
+        """
+        Summarize the last search.
+
+        Args:
+          depth: Depth of the last completed search, for the branching factor
+
+        Returns:
+          dict: seconds per phase (plus "other" and "total"), each phase's
+                share of the total, calls per phase, nodes per ply, and the
+                effective branching factor (nodes ** (1 / depth))
+        """
+        other = max(0.0, self.total - sum(self.times.values()))
+        seconds = dict(self.times, other=other, total=self.total)
+        nodes = sum(self.nodes_by_ply)
+        return {
+            "seconds": seconds,
+            "share": {
+                phase: (spent / self.total if self.total else 0.0)
+                for phase, spent in seconds.items()
+                if phase != "total"
+            },
+            "calls": dict(self.calls),
+            "nodes_by_ply": list(self.nodes_by_ply),
+            "effective_branching_factor": nodes ** (1 / depth) if depth > 0 else 0.0,
+        }
+
+
+class ProfilingGameState(GameState):
+    """
+    GameState that reports the time spent in each of its methods.
+
+    get_legal_actions counts as move generation; make_move, unmake_move and
+    generate_successor as successor construction; the rest of
+    get_node_status (win, loss and draw checks) as terminal checks, and the
+    same for their packed-move versions used by the search. Every move made
+    also counts a node at its ply, taken from the board's undo stack, so the
+    search must start from a board without undo history.
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def get_legal_actions(self, color, board):
+        start = time.perf_counter()
+        moves = super().get_legal_actions(color, board)
+        self.profiler.add("movegen", time.perf_counter() - start)
+        return moves
+
+    def get_node_status(self, color, board):
+        profiler = self.profiler
+        movegen_before = profiler.times["movegen"]
+        start = time.perf_counter()
+        result = super().get_node_status(color, board)
+        elapsed = time.perf_counter() - start
+        # the moves are generated inside; that part is already counted as movegen
+        profiler.add("terminal", elapsed - (profiler.times["movegen"] - movegen_before))
+        return result
+
+    def get_packed_actions(self, color, board, buffer):
+        start = time.perf_counter()
+        moves = super().get_packed_actions(color, board, buffer)
+        self.profiler.add("movegen", time.perf_counter() - start)
+        return moves
+
+    def get_packed_node_status(self, color, board, buffer):
+        profiler = self.profiler
+        movegen_before = profiler.times["movegen"]
+        start = time.perf_counter()
+        status = super().get_packed_node_status(color, board, buffer)
+        elapsed = time.perf_counter() - start
+        profiler.add("terminal", elapsed - (profiler.times["movegen"] - movegen_before))
+        return status
+
+    def generate_successor(self, board, move):
+        start = time.perf_counter()
+        successor = super().generate_successor(board, move)
+        self.profiler.add("successor", time.perf_counter() - start)
+        return successor
+
+    def make_move(self, board, move):
+        start = time.perf_counter()
+        super().make_move(board, move)
+        self.profiler.add("successor", time.perf_counter() - start)
+        self.profiler.count_node(len(board.undo_stack))
+
+    def make_packed_move(self, board, move):
+        start = time.perf_counter()
+        super().make_packed_move(board, move)
+        self.profiler.add("successor", time.perf_counter() - start)
+        self.profiler.count_node(len(board.undo_stack))
+
+    def unmake_move(self, board):
+        start = time.perf_counter()
+        super().unmake_move(board)
+        self.profiler.add("successor", time.perf_counter() - start)
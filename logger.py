@@ -215,7 +215,7 @@ class GameLogger:
         Log all legal moves available.
 
         Args:
-            legal_actions: Dictionary of legal actions {(row, col): [(end_row, end_col), ...]}
+            legal_actions: List of legal Move objects
             color: Color of player making moves
         """
         if self.log_level > LogLevel.DEBUG:
@@ -223,13 +223,15 @@ class GameLogger:
 
         color_name = "BLACK" if color == BLACK else "RED"
 
-        total_moves = sum(len(moves) for moves in legal_actions.values())
-        self.debug(f"Legal moves for {color_name}: {total_moves} available")
+        self.debug(f"Legal moves for {color_name}: {len(legal_actions)} available")
 
         if self.log_level <= LogLevel.TRACE:
-            for start_pos, end_positions in legal_actions.items():
-                if end_positions:
-                    self.trace(f"  From {start_pos}: {end_positions}")
+            # Group destinations by starting square
+            by_start = {}
+            for move in legal_actions:
+                by_start.setdefault(move.start, []).append(move.end)
+            for start_pos, end_positions in by_start.items():
+                self.trace(f"  From {start_pos}: {end_positions}")
 
     def log_move_evaluation(self, move, score, depth=None):
         """
@@ -256,7 +258,8 @@ class GameLogger:
             agent: Agent that made the decision
             best_move: Selected Move object
             score: Evaluation score of the move
-            stats: Dictionary with 'nodes_explored' and 'pruning_count'
+            stats: Dictionary with 'nodes_explored' and 'pruning_count', and
+                   a 'profile' dictionary when the agent is profiling
         """
         color_name = "BLACK" if agent.color == BLACK else "RED"
 
@@ -273,6 +276,20 @@ class GameLogger:
             efficiency = (stats["pruning_count"] / stats["nodes_explored"]) * 100
             self.debug(f"    Pruning Efficiency: {efficiency:.1f}%")
 
+        # Time per search phase, when the agent is profiling
+        profile = stats.get("profile")
+        if profile is not None:
+            seconds, share = profile["seconds"], profile["share"]
+            self.debug(f"  Search Profile ({seconds['total']:.3f}s):")
+            for phase in ("movegen", "successor", "terminal", "eval", "other"):
+                self.debug(
+                    f"    {phase:<10} {seconds[phase]:.3f}s ({share[phase] * 100:.1f}%)"
+                )
+            self.debug(f"    Nodes per Ply: {profile['nodes_by_ply']}")
+            self.debug(
+                f"    Effective Branching Factor: {profile['effective_branching_factor']:.2f}"
+            )
+
         # Update global statistics
         self.total_nodes_explored += stats["nodes_explored"]
         self.total_pruning_count += stats["pruning_count"]
@@ -297,9 +314,10 @@ class GameLogger:
         )
 
         if is_jump:
-            mid_r = (move.start[0] + move.end[0]) // 2
-            mid_c = (move.start[1] + move.end[1]) // 2
-            self.info(f"  Captured opponent piece at ({mid_r}, {mid_c})")
+            if move.path:
+                self.info(f"  Jumping via {' -> '.join(map(str, move.path))}")
+            for mid_r, mid_c in move.captures():
+                self.info(f"  Captured opponent piece at ({mid_r}, {mid_c})")
 
         if is_promotion:
             self.info(f"  PROMOTION: Piece became a KING!")
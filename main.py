@@ -4,8 +4,9 @@ import time
 from constants import *
 from game import Game
 from agent import Agent
-from checker import Move, GameState
+from checker import Move, GameState, NodeStatus
 from logger import create_logger, LogLevel
+from tournament import PlayerSpec, parse_player, run_tournament, format_report
 import argparse
 
 FPS = 60
@@ -46,7 +47,7 @@ def run_human_game():
     pygame.quit()
 
 
-def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_search="minimax", red_search="minimax"):
+def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_search="minimax", red_search="minimax", movetime=None, workers=1, parallel_mode="root", profile=False, tablebase=None, book=None, quiescence=0):
     """
     Run AI vs AI game with comprehensive logging.
 
@@ -54,6 +55,14 @@ def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_searc
       depth: Search depth for minimax (default: 4)
       log_level: Logging level (INFO, DEBUG, or TRACE)
       move_delay: Delay in seconds between moves for visualization (default: 1.0)
+      movetime: Seconds per move for iterative deepening; overrides depth (default: None)
+      workers: Processes each agent searches with (default: 1)
+      parallel_mode: "root" to split root moves across the workers, "lazy_smp"
+                     to share a transposition table between them (default: "root")
+      profile: Time each search phase and log it at DEBUG level (default: False)
+      tablebase: Endgame tablebase directory for both agents (default: None)
+      book: Opening book file for both agents (default: None)
+      quiescence: Capture plies searched past the depth horizon (default: 0, off)
     """
     # Initialize logger
     logger = create_logger(log_level=log_level, log_to_file=True)
@@ -65,11 +74,15 @@ def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_searc
     game_state = GameState()
 
     # Create AI agents (per-player search choice)
-    agent_black = Agent(BLACK, depth=depth, search_type=black_search)
-    agent_red = Agent(RED, depth=depth, search_type=red_search)
-
-    logger.info(f"BLACK Agent: Search depth = {depth}")
-    logger.info(f"RED Agent: Search depth = {depth}")
+    agent_black = Agent(BLACK, depth=depth, search_type=black_search, movetime=movetime, workers=workers, parallel_mode=parallel_mode, profile=profile, tablebase=tablebase, book=book, quiescence=quiescence)
+    agent_red = Agent(RED, depth=depth, search_type=red_search, movetime=movetime, workers=workers, parallel_mode=parallel_mode, profile=profile, tablebase=tablebase, book=book, quiescence=quiescence)
+
+    if movetime is None:
+        logger.info(f"BLACK Agent: Search depth = {depth}")
+        logger.info(f"RED Agent: Search depth = {depth}")
+    else:
+        logger.info(f"BLACK Agent: Iterative deepening, {movetime}s per move")
+        logger.info(f"RED Agent: Iterative deepening, {movetime}s per move")
     logger.info("")
 
     # Log initial board
@@ -119,24 +132,22 @@ def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_searc
         # Log turn start
         logger.log_turn_start(turn_number, current_color, current_agent)
 
-        # Check for game termination
-        if game_state.is_terminal(current_color, game.board):
-            if game_state.is_win(current_color, game.board):
-                winner = current_color
-                reason = "Opponent has no pieces remaining"
-                logger.log_game_end(winner, reason)
-                break
-            elif game_state.is_lose(current_color, game.board):
-                winner = RED if current_color == BLACK else BLACK
-                reason = "Current player has no legal moves"
-                logger.log_game_end(winner, reason)
-                break
-            elif game_state.is_draw(current_color, game.board):
-                logger.log_game_end(winner=None, reason="Draw - equal king count")
-                break
+        # Get legal moves and check for game termination
+        status, legal_actions = game_state.get_node_status(current_color, game.board)
+        if status == NodeStatus.WIN:
+            winner = current_color
+            reason = "Opponent has no pieces remaining"
+            logger.log_game_end(winner, reason)
+            break
+        elif status == NodeStatus.LOSE:
+            winner = RED if current_color == BLACK else BLACK
+            reason = "Current player has no legal moves"
+            logger.log_game_end(winner, reason)
+            break
+        elif status == NodeStatus.DRAW:
+            logger.log_game_end(winner=None, reason="Draw - equal king count")
+            break
 
-        # Get legal moves
-        legal_actions = game_state.get_legal_actions(current_color, game.board)
         logger.log_legal_moves(legal_actions, current_color)
 
         # Check if agent has any moves
@@ -166,12 +177,12 @@ def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_searc
         start_row, start_col = best_move.start
         end_row, end_col = best_move.end
 
-        # Check if it's a jump
-        is_jump = abs(start_row - end_row) == 2
+        # Check if it's a jump (or a chain of them)
+        is_jump = bool(best_move.captures())
 
-        # Select piece and move it
+        # Select piece and move it along the chosen path
         game.selected = game.board.get_piece(start_row, start_col)
-        moved = game._move(end_row, end_col)
+        moved = game._move(end_row, end_col, best_move.path)
 
         if not moved:
             logger.log_error(
@@ -222,6 +233,10 @@ def run_agent_game(depth=4, log_level=LogLevel.INFO, move_delay=1.0, black_searc
     if turn_number >= max_turns:
         logger.log_game_end(winner=None, reason=f"Maximum turns ({max_turns}) reached")
 
+    # Stop any worker processes
+    agent_black.close()
+    agent_red.close()
+
     # Close logger
     logger.info("")
     logger.info("Game complete.")
@@ -236,13 +251,52 @@ def main():
     parser = argparse.ArgumentParser(description="Checker Game with AI Agents")
     parser.add_argument(
         "--mode",
-        choices=["human", "agent"],
+        choices=["human", "agent", "tournament"],
         default="human",
-        help="Choose who plays: human, or agent",
+        help="Choose who plays: human, agent, or a headless agent tournament",
     )
     parser.add_argument(
         "--depth", type=int, default=4, help="Search depth for AI agents (default: 4)"
     )
+    parser.add_argument(
+        "--movetime",
+        type=float,
+        default=None,
+        help="Seconds per AI move; searches with iterative deepening instead of a fixed --depth",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes each AI agent searches with (default: 1)",
+    )
+    parser.add_argument(
+        "--parallel",
+        choices=["root", "lazy_smp"],
+        default="root",
+        help="How workers share a search: split root moves, or Lazy SMP helpers (default: root)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each AI search phase and log it (shown at --log-level DEBUG)",
+    )
+    parser.add_argument(
+        "--quiescence",
+        type=int,
+        default=0,
+        help="Plies AI agents search on through captures past --depth (default: 0, off)",
+    )
+    parser.add_argument(
+        "--tablebase",
+        default=None,
+        help="Endgame tablebase directory (generate one with tablebase.py)",
+    )
+    parser.add_argument(
+        "--book",
+        default=None,
+        help="Opening book file (build one with book.py)",
+    )
     parser.add_argument(
         "--log-level",
         choices=["INFO", "DEBUG", "TRACE"],
@@ -262,16 +316,53 @@ def main():
     )
     parser.add_argument(
         "--black-search",
-        choices=["minimax", "expectimax"],
+        choices=["minimax", "expectimax", "pvs", "mtdf"],
         default="minimax",
         help="Search algorithm for BLACK agent (default: minimax)",
     )
     parser.add_argument(
         "--red-search",
-        choices=["minimax", "expectimax"],
+        choices=["minimax", "expectimax", "pvs", "mtdf"],
         default="minimax",
         help="Search algorithm for RED agent (default: minimax)",
     )
+    parser.add_argument(
+        "--player",
+        type=parse_player,
+        action="append",
+        help=(
+            "Tournament player as key=value pairs (name, depth, search, movetime, agent, "
+            "book, quiescence), "
+            "e.g. name=d6,depth=6; repeat for each player (default: the BLACK and RED "
+            "agents configured by --depth and --black-search/--red-search)"
+        ),
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=100,
+        help="Tournament games per pair of players (default: 100)",
+    )
+    parser.add_argument(
+        "--opening-plies",
+        type=int,
+        default=4,
+        help="Random moves at the start of every tournament game (default: 4)",
+    )
+    parser.add_argument(
+        "--game-workers",
+        type=int,
+        default=None,
+        help="Tournament games played at once (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--results",
+        default=None,
+        help="JSON lines file for tournament game records (default: logs/tournament_<time>.jsonl)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for tournament openings (default: 0)"
+    )
     args = parser.parse_args()
 
     if args.mode == "human":
@@ -298,7 +389,11 @@ def main():
             pygame.display.set_caption('Checkers')
 
         print(f"Running AI vs AI mode")
-        print(f"  Search depth: {args.depth}")
+        if args.movetime is None:
+            print(f"  Search depth: {args.depth}")
+        else:
+            print(f"  Move time: {args.movetime}s (iterative deepening)")
+        print(f"  Workers: {args.workers} ({args.parallel})")
         print(f"  Log level: {args.log_level}")
         print(f"  Move delay: {args.delay}s")
         print(f"  Headless: {args.headless}")
@@ -314,7 +409,48 @@ def main():
             move_delay=args.delay,
             black_search=args.black_search,
             red_search=args.red_search,
+            movetime=args.movetime,
+            workers=args.workers,
+            parallel_mode=args.parallel,
+            profile=args.profile,
+            tablebase=args.tablebase,
+            book=args.book,
+            quiescence=args.quiescence,
         )
+    elif args.mode == "tournament":
+        players = args.player or [
+            PlayerSpec("black", args.depth, args.black_search, args.movetime, quiescence=args.quiescence),
+            PlayerSpec("red", args.depth, args.red_search, args.movetime, quiescence=args.quiescence),
+        ]
+        if len(players) < 2:
+            parser.error("a tournament needs at least two --player options")
+
+        print("Running tournament mode")
+        for player in players:
+            budget = f"depth {player.depth}" if player.movetime is None else f"{player.movetime}s/move"
+            print(f"  {player.name}: {player.search_type}, {budget}")
+        print(f"  Games per matchup: {args.games}")
+        print(f"  Opening plies: {args.opening_plies}")
+        print()
+
+        def progress(done, total):
+            print(f"\r  {done}/{total} games", end="", flush=True)
+
+        summary = run_tournament(
+            players,
+            args.games,
+            opening_plies=args.opening_plies,
+            workers=args.game_workers,
+            results_path=args.results,
+            seed=args.seed,
+            progress=progress,
+        )
+        print()
+        for line in format_report(summary):
+            print(line)
 
 
-main()
+# Worker processes re-import this module when they are spawned; only the
+# parent process should start a game
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Move Ordering for Alpha-Beta Search
+
+Alpha-beta prunes the most when the best move is searched first. The
+MoveOrderer sorts a node's moves using cheap, search-independent knowledge
+(captures and promotions are usually good) and what earlier cutoffs taught
+us (killer moves per ply and a history table).
+"""
+
+from bitboard import MOVE_CAPTURE_SHIFT, MOVE_TO_SHIFT, PROMOTION_ROW
+
+# Ordering tiers, searched highest first
+TT_MOVE = 4  # best move remembered by the transposition table
+CAPTURE = 3  # jumps (a jump that also promotes sorts first within the tier)
+PROMOTION = 2  # quiet moves that crown a man
+KILLER = 1  # quiet moves that caused a cutoff at the same ply
+QUIET = 0  # everything else, ranked by history score
+
+# Number of plies killer moves are kept for
+MAX_PLY = 128
+
+
+class MoveOrderer:
+    """
+    Orders moves for the search and learns from its cutoffs.
+
+    Attributes:
+      killers: Per ply, the two most recent quiet moves that caused a cutoff
+      history: (color, packed move) -> accumulated cutoff score of a quiet move
+    """
+
+    def __init__(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {}
+
+    def new_search(self):
+        """
+        Prepare for a new root search.
+
+        Killers only make sense within one search. History is kept but halved
+        so that cutoffs from earlier positions fade out.
+        """
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+    def order(self, board, color, moves, ply, tt_move=None):
+        """
+        Sort `moves` best-first, in place.
+
+        Args:
+          board: BitBoard position the moves belong to
+          color: Color to move
+          moves: Legal packed moves, e.g. a per-ply move buffer
+          ply: Distance from the root, for killer lookup
+          tt_move: Packed move to search first, e.g. from the transposition table
+
+        Returns:
+          list[int]: `moves`, best candidates first (stable for ties)
+        """
+        killers = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history
+        promotion = PROMOTION_ROW[color]
+        men = ~board.kings
+
+        def sort_key(move):
+            if move == tt_move:
+                return (TT_MOVE, 0)
+            promotes = promotion >> (move >> MOVE_TO_SHIFT & 31) & men >> (move & 31) & 1
+            if move >> MOVE_CAPTURE_SHIFT:
+                return (CAPTURE, promotes)
+            if promotes:
+                return (PROMOTION, 0)
+            if move == killers[0]:
+                return (KILLER, 1)
+            if move == killers[1]:
+                return (KILLER, 0)
+            return (QUIET, history.get((color, move), 0))
+
+        moves.sort(key=sort_key, reverse=True)
+        return moves
+
+    def record_cutoff(self, color, move, depth, ply):
+        """
+        Learn from a move that caused a beta cutoff.
+
+        Only quiet moves are recorded: captures are already searched early.
+
+        Args:
+          color: Color that played the move
+          move: The packed move that caused the cutoff
+          depth: Remaining depth of the node (deeper cutoffs weigh more)
+          ply: Distance of the node from the root
+        """
+        if move >> MOVE_CAPTURE_SHIFT:
+            return
+
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+
+        history_key = (color, move)
+        self.history[history_key] = self.history.get(history_key, 0) + depth * depth
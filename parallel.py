@@ -0,0 +1,192 @@
+"""
+Root-Parallel Search
+
+Splits the root moves of Agent.search_root across a process pool. The first
+(best-ordered) root move is searched in the calling process to get a good
+alpha bound, then the remaining moves are searched in parallel, as in the
+Young Brothers Wait Concept applied at the root. Every worker publishes the
+exact scores it finds to a shared alpha bound and starts each move from the
+best bound known so far.
+
+Each root move is searched with alpha just below the shared bound, so a move
+that ties the best score gets its exact score back. Together with the
+tie-break on generation order in Agent.search_root this makes the chosen
+move identical to the serial search at the same depth.
+"""
+
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from agent import SearchTimeout
+from bitboard import BitBoard
+
+# Per-process state of a pool worker, set by _init_worker
+_agent = None
+_alpha = None
+# Table generation of the agent's search the worker last took part in
+_generation = None
+
+
+def _init_worker(agent_class, agent_kwargs, shared_alpha):
+    global _agent, _alpha, _generation
+    _agent = agent_class(**agent_kwargs)
+    _alpha = shared_alpha
+    _generation = None
+
+
+def _search_root_move(position, move, depth, deadline, generation):
+    """
+    Search one root move in a worker process.
+
+    The first root move of every new search of the agent starts a new search
+    of the worker's own table and move ordering, as get_best_move does.
+
+    Args:
+      position: (black, red, kings) masks of the root position
+      move: The packed root move
+      depth: Root search depth (the root move counts as one ply)
+      deadline: time.time() at which to give up, or None
+      generation: The agent's transposition table generation, which
+                  get_best_move advances once per search
+
+    Returns:
+      tuple: (score or None if the deadline passed, nodes explored,
+              branches pruned, table cutoffs, first-move cutoffs)
+    """
+    global _generation
+    agent = _agent
+    if generation != _generation:
+        agent.tt.new_search()
+        agent.orderer.new_search()
+        _generation = generation
+    agent.nodes_explored = agent.pruning_count = 0
+    agent.tt_cutoffs = agent.first_move_cutoffs = 0
+    if deadline is not None:
+        agent._deadline = time.perf_counter() + (deadline - time.time())
+
+    board = BitBoard(*position)
+    agent.game_state.make_packed_move(board, move)
+    try:
+        score = agent.score_root_move(board, depth, _alpha.value, math.inf)
+    except SearchTimeout:
+        score = None
+    finally:
+        agent._deadline = None
+
+    if score is not None:
+        with _alpha.get_lock():
+            if score > _alpha.value:
+                _alpha.value = score
+
+    return (
+        score,
+        agent.nodes_explored,
+        agent.pruning_count,
+        agent.tt_cutoffs,
+        agent.first_move_cutoffs,
+    )
+
+
+class ParallelRootSearch:
+    """
+    Process pool that searches the root moves of one agent.
+
+    The pool is started on first use and kept across moves, so each worker's
+    transposition table and history table carry over like the agent's own,
+    and are aged at the start of every search as the agent's are.
+
+    Attributes:
+      agent: Agent whose root searches are split
+      workers: Number of worker processes
+    """
+
+    def __init__(self, agent, workers):
+        self.agent = agent
+        self.workers = workers
+        self._alpha = multiprocessing.Value("d", -math.inf)
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            agent = self.agent
+            kwargs = {
+                "color": agent.color,
+                "depth": agent.depth,
+                "search_type": agent.search_type,
+                "tt_size": agent.tt.size,
+                "tablebase": agent.tablebase and agent.tablebase.directory,
+                "quiescence": agent.quiescence_depth,
+                "star2": agent.star2,
+            }
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(type(agent), kwargs, self._alpha),
+            )
+        return self._executor
+
+    def close(self):
+        """Shut the worker processes down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search_root(self, board, ordered, depth):
+        """
+        Score every root move, the first one locally and the rest in the pool.
+
+        Args:
+          board: Root BitBoard position
+          ordered: Root moves, best candidate first
+          depth: Search depth (the root move itself counts as one ply)
+
+        Returns:
+          list[float]: Score of each move in `ordered`; a move that cannot
+          be the best one may get an upper bound instead of its exact score
+
+        Raises:
+          SearchTimeout: If the agent's deadline passes before every move is scored
+        """
+        agent = self.agent
+        game_state = agent.game_state
+
+        # Youngest brother first: the best-ordered move sets the initial bound
+        first = ordered[0]
+        game_state.make_packed_move(board, first)
+        first_score = agent.score_root_move(board, depth, -math.inf, math.inf, first=True)
+        game_state.unmake_move(board)
+
+        self._alpha.value = first_score
+        deadline = None
+        if agent._deadline is not None:
+            deadline = time.time() + (agent._deadline - time.perf_counter())
+
+        position = (board.black, board.red, board.kings)
+        futures = [
+            self._pool().submit(
+                _search_root_move,
+                position,
+                move,
+                depth,
+                deadline,
+                agent.tt.generation,
+            )
+            for move in ordered[1:]
+        ]
+
+        scores = [first_score]
+        timed_out = False
+        for future in futures:
+            score, nodes, pruned, tt_cutoffs, first_move_cutoffs = future.result()
+            agent.nodes_explored += nodes
+            agent.pruning_count += pruned
+            agent.tt_cutoffs += tt_cutoffs
+            agent.first_move_cutoffs += first_move_cutoffs
+            timed_out = timed_out or score is None
+            scores.append(score)
+
+        if timed_out:
+            raise SearchTimeout()
+        return scores
@@ -0,0 +1,186 @@
+"""
+Perft: Move Generation Counting
+
+Counts the leaf nodes of the full game tree to a fixed depth, using only
+GameState.get_legal_actions and GameState.generate_successor. The counts
+only depend on the move generation rules, so they catch move generation
+bugs, and the time they take measures move generation throughput.
+
+Known-good counts for a few stored positions are in POSITIONS; test/test_perft.py
+checks them against both the Board and the BitBoard implementation.
+
+Usage:
+  python perft.py --depth 6
+  python perft.py --depth 4 --position kings --divide
+  python perft.py --check
+"""
+
+import argparse
+import time
+
+from bitboard import BitBoard
+from checker import GameState
+from constants import BLACK, RED
+
+# name -> (position string as written by BitBoard.to_string, side to move,
+#          {depth: leaf count})
+# Counts follow the current rules: capturing is mandatory and a whole
+# multi-jump chain is one move. The start counts are the published ones for
+# English draughts.
+POSITIONS = {
+    "start": (
+        "bbbb/bbbb/bbbb/..../..../rrrr/rrrr/rrrr",
+        BLACK,
+        {1: 7, 2: 49, 3: 302, 4: 1469, 5: 7361, 6: 36768, 7: 179740},
+    ),
+    "middlegame": (
+        "..R./.b.r/rbR./b.r./..../r.b./rbbr/r.r.",
+        RED,
+        {1: 3, 2: 3, 3: 5, 4: 23, 5: 114, 6: 532},
+    ),
+    "crowded": (
+        "..../bRbb/br../b.bb/rrrb/r.br/rB../..B.",
+        BLACK,
+        {1: 4, 2: 15, 3: 34, 4: 82, 5: 206, 6: 505},
+    ),
+    "kings": (
+        "R..b/...b/..bb/..../.b../r.r./r..r/..BB",
+        BLACK,
+        {1: 1, 2: 5, 3: 21, 4: 130, 5: 674, 6: 4004},
+    ),
+    # a king chain around a loop back to its start square, and two chains
+    # that end on the same square with different captures
+    "chains": (
+        "b.../..r./.r../..rr/.B../..rr/.r../r...",
+        BLACK,
+        {1: 3, 2: 22, 3: 75, 4: 334, 5: 847, 6: 4147},
+    ),
+}
+
+
+def perft(game_state, board, color, depth):
+    """
+    Count the positions reached after exactly `depth` moves.
+
+    A position in which the side to move has no moves ends its line and
+    counts nothing (unless depth is 0).
+
+    Args:
+      game_state: GameState used for move generation
+      board: Board or BitBoard to count from
+      color: Color to move
+      depth: Number of moves (plies) to look ahead
+
+    Returns:
+      int: Number of leaf positions
+    """
+    if depth == 0:
+        return 1
+    next_color = RED if color == BLACK else BLACK
+    nodes = 0
+    for move in game_state.get_legal_actions(color, board):
+        successor = game_state.generate_successor(board, move)
+        nodes += perft(game_state, successor, next_color, depth - 1)
+    return nodes
+
+
+def divide(game_state, board, color, depth):
+    """
+    Perft split by root move.
+
+    Returns:
+      list[tuple]: (move, leaf count below it) for every root move, in
+                   generation order
+    """
+    next_color = RED if color == BLACK else BLACK
+    return [
+        (move, perft(game_state, game_state.generate_successor(board, move), next_color, depth - 1))
+        for move in game_state.get_legal_actions(color, board)
+    ]
+
+
+def load_position(name, use_board=False):
+    """
+    Return (board, color) of a stored position.
+
+    Args:
+      name: Key of POSITIONS
+      use_board: Return a list-of-lists Board instead of a BitBoard
+    """
+    text, color, _ = POSITIONS[name]
+    board = BitBoard.from_string(text)
+    return (board.to_board() if use_board else board), color
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count move generation leaf nodes")
+    parser.add_argument("--depth", type=int, default=5, help="Plies to count (default: 5)")
+    parser.add_argument(
+        "--position",
+        choices=sorted(POSITIONS),
+        default="start",
+        help="Stored position to count from (default: start)",
+    )
+    parser.add_argument(
+        "--fen",
+        default=None,
+        help="Position string instead of a stored position (see BitBoard.to_string)",
+    )
+    parser.add_argument(
+        "--color", choices=["BLACK", "RED"], default="BLACK", help="Side to move with --fen"
+    )
+    parser.add_argument(
+        "--board",
+        choices=["bitboard", "board"],
+        default="bitboard",
+        help="Board implementation to generate moves on (default: bitboard)",
+    )
+    parser.add_argument("--divide", action="store_true", help="Print counts per root move")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Verify every stored count up to --depth and exit non-zero on a mismatch",
+    )
+    args = parser.parse_args()
+
+    game_state = GameState()
+    use_board = args.board == "board"
+
+    if args.check:
+        failures = 0
+        for name, (_, _, counts) in POSITIONS.items():
+            board, color = load_position(name, use_board)
+            for depth, expected in sorted(counts.items()):
+                if depth > args.depth:
+                    break
+                nodes = perft(game_state, board, color, depth)
+                status = "ok" if nodes == expected else f"FAIL (expected {expected})"
+                failures += nodes != expected
+                print(f"{name} depth {depth}: {nodes} {status}")
+        raise SystemExit(1 if failures else 0)
+
+    if args.fen is not None:
+        board = BitBoard.from_string(args.fen)
+        color = BLACK if args.color == "BLACK" else RED
+        if use_board:
+            board = board.to_board()
+    else:
+        board, color = load_position(args.position, use_board)
+
+    start_time = time.perf_counter()
+    if args.divide:
+        nodes = 0
+        for move, count in divide(game_state, board, color, args.depth):
+            print(f"{' -> '.join(map(str, move.squares()))}: {count}")
+            nodes += count
+    else:
+        nodes = perft(game_state, board, color, args.depth)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.3f}s")
+    print(f"Nodes/s: {nodes / elapsed if elapsed else 0:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,25 @@
 # piece.py
-import pygame
 from constants import *
 
+#a piece is only where it stands and what it is; pixel positions are worked
+#out by render.py when it is drawn
 class Piece:
+  __slots__ = ("row", "col", "color", "king")
+
   def __init__(self, row, col, color):
     self.row = row
     self.col = col
     self.color = color
     self.king = False
 
-    self.x = 0
-    self.y = 0
-    self.calc_pos()
-
-  def calc_pos(self):
-    self.x = SQUARE_WIDTH * self.col + SQUARE_WIDTH // 2
-    self.y = SQUARE_WIDTH * self.row + SQUARE_WIDTH // 2
-
   def make_king(self):
     self.king = True
 
+  #drawing needs pygame, which is only imported once something is drawn
   def draw(self, win):
-    radius = SQUARE_WIDTH//2.5
-    pygame.draw.circle(win, self.color, (self.x, self.y), radius)
-    pygame.draw.circle(win, self.color, (self.x, self.y), radius)
-    
-    if self.king:
-      win.blit(CROWN, (self.x - CROWN.get_width()//2, self.y - CROWN.get_height()//2))
+    from render import draw_piece
+    draw_piece(win, self)
 
   def move(self, row, col):
     self.row = row
     self.col = col
-    self.calc_pos()
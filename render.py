@@ -0,0 +1,64 @@
+"""
+Pygame Rendering
+
+Everything that draws the game lives here, so that the rules and search
+modules (board, piece, checker, agent, ...) import without pygame. This
+module is only imported once something is drawn, and the crown image is
+loaded the first time a king is drawn.
+"""
+
+import os
+
+import pygame
+
+from constants import ROWS, COLS, SQUARE_WIDTH, BEIGE, BROWN
+
+CROWN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "crown.bmp")
+CROWN_SIZE = (44, 25)
+
+_crown = None
+
+
+def get_crown():
+    """Return the scaled crown image, loading it on first use."""
+    global _crown
+    if _crown is None:
+        _crown = pygame.transform.scale(pygame.image.load(CROWN_PATH), CROWN_SIZE)
+    return _crown
+
+
+def draw_grid(win):
+    """Draw the empty checkerboard."""
+    win.fill(BROWN)
+    for r in range(ROWS):
+        for c in range(COLS):
+            if (c + r) % 2 == 0:
+                pygame.draw.rect(
+                    win, BEIGE, (r * SQUARE_WIDTH, c * SQUARE_WIDTH, SQUARE_WIDTH, SQUARE_WIDTH)
+                )
+
+
+def square_center(row, col):
+    """Pixel (x, y) of the center of a square."""
+    return SQUARE_WIDTH * col + SQUARE_WIDTH // 2, SQUARE_WIDTH * row + SQUARE_WIDTH // 2
+
+
+def draw_piece(win, piece):
+    """Draw one piece, with a crown if it is a king."""
+    x, y = square_center(piece.row, piece.col)
+    radius = SQUARE_WIDTH // 2.5
+    pygame.draw.circle(win, piece.color, (x, y), radius)
+
+    if piece.king:
+        crown = get_crown()
+        win.blit(crown, (x - crown.get_width() // 2, y - crown.get_height() // 2))
+
+
+def draw_board(win, board):
+    """Draw the grid and every piece of a Board."""
+    draw_grid(win)
+    for r in range(ROWS):
+        for c in range(COLS):
+            piece = board.get_piece(r, c)
+            if piece != 0:
+                draw_piece(win, piece)
@@ -0,0 +1,244 @@
+"""
+Lazy SMP Search
+
+Helper processes search the same root position as the agent, at staggered
+depths and with rotated root move orders, while the agent runs its normal
+search. Nothing is exchanged between them except a transposition table held
+in shared memory: helpers fill it with results and best moves that the main
+search then picks up for cutoffs and move ordering. Positions are sent to
+helpers as three integers, never as pickled boards.
+
+The table is lock-free. Each entry is three 64-bit words: a check word, the
+packed entry data and the score. The check word is the key XOR the other two
+words, so an entry torn by two processes writing at once fails verification
+on probe and is treated as a miss.
+"""
+
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Event, shared_memory
+
+from agent import SearchTimeout, MAX_SEARCH_DEPTH
+from bitboard import BitBoard
+
+ENTRY = struct.Struct("<QQd")
+_SCORE_BITS = struct.Struct("<Q")
+_SCORE = struct.Struct("<d")
+
+# Layout of the packed data word: bits 0-7 depth, 8-9 flag, 10-17 generation,
+# bit 63 set for every stored entry
+_FLAG_SHIFT = 8
+_GENERATION_SHIFT = 10
+_MOVE_SHIFT = 18  # bit 18: has move, bits 19-60: the packed move
+_MOVE_MASK = (1 << 42) - 1
+
+
+class SharedTranspositionTable:
+    """
+    Transposition table in a multiprocessing.shared_memory block.
+
+    Drop-in replacement for transposition.TranspositionTable: probe() returns
+    the same (key, depth, score, flag, best_move, generation) tuples and
+    store() uses the same replacement rule.
+
+    Attributes:
+      size: Number of slots (rounded up to a power of two)
+      name: Shared memory block name, for attaching from other processes
+      generation: Search counter bumped by new_search()
+      hits: Probes by this process that found an entry for the key
+      probes: Total probes by this process
+    """
+
+    def __init__(self, size=1 << 18, name=None):
+        """
+        Create a table, or attach to an existing one.
+
+        Args:
+          size: Number of entries to hold (default: 262144)
+          name: Name of an existing table to attach to; None creates a new one
+        """
+        self.size = 1 << max(0, (size - 1).bit_length())
+        self.mask = self.size - 1
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.size * ENTRY.size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self._buf = self._shm.buf
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def close(self):
+        """Detach from the block, and free it if this process created it."""
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def new_search(self):
+        """Mark existing entries as belonging to a previous search."""
+        self.generation = (self.generation + 1) & 0xFF
+        self.hits = 0
+        self.probes = 0
+
+    def clear(self):
+        """Drop every entry."""
+        self._buf[:] = bytes(len(self._buf))
+        self.generation = 0
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Returns:
+          tuple: (key, depth, score, flag, best_move, generation), or None
+        """
+        self.probes += 1
+        check, data, score = ENTRY.unpack_from(self._buf, (key & self.mask) * ENTRY.size)
+        if data == 0 or check ^ data ^ _SCORE_BITS.unpack(_SCORE.pack(score))[0] != key:
+            return None
+        self.hits += 1
+
+        best_move = None
+        if data >> _MOVE_SHIFT & 1:
+            best_move = data >> (_MOVE_SHIFT + 1) & _MOVE_MASK
+        return (
+            key,
+            data & 0xFF,
+            score,
+            data >> _FLAG_SHIFT & 3,
+            best_move,
+            data >> _GENERATION_SHIFT & 0xFF,
+        )
+
+    def store(self, key, depth, score, flag, best_move):
+        """Record the result of searching the position `key` to `depth`."""
+        offset = (key & self.mask) * ENTRY.size
+        _, old_data, _ = ENTRY.unpack_from(self._buf, offset)
+        if (
+            old_data != 0
+            and old_data >> _GENERATION_SHIFT & 0xFF == self.generation
+            and old_data & 0xFF > depth
+        ):
+            return
+
+        data = min(depth, 0xFF) | flag << _FLAG_SHIFT | self.generation << _GENERATION_SHIFT
+        if best_move is not None:
+            data |= 1 << _MOVE_SHIFT | best_move << (_MOVE_SHIFT + 1)
+        data |= 1 << 63
+        check = key ^ data ^ _SCORE_BITS.unpack(_SCORE.pack(score))[0]
+        ENTRY.pack_into(self._buf, offset, check, data, score)
+
+
+# Per-process state of a helper, set by _init_helper
+_helper = None
+
+
+def _init_helper(agent_class, agent_kwargs, table_name, table_size, stop_event):
+    global _helper
+    _helper = agent_class(**agent_kwargs)
+    _helper.tt = SharedTranspositionTable(table_size, name=table_name)
+    _helper.stop_event = stop_event
+
+
+def _helper_search(position, color, generation, helper_index, max_depth):
+    """
+    Deepen iteratively on the root position until stopped or `max_depth`.
+
+    Helpers start at depth 1 or 2 (alternating by index) and search the root
+    moves rotated by their index, so they spread over different parts of the
+    tree instead of repeating the main search.
+
+    Returns:
+      int: Nodes explored
+    """
+    agent = _helper
+    agent.color = color
+    agent.nodes_explored = agent.pruning_count = 0
+    agent.tt.generation = generation
+    agent.orderer.new_search()
+
+    board = BitBoard(*position)
+    moves = agent.game_state.get_packed_actions(color, board, [])
+    if moves:
+        shift = helper_index % len(moves)
+        moves = moves[shift:] + moves[:shift]
+        try:
+            for depth in range(1 + helper_index % 2, max_depth + 1):
+                agent.search_root(board, moves, depth)
+        except SearchTimeout:
+            pass
+    return agent.nodes_explored
+
+
+class LazySMP:
+    """
+    Helper processes sharing one transposition table with an agent.
+
+    Creating it replaces the agent's table with a SharedTranspositionTable of
+    the same size. start() launches one search per helper on the position
+    the agent is about to search; stop() ends them once the agent is done.
+
+    Attributes:
+      agent: Agent running the main search
+      helpers: Number of helper processes
+      stop_event: Set to make the helpers abandon their searches
+    """
+
+    def __init__(self, agent, helpers):
+        self.agent = agent
+        self.helpers = helpers
+        self.stop_event = Event()
+        agent.tt = SharedTranspositionTable(agent.tt.size)
+        self._executor = None
+        self._futures = []
+
+    def _pool(self):
+        if self._executor is None:
+            agent = self.agent
+            kwargs = {
+                "color": agent.color,
+                "search_type": agent.search_type,
+                "tablebase": agent.tablebase and agent.tablebase.directory,
+                "quiescence": agent.quiescence_depth,
+            }
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.helpers,
+                initializer=_init_helper,
+                initargs=(type(agent), kwargs, agent.tt.name, agent.tt.size, self.stop_event),
+            )
+        return self._executor
+
+    def start(self, board):
+        """Start every helper on the root BitBoard `board`."""
+        agent = self.agent
+        max_depth = MAX_SEARCH_DEPTH if agent.movetime is not None else agent.depth
+        position = (board.black, board.red, board.kings)
+        self.stop_event.clear()
+        self._futures = [
+            self._pool().submit(
+                _helper_search, position, agent.color, agent.tt.generation, i, max_depth
+            )
+            for i in range(self.helpers)
+        ]
+
+    def stop(self):
+        """
+        Stop the helpers and wait for them.
+
+        Returns:
+          int: Nodes explored by all helpers
+        """
+        self.stop_event.set()
+        nodes = sum(future.result() for future in self._futures)
+        self._futures = []
+        return nodes
+
+    def close(self):
+        """Shut the helpers down and free the shared table."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.agent.tt.close()
@@ -0,0 +1,582 @@
+"""
+Endgame Tablebases
+
+Exact results for every position with few pieces, computed by retrograde
+analysis and probed from memory-mapped files during search.
+
+Positions are grouped by material signature (black men, black kings, red
+men, red kings). A signature's positions can only move into positions of the
+same signature or, by a capture or promotion, into smaller signatures. So
+signatures are generated smallest first, and independent signatures are
+generated in parallel processes.
+
+Within a signature every position (with either side to move) is numbered
+by a combinatorial index. Generation works on these numbers:
+
+1. Every position's moves are generated once. Moves into other signatures
+   are looked up in their finished tables; moves within the signature
+   become graph edges, which are also stored reversed (predecessor lists
+   in compressed sparse row form).
+2. Results are fixed in order of distance, starting from positions without
+   moves (lost) and positions with a move into a lost position of another
+   signature (won). A fixed loss makes all its predecessors wins; a fixed
+   win decrements its predecessors' counters of moves not yet known to
+   lose, and a counter reaching zero makes that predecessor a loss.
+3. Whatever is left can avoid losing forever and is a draw.
+
+Each position is stored as one byte: its result for the side to move and
+the distance to the end of the game in plies. Distances let the agent make
+progress in won positions instead of shuffling between winning moves.
+
+Results follow the rules in force when the table was generated; the file
+header records checker.RULES_VERSION and files of another version are ignored.
+
+Usage:
+  python tablebase.py --pieces 4 --kings-only
+  python tablebase.py --pieces 5 --workers 8 --directory tablebases
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from math import comb
+
+from bitboard import BitBoard, FULL, MOVE_CAPTURE_SHIFT, MOVE_TO_SHIFT, PROMOTION_ROW, SQUARE_MASK
+from checker import NodeStatus, RULES_VERSION
+from constants import BLACK, RED
+
+MAGIC = b"CKTB"
+# magic, rules version, signature (4 counts), positions per side to move
+HEADER = struct.Struct("<4sHBBBBI")
+DEFAULT_DIRECTORY = "tablebases"
+
+# Value bytes: 0 marks an index that is not a position (two men on one square)
+INVALID = 0
+DRAW_VALUE = 1
+# Larger distances are stored as this one
+MAX_DISTANCE = 126
+
+# Men never stand on their own promotion row, so each color's men have 28 squares
+MAN_SQUARES = 28
+RED_MAN_OFFSET = 4
+
+BINOMIAL = [[comb(n, k) for k in range(33)] for n in range(33)]
+
+
+def encode(status, distance):
+    """Value byte of a NodeStatus result `distance` plies from the end."""
+    if status == NodeStatus.DRAW:
+        return DRAW_VALUE
+    return 2 + 2 * min(distance, MAX_DISTANCE) + (status == NodeStatus.LOSE)
+
+
+def decode(value):
+    """(NodeStatus, distance) of a value byte, or None for INVALID."""
+    if value == INVALID:
+        return None
+    if value == DRAW_VALUE:
+        return NodeStatus.DRAW, 0
+    distance, lost = divmod(value - 2, 2)
+    return (NodeStatus.LOSE if lost else NodeStatus.WIN), distance
+
+
+def signature(black, red, kings):
+    """(black men, black kings, red men, red kings) of a position."""
+    return (
+        (black & ~kings).bit_count(),
+        (black & kings).bit_count(),
+        (red & ~kings).bit_count(),
+        (red & kings).bit_count(),
+    )
+
+
+def is_rule_draw(sig):
+    # both sides have only kings, as many as each other: drawn by rule
+    bm, bk, rm, rk = sig
+    return bm == 0 and rm == 0 and bk == rk
+
+
+def signature_size(sig):
+    """Number of indices of a signature, per side to move."""
+    bm, bk, rm, rk = sig
+    free = 32 - bm - rm
+    return (
+        BINOMIAL[MAN_SQUARES][bm]
+        * BINOMIAL[MAN_SQUARES][rm]
+        * BINOMIAL[free][bk]
+        * BINOMIAL[free - bk][rk]
+    )
+
+
+def _rank(bits, offset=0, occupied=0):
+    # combinatorial rank of the squares in `bits`, each square numbered by
+    # its position among the squares not in `occupied`, minus `offset`
+    rank = 0
+    i = 1
+    while bits:
+        low = bits & -bits
+        s = low.bit_length() - 1
+        rank += BINOMIAL[s - offset - (occupied & (low - 1)).bit_count()][i]
+        i += 1
+        bits ^= low
+    return rank
+
+
+def _unrank(rank, k, n):
+    # sorted k positions out of n with the given combinatorial rank
+    positions = [0] * k
+    p = n - 1
+    for i in range(k, 0, -1):
+        while BINOMIAL[p][i] > rank:
+            p -= 1
+        positions[i - 1] = p
+        rank -= BINOMIAL[p][i]
+        p -= 1
+    return positions
+
+
+def _squares(positions, offset=0, occupied=0):
+    # inverse of _rank's numbering: mask of the squares at `positions`
+    bits = 0
+    if not positions:
+        return bits
+    j = 0
+    free = -1
+    for s in range(offset, 32):
+        if occupied >> s & 1:
+            continue
+        free += 1
+        if free == positions[j]:
+            bits |= 1 << s
+            j += 1
+            if j == len(positions):
+                break
+    return bits
+
+
+def index_of(sig, black, red, kings):
+    """Index of a position within its signature `sig`."""
+    bm, bk, rm, rk = sig
+    free = 32 - bm - rm
+    black_men = black & ~kings
+    red_men = red & ~kings
+    men = black_men | red_men
+    black_kings = black & kings
+
+    index = _rank(black_men)
+    index = index * BINOMIAL[MAN_SQUARES][rm] + _rank(red_men, RED_MAN_OFFSET)
+    index = index * BINOMIAL[free][bk] + _rank(black_kings, 0, men)
+    index = index * BINOMIAL[free - bk][rk] + _rank(red & kings, 0, men | black_kings)
+    return index
+
+
+def position_of(sig, index):
+    """(black, red, kings) masks of an index, or None if it is not a position."""
+    bm, bk, rm, rk = sig
+    free = 32 - bm - rm
+    index, rk_rank = divmod(index, BINOMIAL[free - bk][rk])
+    index, bk_rank = divmod(index, BINOMIAL[free][bk])
+    bm_rank, rm_rank = divmod(index, BINOMIAL[MAN_SQUARES][rm])
+
+    black_men = _squares(_unrank(bm_rank, bm, MAN_SQUARES))
+    red_men = _squares(_unrank(rm_rank, rm, MAN_SQUARES), RED_MAN_OFFSET)
+    if black_men & red_men:
+        return None
+    men = black_men | red_men
+    black_kings = _squares(_unrank(bk_rank, bk, free), 0, men)
+    red_kings = _squares(_unrank(rk_rank, rk, free - bk), 0, men | black_kings)
+    return black_men | black_kings, red_men | red_kings, black_kings | red_kings
+
+
+def play(black, red, kings, move):
+    """
+    Masks after the packed move `move`.
+
+    The same move rules as BitBoard.apply, without the hash and evaluation
+    bookkeeping that generation does not need.
+    """
+    start_bit = 1 << (move & SQUARE_MASK)
+    end_bit = 1 << (move >> MOVE_TO_SHIFT & SQUARE_MASK)
+    keep = ~(move >> MOVE_CAPTURE_SHIFT) & FULL
+    black &= keep
+    red &= keep
+    kings &= keep
+    if black & start_bit:
+        black = black & ~start_bit | end_bit
+        promotion = PROMOTION_ROW[BLACK]
+    else:
+        red = red & ~start_bit | end_bit
+        promotion = PROMOTION_ROW[RED]
+    if kings & start_bit:
+        kings = kings & ~start_bit | end_bit
+    elif end_bit & promotion:
+        kings |= end_bit
+    return black, red, kings
+
+
+def signatures(max_pieces, kings_only=False):
+    """
+    Signatures to generate for positions of up to `max_pieces` pieces.
+
+    Signatures where a side has no pieces, or that are drawn by rule, need
+    no table. The result is ordered so that every signature comes after
+    the ones it depends on.
+    """
+    result = []
+    for bm in range(1 if kings_only else max_pieces + 1):
+        for rm in range(1 if kings_only else max_pieces + 1 - bm):
+            for bk in range(max_pieces + 1 - bm - rm):
+                for rk in range(max_pieces + 1 - bm - rm - bk):
+                    sig = (bm, bk, rm, rk)
+                    if bm + bk and rm + rk and not is_rule_draw(sig):
+                        result.append(sig)
+    return sorted(result, key=lambda sig: (sum(sig), sig[0] + sig[2], sig))
+
+
+def dependencies(sig):
+    """Signatures a capture or promotion in `sig` can lead to that need a table."""
+    bm, bk, rm, rk = sig
+    found = set()
+    # (mover's men, mover's kings, opponent's men, opponent's kings) changes;
+    # a capture chain may take any number of pieces
+    changes = [(-1, 1, 0, 0)]  # promotion
+    for promote in ((0, 0), (-1, 1)):
+        for men in range(max(bm, rm) + 1):
+            for kings in range(max(bk, rk) + 1):
+                if men or kings:
+                    changes.append(promote + (-men, -kings))
+    for dm, dk, om, ok in changes:
+        for new in ((bm + dm, bk + dk, rm + om, rk + ok), (bm + om, bk + ok, rm + dm, rk + dk)):
+            if min(new) >= 0 and new[0] + new[1] and new[2] + new[3] and not is_rule_draw(new):
+                found.add(new)
+    return found
+
+
+def table_path(directory, sig):
+    return os.path.join(directory, "tb_{}{}{}{}.bin".format(*sig))
+
+
+class Tablebase:
+    """
+    Read access to the tables in a directory.
+
+    Tables are opened and memory-mapped on first use. Missing tables, and
+    tables generated under other rules, are treated as not covering their
+    positions.
+
+    Attributes:
+      directory: Directory holding the tb_*.bin files
+      max_pieces: Largest piece count with a table on disk (probes of
+                  positions with more pieces return None immediately)
+      hits: Number of probes answered
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        self._tables = {}
+        self.hits = 0
+        self.max_pieces = 0
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.startswith("tb_") and name.endswith(".bin") and name[3:-4].isdigit():
+                    self.max_pieces = max(self.max_pieces, sum(map(int, name[3:-4])))
+
+    def _table(self, sig):
+        if sig in self._tables:
+            return self._tables[sig]
+        table = None
+        path = table_path(self.directory, sig)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, *file_sig, size = HEADER.unpack_from(data)
+            if magic == MAGIC and version == RULES_VERSION and tuple(file_sig) == sig:
+                table = (data, size)
+            else:
+                data.close()
+        self._tables[sig] = table
+        return table
+
+    def probe(self, black, red, kings, color):
+        """
+        Exact result of a position.
+
+        Args:
+          black, red, kings: Position masks
+          color: Color to move
+
+        Returns:
+          tuple: (NodeStatus, plies to the end of the game) for `color`, or
+                 None if no table covers the position
+        """
+        own, opp = (black, red) if color == BLACK else (red, black)
+        # the same checks, in the same order, as GameState.get_node_status
+        if not opp:
+            return NodeStatus.WIN, 0
+        if not own:
+            return NodeStatus.LOSE, 0
+        if (black | red).bit_count() > self.max_pieces:
+            return None
+        sig = signature(black, red, kings)
+        if is_rule_draw(sig):
+            # a side without moves loses before the equal-kings draw applies
+            board = BitBoard.__new__(BitBoard)
+            board.black, board.red, board.kings = black, red, kings
+            if not board.count_moves(color):
+                return NodeStatus.LOSE, 0
+            return NodeStatus.DRAW, 0
+        table = self._table(sig)
+        if table is None:
+            return None
+        data, size = table
+        offset = HEADER.size + (0 if color == BLACK else size) + index_of(sig, black, red, kings)
+        self.hits += 1
+        return decode(data[offset])
+
+    def probe_board(self, board, color):
+        """probe() for a BitBoard."""
+        return self.probe(board.black, board.red, board.kings, color)
+
+    def close(self):
+        for table in self._tables.values():
+            if table is not None:
+                table[0].close()
+        self._tables = {}
+
+
+def generate_signature(sig, directory=DEFAULT_DIRECTORY):
+    """
+    Compute and write the table of one signature.
+
+    The tables of its dependencies must already be in `directory`.
+
+    Returns:
+      dict: signature, positions (valid, both sides to move), wins, losses,
+            draws and seconds
+    """
+    start_time = time.perf_counter()
+    size = signature_size(sig)
+    total = 2 * size
+    lookup = Tablebase(directory)
+    lookup.max_pieces = sum(sig)
+
+    values = bytearray(total)
+    counters = array("i", bytes(4 * total))
+    longest_loss = array("i", bytes(4 * total))
+    edge_from, edge_to = array("i"), array("i")
+    # buckets[d]: (node, NodeStatus) candidates d plies from the end
+    buckets = [[]]
+
+    def push(node, status, distance):
+        while len(buckets) <= distance:
+            buckets.append([])
+        buckets[distance].append((node, status))
+
+    # 1. Generate every position's moves once
+    board = BitBoard.__new__(BitBoard)
+    for side, color in enumerate((BLACK, RED)):
+        opponent = RED if color == BLACK else BLACK
+        for index in range(size):
+            position = position_of(sig, index)
+            if position is None:
+                continue
+            node = side * size + index
+            values[node] = DRAW_VALUE
+            board.black, board.red, board.kings = position
+            moves = board.packed_moves(color, [])
+            if not moves:
+                push(node, NodeStatus.LOSE, 0)
+                continue
+
+            unresolved = 0
+            fastest_win = None
+            for move in moves:
+                successor = play(*position, move)
+                successor_sig = signature(*successor)
+                if successor_sig == sig:
+                    edge_from.append(node)
+                    edge_to.append((1 - side) * size + index_of(sig, *successor))
+                    unresolved += 1
+                    continue
+                result = lookup.probe(*successor, opponent)
+                if result is None:
+                    raise FileNotFoundError(f"Missing table for signature {successor_sig}")
+                status, distance = result
+                if status == NodeStatus.LOSE:
+                    if fastest_win is None or distance + 1 < fastest_win:
+                        fastest_win = distance + 1
+                elif status == NodeStatus.WIN:
+                    longest_loss[node] = max(longest_loss[node], distance + 1)
+                else:
+                    unresolved += 1  # a drawing move: never all moves lose
+
+            if fastest_win is not None:
+                push(node, NodeStatus.WIN, fastest_win)
+                unresolved += 1  # never a loss
+            elif unresolved == 0:
+                push(node, NodeStatus.LOSE, longest_loss[node])
+            counters[node] = unresolved
+    lookup.close()
+
+    # Reverse the edges: predecessors of node n are preds[first[n]:first[n + 1]]
+    first = array("i", bytes(4 * (total + 1)))
+    for target in edge_to:
+        first[target + 1] += 1
+    for n in range(total):
+        first[n + 1] += first[n]
+    fill = array("i", first)
+    preds = array("i", bytes(4 * len(edge_to)))
+    for source, target in zip(edge_from, edge_to):
+        preds[fill[target]] = source
+        fill[target] += 1
+    del edge_from, edge_to, fill
+
+    # 2. Fix results in order of distance
+    final = bytearray(total)
+    wins = losses = 0
+    distance = 0
+    while distance < len(buckets):
+        for node, status in buckets[distance]:
+            if final[node]:
+                continue
+            final[node] = 1
+            values[node] = encode(status, distance)
+            if status == NodeStatus.WIN:
+                wins += 1
+            else:
+                losses += 1
+            for pred in preds[first[node] : first[node + 1]]:
+                if final[pred]:
+                    continue
+                if status == NodeStatus.LOSE:
+                    push(pred, NodeStatus.WIN, distance + 1)
+                else:
+                    counters[pred] -= 1
+                    if longest_loss[pred] < distance + 1:
+                        longest_loss[pred] = distance + 1
+                    if counters[pred] == 0:
+                        push(pred, NodeStatus.LOSE, longest_loss[pred])
+        buckets[distance] = None
+        distance += 1
+
+    # 3. Everything else stays DRAW_VALUE; write the table atomically
+    os.makedirs(directory, exist_ok=True)
+    path = table_path(directory, sig)
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, RULES_VERSION, *sig, size))
+        f.write(values)
+    os.replace(path + ".tmp", path)
+
+    positions = total - values.count(INVALID)
+    return {
+        "signature": sig,
+        "positions": positions,
+        "wins": wins,
+        "losses": losses,
+        "draws": positions - wins - losses,
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def _is_current(directory, sig):
+    path = table_path(directory, sig)
+    if not os.path.exists(path):
+        return False
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return False
+    magic, version, *file_sig, _ = HEADER.unpack(header)
+    return magic == MAGIC and version == RULES_VERSION and tuple(file_sig) == sig
+
+
+def generate(
+    max_pieces, directory=DEFAULT_DIRECTORY, kings_only=False, workers=None, overwrite=False, progress=None
+):
+    """
+    Generate every table for positions of up to `max_pieces` pieces.
+
+    Signatures are handed to a process pool as soon as the signatures they
+    depend on are written. Tables already on disk for the current rules are
+    kept unless `overwrite` is set.
+
+    Args:
+      max_pieces: Largest total number of pieces
+      directory: Output directory
+      kings_only: Only positions without men
+      workers: Processes (default: one per CPU); 1 generates in this process
+      overwrite: Regenerate tables that already exist
+      progress: Called with generate_signature's summary of every table written
+
+    Returns:
+      list[dict]: generate_signature summaries, in completion order
+    """
+    sigs = signatures(max_pieces, kings_only)
+    done = {sig for sig in sigs if not overwrite and _is_current(directory, sig)}
+    waiting = {sig: dependencies(sig) for sig in sigs if sig not in done}
+    summaries = []
+
+    def finished(summary):
+        done.add(summary["signature"])
+        summaries.append(summary)
+        if progress is not None:
+            progress(summary)
+
+    if workers == 1:
+        for sig in sigs:
+            if sig in waiting:
+                finished(generate_signature(sig, directory))
+        return summaries
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while waiting or running:
+            ready = [sig for sig, deps in waiting.items() if deps <= done]
+            for sig in ready:
+                del waiting[sig]
+                running.add(pool.submit(generate_signature, sig, directory))
+            completed, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finished(future.result())
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases")
+    parser.add_argument(
+        "--pieces", type=int, default=4, help="Largest number of pieces on the board (default: 4)"
+    )
+    parser.add_argument(
+        "--directory",
+        default=DEFAULT_DIRECTORY,
+        help=f"Directory to write tables to (default: {DEFAULT_DIRECTORY})",
+    )
+    parser.add_argument("--kings-only", action="store_true", help="Only positions without men")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Processes to use (default: one per CPU)"
+    )
+    parser.add_argument("--overwrite", action="store_true", help="Regenerate existing tables")
+    args = parser.parse_args()
+
+    def progress(summary):
+        print(
+            "{signature}: {positions} positions, {wins} wins, {losses} losses, "
+            "{draws} draws ({seconds:.1f}s)".format(**summary)
+        )
+
+    start_time = time.perf_counter()
+    summaries = generate(
+        args.pieces, args.directory, args.kings_only, args.workers, args.overwrite, progress
+    )
+    print(
+        f"{len(summaries)} tables, {sum(s['positions'] for s in summaries)} positions "
+        f"in {time.perf_counter() - start_time:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
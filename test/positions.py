@@ -0,0 +1,40 @@
+"""Random positions reached from the start by random legal moves, for tests."""
+
+import random
+
+from bitboard import BitBoard
+from checker import GameState
+from constants import BLACK, RED
+
+
+def random_walk(rng, plies):
+    """
+    Walk up to `plies` random moves from the initial position.
+
+    Args:
+      rng: random.Random drawing the moves, or an int seed for one
+      plies: Most moves to play; the walk stops early if the side to move has none
+
+    Yields:
+      tuple: (BitBoard, color to move) for the initial position and after every move
+    """
+    if not isinstance(rng, random.Random):
+        rng = random.Random(rng)
+    state = GameState()
+    board = BitBoard()
+    color = BLACK
+    yield board, color
+    for _ in range(plies):
+        moves = state.get_legal_actions(color, board)
+        if not moves:
+            return
+        board = state.generate_successor(board, rng.choice(moves))
+        color = RED if color == BLACK else BLACK
+        yield board, color
+
+
+def random_position(rng, plies):
+    """The last (BitBoard, color to move) of random_walk(rng, plies)."""
+    for board, color in random_walk(rng, plies):
+        pass
+    return board, color
@@ -0,0 +1,198 @@
+import math
+import random
+import time
+
+import pytest
+
+from agent import Agent
+from board import Board
+from bitboard import BitBoard
+from checker import GameState, Move, NodeStatus
+from constants import BLACK, RED
+from positions import random_position, random_walk
+
+
+def test_get_best_move_returns_legal_move():
+    board = Board()
+    agent = Agent(BLACK, depth=3)
+    move, score = agent.get_best_move(board)
+
+    legal = GameState().get_legal_actions(BLACK, board)
+    assert move in legal
+    assert agent.get_statistics()["nodes_explored"] > 0
+    assert agent.get_statistics()["depth_reached"] == 3
+
+
+def test_get_best_move_leaves_board_untouched():
+    bb = BitBoard()
+    Agent(RED, depth=3).get_best_move(bb)
+    assert bb == BitBoard()
+    assert bb.undo_stack == []
+
+
+def test_iterative_deepening_respects_movetime():
+    agent = Agent(BLACK, movetime=0.2)
+    start = time.perf_counter()
+    move, _ = agent.get_best_move(Board())
+    elapsed = time.perf_counter() - start
+
+    assert move in GameState().get_legal_actions(BLACK, Board())
+    assert agent.get_statistics()["depth_reached"] >= 2
+    assert elapsed < 1.0
+
+
+def test_iterative_deepening_matches_fixed_depth():
+    deepening = Agent(BLACK, movetime=0.3)
+    _, score = deepening.get_best_move(Board())
+    depth = deepening.get_statistics()["depth_reached"]
+
+    # the last completed iteration scores the position like a fixed-depth search
+    assert Agent(BLACK, depth=depth).get_best_move(Board())[1] == score
+
+
+def test_evaluate_known_position():
+    b = Board()
+    for r in range(8):
+        for c in range(8):
+            b.set_piece(r, c, 0)
+    from piece import Piece
+
+    king = Piece(4, 3, BLACK)
+    king.make_king()
+    b.set_piece(4, 3, king)
+    b.set_piece(6, 1, Piece(6, 1, RED))
+
+    # material 3, red advance -0.5, king 5, mobility (4 - 2) * 0.5, center 2, king advance 1.2
+    assert Agent(BLACK).evaluate(b) == 11.7
+    assert Agent(BLACK).evaluate(BitBoard.from_board(b)) == 11.7
+
+
+def test_profiling_does_not_change_search():
+    plain = Agent(BLACK, depth=5)
+    profiled = Agent(BLACK, depth=5, profile=True)
+    assert profiled.get_best_move(BitBoard()) == plain.get_best_move(BitBoard())
+    assert profiled.nodes_explored == plain.nodes_explored
+    assert "profile" not in plain.get_statistics()
+
+    profile = profiled.get_statistics()["profile"]
+    assert sum(profile["nodes_by_ply"]) == profiled.nodes_explored + 1
+    assert len(profile["nodes_by_ply"]) == 6
+    assert sum(profile["share"].values()) == pytest.approx(1.0)
+    assert profile["calls"]["eval"] == profile["nodes_by_ply"][5]
+
+
+def test_pruned_expectimax_matches_full_average():
+    state = GameState()
+
+    def full(agent, board, depth, maximizing):
+        color = agent.color if maximizing else (RED if agent.color == BLACK else BLACK)
+        if depth == 0:
+            return agent.evaluate(board)
+        status, moves = state.get_node_status(color, board)
+        if status != NodeStatus.ONGOING:
+            return agent._terminal_score(status, color)
+        values = [
+            full(agent, state.generate_successor(board, m), depth - 1, not maximizing)
+            for m in moves
+        ]
+        return max(values) if maximizing else sum(values) / len(values)
+
+    rng = random.Random(5)
+    for _ in range(6):
+        board, color = random_position(rng, rng.randrange(30))
+
+        for star2 in (False, True):
+            agent = Agent(color, depth=4, search_type="expectimax", star2=star2)
+            move, score = agent.get_best_move(board)
+            if move is None:
+                continue
+            expected = [
+                full(agent, state.generate_successor(board, m), 3, False)
+                for m in state.get_legal_actions(color, board)
+            ]
+            assert score == max(expected)
+            assert expected.index(score) == state.get_legal_actions(color, board).index(move)
+
+
+def _capture_search(agent, state, board, maximizing, depth):
+    # Quiescence reference: plain minimax over the capture moves
+    color = agent.color if maximizing else (RED if agent.color == BLACK else BLACK)
+    if depth == 0 or not board.jumpers(color):
+        return agent.evaluate(board)
+    status, moves = state.get_node_status(color, board)
+    if status != NodeStatus.ONGOING:
+        return agent._terminal_score(status, color)
+    scores = [
+        _capture_search(agent, state, state.generate_successor(board, m), not maximizing, depth - 1)
+        for m in moves
+    ]
+    return max(scores) if maximizing else min(scores)
+
+
+def test_quiescence_matches_capture_minimax():
+    state = GameState()
+    rng = random.Random(5)
+    agent = Agent(BLACK, quiescence=6)
+    checked = 0
+    for _ in range(6):
+        for board, color in random_walk(rng, 39):
+            maximizing = color == BLACK
+            expected = _capture_search(agent, state, board, maximizing, 6)
+            assert agent.quiescence(board, -math.inf, math.inf, maximizing, 6, 1) == expected
+            checked += bool(board.jumpers(color))
+    assert checked > 0
+
+
+def test_quiescence_searches_past_the_horizon():
+    # BLACK to move: the step the evaluation likes best, (3, 4) -> (4, 3),
+    # lets RED capture; a depth-1 search only sees that with quiescence
+    board = BitBoard.from_string("..../..../..../b.b./..../..r./.r../....")
+    state = GameState()
+    for quiescence, safe in ((0, False), (2, True)):
+        move, _ = Agent(BLACK, depth=1, quiescence=quiescence).get_best_move(board)
+        after = state.generate_successor(board, move)
+        assert (not after.jumpers(RED)) == safe
+
+    with pytest.raises(ValueError):
+        Agent(BLACK, quiescence=-1)
+
+
+def test_pvs_matches_minimax():
+    state = GameState()
+    rng = random.Random(17)
+    for _ in range(8):
+        board, color = random_position(rng, rng.randint(4, 30))
+
+        for depth in (2, 3, 4, 5):
+            expected = Agent(color, depth=depth).get_best_move(board)
+            assert Agent(color, depth=depth, search_type="pvs").get_best_move(board) == expected
+
+        # aspiration windows with re-searches give the same result at every depth
+        agent = Agent(color, search_type="pvs")
+        moves = state.get_packed_actions(color, board, [])
+        if moves:
+            for depth in (3, 4, 5):
+                guess = agent.search_root(board.copy(), moves, depth - 2)[1]
+                move, score = agent.aspiration_search(board.copy(), moves, depth, None, guess)
+                expected = Agent(color, depth=depth).get_best_move(board)
+                assert (Move.from_packed(move), score) == expected
+
+
+def test_mtdf_matches_minimax():
+    state = GameState()
+    rng = random.Random(23)
+    for _ in range(8):
+        board, color = random_position(rng, rng.randint(4, 30))
+
+        for depth in (2, 3, 4, 5):
+            expected = Agent(color, depth=depth).get_best_move(board)
+            assert Agent(color, depth=depth, search_type="mtdf").get_best_move(board) == expected
+
+        # the result does not depend on the first guess, however far off
+        moves = state.get_packed_actions(color, board, [])
+        if moves:
+            expected = Agent(color, depth=4).get_best_move(board)
+            for guess in (-1000, -3.7, 0, 25, 1000):
+                agent = Agent(color, search_type="mtdf")
+                move, score = agent.mtdf(board.copy(), moves, 4, None, guess)
+                assert (Move.from_packed(move), score) == expected
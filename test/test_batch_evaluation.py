@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from agent import Agent
+from constants import BLACK, RED
+from positions import random_position
+
+np = pytest.importorskip("numpy")
+
+from batch_evaluation import encode, evaluate_batch, mobility  # noqa: E402
+
+
+def random_positions(count, seed=0):
+    rng = random.Random(seed)
+    return [random_position(rng, rng.randrange(60))[0] for _ in range(count)]
+
+
+def test_batch_matches_evaluate():
+    boards = random_positions(300)
+    encodings = encode(
+        [b.black for b in boards], [b.red for b in boards], [b.kings for b in boards]
+    )
+    assert encodings.shape == (300, 32) and encodings.dtype == np.int8
+    for color in (BLACK, RED):
+        agent = Agent(color)
+        assert mobility(encodings, color).tolist() == [b.count_moves(color) for b in boards]
+        assert evaluate_batch(encodings, color).tolist() == [agent.evaluate(b) for b in boards]
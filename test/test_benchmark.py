@@ -0,0 +1,15 @@
+from benchmark import compare, run_benchmark
+
+
+def test_run_and_compare():
+    results = run_benchmark(["endgame"], searches=(("minimax", 3),))
+    assert len(results) == 1
+    assert results[0]["nodes"] > 0 and results[0]["move"] is not None
+
+    slower = dict(results[0], seconds=results[0]["seconds"] * 2 + 1)
+    bigger = dict(results[0], nodes=results[0]["nodes"] * 2, move=None)
+    assert compare(results, results) == ([], [])
+    regressions, changes = compare([slower], results)
+    assert len(regressions) == 1 and "time" in regressions[0] and changes == []
+    regressions, changes = compare([bigger], results)
+    assert len(regressions) == 1 and "nodes" in regressions[0] and len(changes) == 1
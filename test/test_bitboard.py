@@ -0,0 +1,203 @@
+import random
+
+from bitboard import (
+    BitBoard,
+    JUMPED,
+    MOVE_CAPTURE_SHIFT,
+    SQUARE_COORDS,
+    SQUARE_INDEX,
+    unpack_move,
+)
+from board import Board
+from checker import GameState, Move
+from piece import Piece
+from constants import BLACK, RED
+
+
+def test_square_numbering_covers_dark_squares():
+    assert len(SQUARE_COORDS) == 32
+    for s, (r, c) in enumerate(SQUARE_COORDS):
+        assert (r + c) % 2 == 1
+        assert SQUARE_INDEX[(r, c)] == s
+
+
+def test_from_board_round_trip():
+    b = Board()
+    b.get_piece(2, 1).make_king()
+    bb = BitBoard.from_board(b)
+
+    assert bb.black.bit_count() == 12
+    assert bb.red.bit_count() == 12
+    assert bb.kings == 1 << SQUARE_INDEX[(2, 1)]
+    assert BitBoard.from_board(bb.to_board()) == bb
+    assert bb == BitBoard(kings=bb.kings)
+
+
+def test_initial_moves_match_board():
+    state = GameState()
+    b = Board()
+    bb = BitBoard.from_board(b)
+    for color in (BLACK, RED):
+        expected = sorted((m.start, m.end) for m in state.get_legal_actions(color, b))
+        actual = sorted((m.start, m.end) for m in state.get_legal_actions(color, bb))
+        assert actual == expected
+        assert bb.count_moves(color) == len(expected) == 7
+
+
+def test_king_moves_and_jumps_in_every_direction():
+    b = Board()
+    for r in range(8):
+        for c in range(8):
+            b.set_piece(r, c, 0)
+    king = Piece(4, 3, BLACK)
+    king.make_king()
+    b.set_piece(4, 3, king)
+
+    state = GameState()
+    moves = sorted((m.start, m.end) for m in state.get_legal_actions(BLACK, BitBoard.from_board(b)))
+    assert moves == [((4, 3), (3, 2)), ((4, 3), (3, 4)), ((4, 3), (5, 2)), ((4, 3), (5, 4))]
+
+    # with pieces to jump, capturing is mandatory
+    b.set_piece(3, 2, Piece(3, 2, RED))
+    b.set_piece(5, 4, Piece(5, 4, RED))
+    moves = sorted((m.start, m.end) for m in state.get_legal_actions(BLACK, BitBoard.from_board(b)))
+    assert moves == [((4, 3), (2, 1)), ((4, 3), (6, 5))]
+
+
+def test_capture_chains_are_single_moves():
+    state = GameState()
+    # the king can jump around the loop of four red men back to its square,
+    # or leave it to take the man on (1, 4) as well
+    bb = BitBoard.from_string("b.../..r./.r../..rr/.B../..rr/.r../r...")
+    moves = state.get_legal_actions(BLACK, bb)
+    assert moves == state.get_legal_actions(BLACK, bb.to_board())
+    assert [(m.start, m.end, len(m.captures())) for m in moves] == [
+        ((4, 3), (4, 3), 4),
+        ((4, 3), (0, 3), 4),
+        ((4, 3), (0, 3), 2),
+    ]
+    assert len({m.pack() for m in moves}) == 3
+
+    loop = state.generate_successor(bb, moves[0])
+    assert loop.to_string() == "b.../..r./.r../..../.B../..../.r../r..."
+    assert loop == BitBoard.from_board(state.generate_successor(bb.to_board(), moves[0]))
+
+
+def test_chain_stops_on_promotion():
+    state = GameState()
+    # the man is crowned on (7, 2) and may not jump (6, 1) on as a king
+    bb = BitBoard.from_string("..../..../..../.b../.r../..../rr../....")
+    moves = state.get_legal_actions(BLACK, bb)
+    assert [(m.start, m.end, m.path) for m in moves] == [((3, 2), (7, 2), ((5, 4),))]
+    assert moves == state.get_legal_actions(BLACK, bb.to_board())
+    crowned = state.generate_successor(bb, moves[0])
+    assert crowned.to_string() == "..../..../..../..../..../..../r.../.B.."
+
+
+def test_successor_capture_and_promotion():
+    b = Board()
+    b.set_piece(4, 3, 0)
+    b.set_piece(3, 2, Piece(3, 2, RED))
+    bb = BitBoard.from_board(b)
+    state = GameState()
+
+    succ = state.generate_successor(bb, Move(start=(2, 1), end=(4, 3)))
+    assert succ.red.bit_count() == 12
+    assert not succ.red >> SQUARE_INDEX[(3, 2)] & 1
+    assert succ.black >> SQUARE_INDEX[(4, 3)] & 1
+    # original position is untouched
+    assert bb == BitBoard.from_board(b)
+
+    empty = BitBoard(black=0, red=1 << SQUARE_INDEX[(1, 2)])
+    promoted = state.generate_successor(empty, Move(start=(1, 2), end=(0, 1)))
+    assert promoted.kings == 1 << SQUARE_INDEX[(0, 1)]
+
+
+def test_random_games_agree_with_board():
+    state = GameState()
+    rng = random.Random(7)
+    for _ in range(10):
+        b = Board()
+        color = BLACK
+        for _ in range(80):
+            bb = BitBoard.from_board(b)
+            expected = state.get_legal_actions(color, b)
+            actual = state.get_legal_actions(color, bb)
+            assert sorted((m.start, m.end) for m in actual) == sorted((m.start, m.end) for m in expected)
+            assert state.is_win(color, bb) == state.is_win(color, b)
+            assert bool(state.is_draw(color, bb)) == bool(state.is_draw(color, b))
+            if not expected:
+                break
+            move = rng.choice(expected)
+            b = state.generate_successor(b, move)
+            assert state.generate_successor(bb, move) == BitBoard.from_board(b)
+            color = RED if color == BLACK else BLACK
+
+
+def test_make_unmake_matches_generate_successor():
+    state = GameState()
+    rng = random.Random(11)
+    bb = BitBoard()
+    color = BLACK
+    played = []
+    for _ in range(60):
+        moves = state.get_legal_actions(color, bb)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        expected = state.generate_successor(bb, move)
+        played.append(bb.copy())
+        state.make_move(bb, move)
+        assert bb == expected
+        color = RED if color == BLACK else BLACK
+
+    while played:
+        state.unmake_move(bb)
+        assert bb == played.pop()
+    assert bb == BitBoard()
+
+
+def test_incremental_scores_match_full_recompute():
+    state = GameState()
+    rng = random.Random(3)
+    bb = BitBoard()
+    color = BLACK
+    for _ in range(100):
+        assert (bb.balance, bb.own_black, bb.own_red) == bb.compute_static()
+        moves = state.get_legal_actions(color, bb)
+        if not moves:
+            break
+        state.make_move(bb, rng.choice(moves))
+        color = RED if color == BLACK else BLACK
+
+
+def test_string_round_trip():
+    text = "..R./.b.r/rbR./b.r./..../r.b./rbbr/r.r."
+    bb = BitBoard.from_string(text)
+    assert bb.to_string() == text
+    assert bb.to_board().get_piece(0, 5).king
+    assert BitBoard.from_string(BitBoard().to_string()) == BitBoard()
+
+
+def test_packed_moves_match_moves():
+    state = GameState()
+    rng = random.Random(13)
+    bb = BitBoard()
+    color = BLACK
+    buffer = [0]
+    for _ in range(80):
+        moves = state.get_legal_actions(color, bb)
+        packed = state.get_packed_actions(color, bb, buffer)
+        assert packed is buffer
+        assert [Move.from_packed(m) for m in packed] == moves
+        assert [m.pack() for m in moves] == packed
+        for move in packed:
+            captured = move >> MOVE_CAPTURE_SHIFT
+            squares = [SQUARE_INDEX[s] for s in Move.from_packed(move).squares()]
+            hops = zip(squares, squares[1:])
+            assert captured == sum(1 << JUMPED[hop] for hop in hops if hop in JUMPED)
+            assert unpack_move(move) == (squares[0], squares[-1])
+        if not packed:
+            break
+        state.make_packed_move(bb, rng.choice(packed))
+        color = RED if color == BLACK else BLACK
@@ -36,3 +36,50 @@ def test_board_move_and_set_piece():
     b.set_piece(4, 4, newp)
     assert b.get_piece(4, 4) is newp
     assert newp.row == 4 and newp.col == 4
+
+
+def test_make_and_unmake_move_restores_capture_and_promotion():
+    from checker import Move
+
+    b = Board()
+    for r in range(ROWS):
+        for c in range(COLS):
+            b.set_piece(r, c, 0)
+    black = Piece(6, 1, BLACK)
+    red = Piece(7, 2, RED)
+    b.set_piece(6, 1, black)
+    b.set_piece(5, 2, Piece(5, 2, RED))
+    b.set_piece(7, 2, red)
+
+    # plain move onto the promotion row
+    b.make_move(Move(start=(6, 1), end=(7, 0)))
+    assert b.get_piece(7, 0) is black and black.king
+    b.unmake_move()
+    assert b.get_piece(6, 1) is black and not black.king
+    assert b.get_piece(7, 0) == 0
+
+    # red jumps the black piece and gets it back on undo
+    b.make_move(Move(start=(7, 2), end=(5, 0)))
+    assert b.get_piece(6, 1) == 0
+    b.unmake_move()
+    assert b.get_piece(6, 1) is black and black.row == 6 and black.col == 1
+    assert b.get_piece(7, 2) is red
+    assert b.undo_stack == []
+
+
+def test_make_and_unmake_capture_chain():
+    from bitboard import BitBoard
+    from checker import GameState
+
+    b = BitBoard.from_string("b.../..r./.r../..rr/.B../..rr/.r../r...").to_board()
+    before = BitBoard.from_board(b)
+    move = GameState().get_legal_actions(BLACK, b)[1]
+    assert len(move.captures()) == 4
+
+    king = b.get_piece(4, 3)
+    b.make_move(move)
+    assert b.get_piece(0, 3) is king
+    assert all(b.get_piece(r, c) == 0 for r, c in move.captures())
+    b.unmake_move()
+    assert BitBoard.from_board(b) == before
+    assert b.get_piece(4, 3) is king
@@ -0,0 +1,123 @@
+import json
+import random
+
+from agent import Agent, SCORE_MAX
+from bitboard import BitBoard, SQUARE_INDEX
+from book import RESULT_SCALE, OpeningBook, build_from_games, build_from_search, write_book
+from checker import GameState
+from constants import BLACK, RED
+from tournament import PlayerSpec, run_tournament
+
+
+def start_entries():
+    moves = GameState().get_legal_actions(BLACK, BitBoard())
+    return {BitBoard().key(BLACK): [(moves[0], 1, 0.0), (moves[1], 30, 0.5)]}, moves
+
+
+def test_write_and_probe(tmp_path):
+    entries, moves = start_entries()
+    path = str(tmp_path / "book.bin")
+    assert write_book(path, entries) == 2
+
+    book = OpeningBook(path)
+    assert book.size == 2
+    assert sorted(book.probe(BitBoard(), BLACK), key=lambda e: e[1]) == [
+        (moves[0], 1, 0.0),
+        (moves[1], 30, 0.5),
+    ]
+    # same pieces with the other side to move is a different position
+    assert book.probe(BitBoard(), RED) == []
+    book.close()
+
+
+def test_choose_best_and_weighted(tmp_path):
+    entries, moves = start_entries()
+    path = str(tmp_path / "book.bin")
+    write_book(path, entries)
+    book = OpeningBook(path)
+
+    assert book.choose(BitBoard(), BLACK) == (moves[1], 0.5)
+    rng = random.Random(0)
+    picks = [book.choose(BitBoard(), BLACK, rng)[0] for _ in range(200)]
+    assert 0 < picks.count(moves[0]) < picks.count(moves[1])
+    assert picks.count(moves[0]) + picks.count(moves[1]) == len(picks)
+    book.close()
+
+
+def test_build_from_search_books_the_best_move():
+    entries = build_from_search(depth=2, plies=2, margin=0.0)
+    start = entries[BitBoard().key(BLACK)]
+    agent = Agent(BLACK, depth=2)
+    best_move, best_score = agent.get_best_move(BitBoard())
+    assert all(score == best_score for _, _, score in start)
+    assert best_move in [move for move, _, _ in start]
+    # the replies to every booked move are in the book too
+    assert len(entries) == 1 + len(start)
+
+
+def test_build_from_games(tmp_path):
+    players = [PlayerSpec("a", depth=1), PlayerSpec("b", depth=1)]
+    summary = run_tournament(
+        players, 4, opening_plies=0, workers=1, results_path=str(tmp_path / "games.jsonl")
+    )
+    with open(summary["results_path"], encoding="utf-8") as f:
+        games = [json.loads(line) for line in f]
+    assert all(len(game["moves"]) == game["plies"] for game in games)
+
+    entries = build_from_games([summary["results_path"]], plies=2, min_games=1)
+    start = entries[BitBoard().key(BLACK)]
+    assert sum(weight for _, weight, _ in start) == len(games)
+
+
+def test_build_from_games_skips_random_openings(tmp_path):
+    players = [PlayerSpec("a", depth=1), PlayerSpec("b", depth=2)]
+    summary = run_tournament(
+        players, 4, opening_plies=2, workers=1, results_path=str(tmp_path / "games.jsonl")
+    )
+    with open(summary["results_path"], encoding="utf-8") as f:
+        games = [json.loads(line) for line in f]
+    assert all(game["opening_plies"] == 2 for game in games)
+
+    # each random opening is played twice, but none of its moves is booked
+    entries = build_from_games([summary["results_path"]], plies=4)
+    state = GameState()
+    for game in games:
+        board, color = BitBoard(), BLACK
+        for squares in game["moves"][:2]:
+            assert board.key(color) not in entries
+            move = next(
+                m for m in state.get_legal_actions(color, board)
+                if [SQUARE_INDEX[s] for s in m.squares()] == squares
+            )
+            board = state.generate_successor(board, move)
+            color = RED if color == BLACK else BLACK
+    assert entries
+
+    # scores are on the search's scale, but never claim a proven win or loss
+    for moves in entries.values():
+        for _, weight, score in moves:
+            assert weight >= 2
+            assert -RESULT_SCALE <= score <= RESULT_SCALE
+            assert -SCORE_MAX < score < SCORE_MAX
+
+
+def test_agent_plays_book_moves(tmp_path):
+    entries, moves = start_entries()
+    path = str(tmp_path / "book.bin")
+    write_book(path, entries)
+
+    agent = Agent(BLACK, depth=4, book=path)
+    move, score = agent.get_best_move(BitBoard())
+    assert (move, score) == (moves[1], 0.5)
+    assert agent.get_statistics()["book_move"]
+    assert agent.nodes_explored == 0
+    # the first search out of book starts from the book move's score
+    assert agent.last_score == 0.5
+
+    # out of book the agent searches as usual
+    board = BitBoard()
+    GameState().make_move(board, moves[1])
+    agent = Agent(RED, depth=2, book=path)
+    agent.get_best_move(board)
+    assert not agent.get_statistics()["book_move"]
+    agent.close()
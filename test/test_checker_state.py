@@ -28,14 +28,6 @@ def test_get_legal_actions_initial_board():
     assert len(actions) > 0
 
 
-def test_range_and_jump_check():
-    b = Board()
-    state = GameState()
-    # out of range positions
-    assert not state.range_check(-1, 0)
-    assert not state.range_check(ROWS:=8, 0)  # using ROWS from constants isn't necessary here
-
-
 def test_copy_board_is_independent():
     b = Board()
     # pick an initial piece
@@ -109,3 +101,55 @@ def test_generate_successor_promotion_and_original_unchanged():
     # original should remain non-king at original pos
     assert b.get_piece(1, 2) is p
     assert not p.king
+
+
+def test_get_node_status_matches_terminal_checks():
+    from checker import NodeStatus
+    from bitboard import BitBoard
+    from piece import Piece
+
+    def board_with(*pieces):
+        b = Board()
+        for r in range(8):
+            for c in range(8):
+                b.set_piece(r, c, 0)
+        for r, c, color, king in pieces:
+            p = Piece(r, c, color)
+            if king:
+                p.make_king()
+            b.set_piece(r, c, p)
+        return b
+
+    gs = GameState()
+    cases = [
+        (Board(), BLACK, NodeStatus.ONGOING),
+        (board_with((3, 2, BLACK, False)), BLACK, NodeStatus.WIN),
+        # black man blocked on the back rank by red: no legal moves
+        (board_with((7, 0, BLACK, False), (0, 1, RED, False)), BLACK, NodeStatus.LOSE),
+        (board_with((3, 2, BLACK, True), (5, 4, RED, True)), RED, NodeStatus.DRAW),
+        (board_with((3, 2, BLACK, True), (5, 4, RED, False)), RED, NodeStatus.ONGOING),
+    ]
+    for b, color, expected in cases:
+        for board in (b, BitBoard.from_board(b)):
+            status, moves = gs.get_node_status(color, board)
+            assert status == expected
+            assert len(moves) == len(gs.get_legal_actions(color, board))
+            assert bool(gs.is_terminal(color, board)) == (expected != NodeStatus.ONGOING)
+
+
+
+def test_move_tables_stay_on_dark_squares():
+    from checker import MOVE_TABLES
+    from bitboard import SQUARE_INDEX
+
+    for color in (BLACK, RED):
+        men, kings = MOVE_TABLES[color]
+        for (r, c) in SQUARE_INDEX:
+            assert set(men[r][c]) <= set(kings[r][c])
+            for end, over in kings[r][c]:
+                assert end in SQUARE_INDEX
+                assert over is None or over in SQUARE_INDEX
+
+    # steps before jumps, left before right, nothing off the board
+    assert MOVE_TABLES[BLACK][0][0][1] == (((1, 0), None), ((1, 2), None), ((2, 3), (1, 2)))
+    assert len(MOVE_TABLES[RED][1][3][4]) == 8
@@ -18,3 +18,31 @@ def test_select_move_toggles_turn():
     moved = g.select(3, 0)  # attempt move
     assert moved is True
     assert g.get_current_player() != start
+
+
+def _game_from_string(text):
+    from bitboard import BitBoard
+
+    g = Game(None)
+    g.board = BitBoard.from_string(text).to_board()
+    return g
+
+
+def test_capture_is_mandatory():
+    g = _game_from_string("..../..../.b../.r../..../..../..../....")
+    assert g.select(2, 3) is True
+    assert g.select(3, 4) is False  # a step while a jump is available
+    assert g.select(2, 3) is True
+    assert g.select(4, 1) is True
+    assert g.board.get_piece(3, 2) == 0
+
+
+def test_select_plays_whole_chain():
+    # two chains of the king end on (0, 3); the path picks the longer one
+    g = _game_from_string("b.../..r./.r../..rr/.B../..rr/.r../r...")
+    g.selected = g.board.get_piece(4, 3)
+    assert g._move(0, 3, [(6, 5), (4, 7), (2, 5)]) is True
+    for square in [(5, 4), (5, 6), (3, 6), (1, 4)]:
+        assert g.board.get_piece(*square) == 0
+    assert g.board.get_piece(3, 4) != 0
+    assert g.board.get_piece(0, 3).king
@@ -0,0 +1,41 @@
+from bitboard import BitBoard, SQUARE_INDEX
+from checker import Move
+from constants import BLACK, RED
+from ordering import MoveOrderer
+
+
+def bits(*squares):
+    return sum(1 << SQUARE_INDEX[sq] for sq in squares)
+
+
+def test_captures_and_promotions_first():
+    board = BitBoard(black=bits((2, 1), (6, 3)), red=bits((3, 2)))
+    quiet = Move(start=(2, 1), end=(3, 0)).pack()
+    capture = Move(start=(2, 1), end=(4, 3)).pack()
+    promote = Move(start=(6, 3), end=(7, 2)).pack()
+
+    ordered = MoveOrderer().order(board, BLACK, [quiet, promote, capture], ply=1)
+    assert ordered == [capture, promote, quiet]
+
+
+def test_tt_move_killers_and_history():
+    board = BitBoard()
+    moves = [
+        Move(start=(5, 0), end=(4, 1)),
+        Move(start=(5, 2), end=(4, 1)),
+        Move(start=(5, 2), end=(4, 3)),
+        Move(start=(5, 4), end=(4, 3)),
+    ]
+    moves = [move.pack() for move in moves]
+    orderer = MoveOrderer()
+    orderer.record_cutoff(RED, moves[3], depth=2, ply=3)
+    orderer.record_cutoff(RED, moves[2], depth=1, ply=5)
+
+    # killer at ply 3 first, then history (depth 2 cutoff beats depth 1), then scan order
+    assert orderer.order(board, RED, list(moves), ply=3) == [moves[3], moves[2], moves[0], moves[1]]
+    # the table move beats everything
+    assert orderer.order(board, RED, list(moves), ply=3, tt_move=moves[1])[0] == moves[1]
+
+    orderer.new_search()
+    assert orderer.killers[3] == [None, None]
+    assert orderer.history[(RED, moves[3])] == 2
@@ -0,0 +1,41 @@
+import math
+import multiprocessing
+
+import parallel
+from agent import Agent
+from bitboard import BitBoard
+from constants import BLACK
+from positions import random_position
+
+
+def test_parallel_root_search_matches_serial():
+    for search_type in ("minimax", "expectimax", "pvs", "mtdf"):
+        for seed in range(3):
+            board, color = random_position(seed, 12)
+            serial = Agent(color, depth=3, search_type=search_type)
+            parallel = Agent(color, depth=3, search_type=search_type, workers=2)
+            try:
+                assert parallel.get_best_move(board) == serial.get_best_move(board)
+                assert parallel.get_statistics()["nodes_explored"] > 0
+            finally:
+                parallel.close()
+
+
+def test_worker_starts_a_new_search_per_agent_search():
+    parallel._init_worker(Agent, {"color": BLACK}, multiprocessing.Value("d", -math.inf))
+    worker = parallel._agent
+    board = BitBoard()
+    position = (board.black, board.red, board.kings)
+    moves = board.packed_moves(BLACK, [])
+
+    parallel._search_root_move(position, moves[0], 4, None, 1)
+    generation = worker.tt.generation
+    worker.orderer.killers[60][0] = moves[0]
+    # later moves of the same search keep the table and killers
+    parallel._search_root_move(position, moves[1], 4, None, 1)
+    assert worker.tt.generation == generation
+    assert worker.orderer.killers[60][0] == moves[0]
+    # the next search of the agent ages them
+    parallel._search_root_move(position, moves[1], 4, None, 2)
+    assert worker.tt.generation == generation + 1
+    assert worker.orderer.killers[60][0] != moves[0]
@@ -0,0 +1,28 @@
+import pytest
+
+from checker import GameState
+from perft import POSITIONS, divide, load_position, perft
+
+
+@pytest.mark.parametrize("name", sorted(POSITIONS))
+def test_known_counts(name):
+    state = GameState()
+    board, color = load_position(name)
+    for depth, expected in sorted(POSITIONS[name][2].items()):
+        if depth <= 4:
+            assert perft(state, board, color, depth) == expected
+
+
+@pytest.mark.parametrize("name", sorted(POSITIONS))
+def test_board_counts_match(name):
+    state = GameState()
+    board, color = load_position(name, use_board=True)
+    assert perft(state, board, color, 3) == POSITIONS[name][2][3]
+
+
+def test_divide_sums_to_perft():
+    state = GameState()
+    board, color = load_position("middlegame")
+    split = divide(state, board, color, 3)
+    assert len(split) == POSITIONS["middlegame"][2][1]
+    assert sum(count for _, count in split) == POSITIONS["middlegame"][2][3]
@@ -1,21 +1,30 @@
+import pytest
+
 from piece import Piece
 from constants import SQUARE_WIDTH, RED
 
 
-def test_piece_move_and_position():
+def test_piece_move():
     p = Piece(2, 3, RED)
-    # initial coords
     assert p.row == 2 and p.col == 3
-    # calc_pos should set x/y based on col/row
-    p.calc_pos()
-    expected_x = SQUARE_WIDTH * p.col + SQUARE_WIDTH // 2
-    expected_y = SQUARE_WIDTH * p.row + SQUARE_WIDTH // 2
-    assert p.x == expected_x and p.y == expected_y
-
-    # move updates row/col and recalculates position
     p.move(4, 1)
     assert p.row == 4 and p.col == 1
-    assert p.x == SQUARE_WIDTH * 1 + SQUARE_WIDTH // 2
+
+
+def test_piece_is_slotted():
+    p = Piece(2, 3, RED)
+    assert not hasattr(p, "__dict__")
+    with pytest.raises(AttributeError):
+        p.x = 0
+
+
+def test_square_center():
+    render = pytest.importorskip("render")
+    p = Piece(4, 1, RED)
+    assert render.square_center(p.row, p.col) == (
+        SQUARE_WIDTH * 1 + SQUARE_WIDTH // 2,
+        SQUARE_WIDTH * 4 + SQUARE_WIDTH // 2,
+    )
 
 
 def test_make_king_flag():
@@ -0,0 +1,55 @@
+import struct
+
+from agent import Agent
+from checker import Move
+from positions import random_position
+from smp import ENTRY, SharedTranspositionTable
+from transposition import EXACT, LOWER
+
+
+def test_shared_table_round_trip():
+    table = SharedTranspositionTable(1024)
+    other = SharedTranspositionTable(1024, name=table.name)
+    try:
+        key = 0xDEADBEEF12345678
+        # a jump, so the captured-square bits are stored too
+        move = Move(start=(2, 1), end=(4, 3)).pack()
+        table.store(key, 3, -1.5, EXACT, move)
+        # visible from another attachment of the same block
+        assert other.probe(key) == (key, 3, -1.5, EXACT, move, 0)
+        # same slot, different key: a miss
+        assert other.probe(key ^ (1 << 40)) is None
+
+        # a shallower result of the same search does not replace a deeper one
+        table.store(key, 2, 4.0, LOWER, None)
+        assert table.probe(key)[1] == 3
+        table.new_search()
+        table.store(key, 2, 4.0, LOWER, None)
+        assert table.probe(key) == (key, 2, 4.0, LOWER, None, 1)
+    finally:
+        other.close()
+        table.close()
+
+
+def test_torn_entry_is_rejected():
+    table = SharedTranspositionTable(16)
+    try:
+        table.store(7, 4, 2.5, EXACT, None)
+        # another process has written its score but not yet its check word
+        offset = (7 & table.mask) * ENTRY.size
+        struct.pack_into("<d", table._buf, offset + 16, 9.5)
+        assert table.probe(7) is None
+    finally:
+        table.close()
+
+
+def test_lazy_smp_matches_serial():
+    for seed in range(3):
+        board, color = random_position(seed, 12)
+        serial = Agent(color, depth=4)
+        smp = Agent(color, depth=4, workers=3, parallel_mode="lazy_smp")
+        try:
+            assert smp.get_best_move(board) == serial.get_best_move(board)
+            assert smp.get_statistics()["helper_nodes"] > 0
+        finally:
+            smp.close()
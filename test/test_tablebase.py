@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from agent import Agent
+from bitboard import BitBoard
+from checker import GameState, NodeStatus
+from constants import BLACK, RED
+from tablebase import (
+    HEADER,
+    Tablebase,
+    generate,
+    index_of,
+    position_of,
+    signature_size,
+    signatures,
+    table_path,
+)
+
+
+@pytest.fixture(scope="module")
+def directory(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebases"))
+    generate(2, path, workers=1)
+    generate(3, path, kings_only=True, workers=1)
+    return path
+
+
+def test_index_round_trip():
+    rng = random.Random(0)
+    for sig in signatures(4):
+        for index in rng.sample(range(signature_size(sig)), 50):
+            position = position_of(sig, index)
+            if position is not None:
+                assert index_of(sig, *position) == index
+
+
+def test_results_are_consistent_with_moves(directory):
+    # every stored result must follow from the results after each legal move
+    state = GameState()
+    table = Tablebase(directory)
+    rng = random.Random(1)
+    for sig in signatures(2) + signatures(3, kings_only=True):
+        for index in rng.sample(range(signature_size(sig)), 200):
+            position = position_of(sig, index)
+            if position is None:
+                continue
+            for color, opponent in ((BLACK, RED), (RED, BLACK)):
+                board = BitBoard(*position)
+                status, moves = state.get_node_status(color, board)
+                if status != NodeStatus.ONGOING:
+                    assert table.probe_board(board, color) == (status, 0)
+                    continue
+                replies = [
+                    table.probe_board(state.generate_successor(board, move), opponent)
+                    for move in moves
+                ]
+                losses = [d for s, d in replies if s == NodeStatus.LOSE]
+                if losses:
+                    expected = (NodeStatus.WIN, min(losses) + 1)
+                elif all(s == NodeStatus.WIN for s, _ in replies):
+                    expected = (NodeStatus.LOSE, max(d for _, d in replies) + 1)
+                else:
+                    expected = (NodeStatus.DRAW, 0)
+                assert table.probe_board(board, color) == expected
+    table.close()
+
+
+def test_agent_converts_won_endgame(directory):
+    state = GameState()
+    board = BitBoard.from_string("B.../..../..B./..../..../..../..../...R")
+    agents = {color: Agent(color, depth=2, tablebase=directory) for color in (BLACK, RED)}
+    status, distance = agents[BLACK].tablebase.probe_board(board, BLACK)
+    assert status == NodeStatus.WIN
+
+    color = BLACK
+    for _ in range(distance):
+        move, score = agents[color].get_best_move(board)
+        assert score == (1000 if color == BLACK else -1000)
+        board = state.generate_successor(board, move)
+        color = RED if color == BLACK else BLACK
+    assert state.get_node_status(RED, board)[0] == NodeStatus.LOSE
+
+
+def test_other_rules_version_is_ignored(directory, tmp_path):
+    sig = (0, 2, 0, 1)
+    with open(table_path(directory, sig), "rb") as f:
+        data = bytearray(f.read())
+    magic, version, *rest = HEADER.unpack_from(data)
+    HEADER.pack_into(data, 0, magic, version + 1, *rest)
+    with open(table_path(str(tmp_path), sig), "wb") as f:
+        f.write(data)
+
+    board = BitBoard.from_string("B.../..../..B./..../..../..../..../...R")
+    assert Tablebase(directory).probe_board(board, BLACK) is not None
+    assert Tablebase(str(tmp_path)).probe_board(board, BLACK) is None
+
+
+def test_blocked_side_loses_with_equal_kings(directory):
+    # 14 kings each; BLACK has no move, RED has
+    board = BitBoard.from_string("BR../BB../RRRR/BRRR/BRBB/BBBB/BRBR/BRRR")
+    state = GameState()
+    tablebase = Tablebase(directory)
+    # no table is read for an equal-kings position, only the piece limit applies
+    tablebase.max_pieces = 32
+    for color in (BLACK, RED):
+        expected = state.get_node_status(color, board)[0]
+        assert tablebase.probe_board(board, color) == (expected, 0)
+    assert tablebase.probe_board(board, BLACK)[0] == NodeStatus.LOSE
+    assert tablebase.probe_board(board, RED)[0] == NodeStatus.DRAW
@@ -0,0 +1,36 @@
+import json
+import math
+
+import pytest
+
+from tournament import PlayerSpec, elo_difference, parse_player, run_tournament
+
+
+def test_parse_player():
+    assert parse_player("name=d6,depth=6,search=expectimax") == PlayerSpec(
+        "d6", depth=6, search_type="expectimax"
+    )
+    assert parse_player("movetime=0.5").movetime == 0.5
+    with pytest.raises(ValueError):
+        parse_player("name=x,width=3")
+
+
+def test_elo_difference():
+    assert elo_difference(5, 10, 5)[0] == 0
+    elo, margin = elo_difference(30, 0, 10)
+    assert elo == pytest.approx(400 * math.log10(3))
+    assert 0 < margin < math.inf
+    assert elo_difference(4, 0, 0) == (math.inf, math.inf)
+
+
+def test_tournament_alternates_colors(tmp_path):
+    players = [PlayerSpec("d1", depth=1), PlayerSpec("d2", depth=2)]
+    path = tmp_path / "games.jsonl"
+    summary = run_tournament(players, 4, workers=1, results_path=str(path), max_turns=30)
+
+    games = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(games) == summary["games"] == 4
+    # game pairs share an opening with colors swapped
+    assert [g["black"] for g in games] == ["d1", "d2", "d1", "d2"]
+    assert games[0]["opening_seed"] == games[1]["opening_seed"]
+    assert sum(summary["matchups"][("d1", "d2")]) == 4
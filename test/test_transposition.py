@@ -0,0 +1,69 @@
+import random
+
+from bitboard import BitBoard
+from checker import GameState, Move
+from constants import BLACK, RED
+from transposition import TranspositionTable, EXACT, LOWER
+
+
+def test_incremental_hash_matches_full_hash():
+    state = GameState()
+    rng = random.Random(5)
+    bb = BitBoard()
+    color = BLACK
+    for _ in range(80):
+        moves = state.get_legal_actions(color, bb)
+        if not moves:
+            break
+        before = bb.hash
+        state.make_move(bb, rng.choice(moves))
+        assert bb.hash == bb.compute_hash()
+        state.unmake_move(bb)
+        assert bb.hash == before
+        state.make_move(bb, rng.choice(moves))
+        color = RED if color == BLACK else BLACK
+
+
+def test_key_depends_on_side_to_move():
+    bb = BitBoard()
+    assert bb.key(BLACK) != bb.key(RED)
+    assert bb.key(BLACK) == bb.hash
+
+
+def test_transpositions_share_a_hash():
+    state = GameState()
+    moves = [
+        Move(start=(2, 1), end=(3, 0)),
+        Move(start=(5, 0), end=(4, 1)),
+        Move(start=(2, 3), end=(3, 2)),
+        Move(start=(5, 2), end=(4, 3)),
+    ]
+    a = BitBoard()
+    for move in moves:
+        a = state.generate_successor(a, move)
+    b = BitBoard()
+    for move in moves[2:] + moves[:2]:
+        b = state.generate_successor(b, move)
+
+    assert a == b
+    assert a.hash == b.hash != BitBoard().hash
+
+
+def test_table_store_probe_and_replacement():
+    tt = TranspositionTable(size=4)
+    assert tt.size == 4
+    assert tt.probe(123) is None
+
+    tt.store(123, 3, 1.5, EXACT, None)
+    assert tt.probe(123)[1:4] == (3, 1.5, EXACT)
+
+    # a shallower result from the same search does not replace a deeper one
+    tt.store(123 + 4, 2, 0.0, LOWER, None)
+    assert tt.probe(123 + 4) is None
+    assert tt.probe(123) is not None
+
+    # results from an earlier search are always replaced
+    tt.new_search()
+    tt.store(123 + 4, 1, 0.0, LOWER, None)
+    assert tt.probe(123 + 4)[1] == 1
+    assert tt.probe(123) is None
@@ -0,0 +1,335 @@
+"""
+Headless Tournament Runner
+
+Plays many engine-vs-engine games across a process pool to measure whether
+an engine change is an improvement. Games are played on BitBoards without a
+display, logging or move delays, under the same rules as
+main.run_agent_game: the game ends on a win, loss or equal-kings draw, on
+threefold repetition, or after MAX_TURNS moves.
+
+Every pair of players meets in game pairs. Both games of a pair start from
+the same randomized opening (a few random plies), with colors swapped, so
+neither player profits from a lucky opening. Each game uses fresh agents,
+so results do not depend on which games share a worker process.
+
+Results are appended to a JSON lines file as games finish, one object per
+game, and summarized as win/draw/loss counts and an Elo difference with a
+95% error margin.
+"""
+
+import importlib
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import combinations
+
+from agent import Agent
+from bitboard import BitBoard, SQUARE_INDEX
+from checker import GameState, NodeStatus
+from constants import BLACK, RED
+
+# Same limit as main.run_agent_game
+MAX_TURNS = 200
+# z-score of the 95% confidence interval
+Z_95 = 1.96
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    """
+    Configuration of one tournament player.
+
+    Attributes:
+      name: Name used in results and reports
+      depth: Fixed search depth
+      search_type: "minimax", "expectimax", "pvs" or "mtdf"
+      movetime: Seconds per move for iterative deepening, or None for fixed depth
+      agent_class: "module:Class" of an Agent subclass, e.g. one with a
+                   different evaluate(), or None for Agent itself
+      book: Opening book file, played with weighted random choice, or None
+      quiescence: Capture plies searched past `depth` (0 for none)
+    """
+
+    name: str
+    depth: int = 4
+    search_type: str = "minimax"
+    movetime: float = None
+    agent_class: str = None
+    book: str = None
+    quiescence: int = 0
+
+    def create(self, color, rng=None):
+        """Build this player's agent for `color`, choosing book moves with `rng`."""
+        cls = Agent
+        if self.agent_class is not None:
+            module, _, name = self.agent_class.partition(":")
+            cls = getattr(importlib.import_module(module), name)
+        return cls(
+            color,
+            depth=self.depth,
+            search_type=self.search_type,
+            movetime=self.movetime,
+            book=self.book,
+            book_rng=rng,
+            quiescence=self.quiescence,
+        )
+
+
+def parse_player(text):
+    """
+    Parse a player from the command line.
+
+    The format is a comma-separated list of key=value pairs with the keys
+    name, depth, search, movetime, agent, book and quiescence, for example
+    "name=d6,depth=6,search=minimax" or "name=new,agent=my_eval:MyAgent".
+    Missing keys take PlayerSpec's defaults; the name defaults to the text.
+
+    Raises:
+      ValueError: If a key is unknown or a value is malformed
+    """
+    fields = {"name": text}
+    for item in text.split(","):
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep:
+            raise ValueError(f"Expected key=value in player spec, got {item!r}")
+        if key == "name":
+            fields["name"] = value
+        elif key == "depth":
+            fields["depth"] = int(value)
+        elif key == "search":
+            fields["search_type"] = value
+        elif key == "movetime":
+            fields["movetime"] = float(value)
+        elif key == "agent":
+            fields["agent_class"] = value
+        elif key == "book":
+            fields["book"] = value
+        elif key == "quiescence":
+            fields["quiescence"] = int(value)
+        else:
+            raise ValueError(f"Unknown player spec key: {key!r}")
+    return PlayerSpec(**fields)
+
+
+def play_game(game_id, black, red, opening_seed, opening_plies, max_turns=MAX_TURNS):
+    """
+    Play one headless game.
+
+    Args:
+      game_id: Number of the game within the tournament
+      black, red: PlayerSpec of each side
+      opening_seed: Seed for the random opening moves
+      opening_plies: Number of random moves played before the agents take over
+      max_turns: Moves after which the game is a draw
+
+    Returns:
+      dict: The game record: game, black, red, result (1, 0.5 or 0 from
+            BLACK's point of view), reason, plies, moves (the square
+            indices each move stands on, from start to end), opening_seed,
+            opening_plies (how many of the moves were random) and seconds
+    """
+    start_time = time.perf_counter()
+    game_state = GameState()
+    # the same seed drives the random opening and the book choices
+    rng = random.Random(opening_seed)
+    agents = {BLACK: black.create(BLACK, rng), RED: red.create(RED, rng)}
+
+    board = BitBoard()
+    color = BLACK
+    plies = 0
+    position_history = {}
+    played = []
+    result, reason = 0.5, f"Maximum turns ({max_turns}) reached"
+
+    while plies < max_turns:
+        status, moves = game_state.get_node_status(color, board)
+        if status == NodeStatus.WIN:
+            result, reason = (1 if color == BLACK else 0), "Opponent has no pieces remaining"
+            break
+        elif status == NodeStatus.LOSE:
+            result, reason = (0 if color == BLACK else 1), "Current player has no legal moves"
+            break
+        elif status == NodeStatus.DRAW:
+            result, reason = 0.5, "Draw - equal king count"
+            break
+
+        if plies < opening_plies:
+            move = rng.choice(moves)
+        else:
+            move, _ = agents[color].get_best_move(board)
+        game_state.make_move(board, move)
+        played.append([SQUARE_INDEX[square] for square in move.squares()])
+        plies += 1
+
+        # Threefold repetition, counted on piece placement like main.py
+        position_history[board.hash] = position_history.get(board.hash, 0) + 1
+        if position_history[board.hash] >= 3:
+            result, reason = 0.5, "Draw by threefold repetition"
+            break
+
+        color = RED if color == BLACK else BLACK
+
+    for agent in agents.values():
+        agent.close()
+    return {
+        "game": game_id,
+        "black": black.name,
+        "red": red.name,
+        "result": result,
+        "reason": reason,
+        "plies": plies,
+        "moves": played,
+        "opening_seed": opening_seed,
+        "opening_plies": opening_plies,
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def schedule_games(players, games_per_matchup, opening_plies, seed=0, max_turns=MAX_TURNS):
+    """
+    List the games of a round robin between `players`.
+
+    Every pair plays games_per_matchup games (rounded up to an even number),
+    as pairs that share an opening seed with colors swapped.
+
+    Returns:
+      list[tuple]: play_game arguments for every game
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for first, second in combinations(players, 2):
+        for _ in range((games_per_matchup + 1) // 2):
+            opening_seed = rng.getrandbits(32)
+            for black, red in ((first, second), (second, first)):
+                jobs.append((len(jobs), black, red, opening_seed, opening_plies, max_turns))
+    return jobs
+
+
+def elo_difference(wins, draws, losses):
+    """
+    Elo difference implied by a match result, with a 95% error margin.
+
+    Args:
+      wins, draws, losses: Results from the first player's point of view
+
+    Returns:
+      tuple: (elo, margin); elo is +/-inf for a perfect score and the
+             margin is inf when the interval reaches a perfect score
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, math.inf
+    score = (wins + draws / 2) / games
+    deviation = math.sqrt(
+        (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score**2) / games
+    )
+    error = Z_95 * deviation / math.sqrt(games)
+
+    def elo(p):
+        if p <= 0:
+            return -math.inf
+        if p >= 1:
+            return math.inf
+        return -400 * math.log10(1 / p - 1)
+
+    low, high = elo(score - error), elo(score + error)
+    margin = (high - low) / 2 if math.isfinite(low) and math.isfinite(high) else math.inf
+    return elo(score), margin
+
+
+def run_tournament(
+    players,
+    games_per_matchup,
+    opening_plies=4,
+    workers=None,
+    results_path=None,
+    seed=0,
+    max_turns=MAX_TURNS,
+    progress=None,
+):
+    """
+    Play a round robin between `players` and stream the games to disk.
+
+    Args:
+      players: PlayerSpec list (names must be unique)
+      games_per_matchup: Games each pair of players plays
+      opening_plies: Random moves at the start of every game (default: 4)
+      workers: Game processes (default: one per CPU); 1 plays in this process
+      results_path: JSON lines file for the game records (default: a
+                    timestamped file under logs/)
+      seed: Seed for the opening seeds, so a tournament can be replayed
+      max_turns: Moves after which a game is a draw
+      progress: Called with (games finished, games total) after every game
+
+    Returns:
+      dict: {"results_path", "games", "seconds", "games_per_second",
+             "matchups": {(first name, second name): [wins, draws, losses]}}
+             with results from the first player's point of view
+    """
+    names = [player.name for player in players]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Player names must be unique: {names}")
+    if results_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_path = os.path.join("logs", f"tournament_{timestamp}.jsonl")
+    directory = os.path.dirname(results_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    jobs = schedule_games(players, games_per_matchup, opening_plies, seed, max_turns)
+    order = {name: i for i, name in enumerate(names)}
+    matchups = {(a.name, b.name): [0, 0, 0] for a, b in combinations(players, 2)}
+
+    start_time = time.perf_counter()
+    with open(results_path, "w", encoding="utf-8") as out:
+
+        def record(game):
+            out.write(json.dumps(game) + "\n")
+            out.flush()
+            black_first = order[game["black"]] < order[game["red"]]
+            pair = (game["black"], game["red"]) if black_first else (game["red"], game["black"])
+            score = game["result"] if black_first else 1 - game["result"]
+            matchups[pair][0 if score == 1 else 1 if score == 0.5 else 2] += 1
+            if progress is not None:
+                progress(sum(map(sum, matchups.values())), len(jobs))
+
+        if workers == 1:
+            for job in jobs:
+                record(play_game(*job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(play_game, *job) for job in jobs]
+                for future in as_completed(futures):
+                    record(future.result())
+
+    seconds = time.perf_counter() - start_time
+    return {
+        "results_path": results_path,
+        "games": len(jobs),
+        "seconds": seconds,
+        "games_per_second": len(jobs) / seconds if seconds else 0.0,
+        "matchups": matchups,
+    }
+
+
+def format_report(summary):
+    """Lines of a human-readable report of run_tournament's summary."""
+    lines = []
+    for (first, second), (wins, draws, losses) in summary["matchups"].items():
+        elo, margin = elo_difference(wins, draws, losses)
+        lines.append(
+            f"{first} vs {second}: +{wins} ={draws} -{losses}  "
+            f"Elo {elo:+.1f} +/- {margin:.1f}"
+        )
+    lines.append(
+        f"{summary['games']} games in {summary['seconds']:.1f}s "
+        f"({summary['games_per_second']:.2f} games/s)"
+    )
+    lines.append(f"Results: {summary['results_path']}")
+    return lines
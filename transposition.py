@@ -0,0 +1,88 @@
+"""
+Zobrist Hashing and Transposition Table
+
+Zobrist keys give every (piece kind, square) pair and the side to move a
+random 64-bit number; a position's hash is the XOR of the keys of everything
+on it, so a move updates the hash with a few XORs instead of a rehash.
+
+The transposition table remembers the result of searching a position so the
+same position reached through a different move order is not searched again.
+"""
+
+import random
+
+# Bound types: how a stored score relates to the true minimax value
+EXACT = 0  # score is the exact value
+LOWER = 1  # search failed high: true value >= score
+UPPER = 2  # search failed low: true value <= score
+
+# Piece kinds used to index PIECE_KEYS
+BLACK_MAN, RED_MAN, BLACK_KING, RED_KING = range(4)
+
+# Fixed seed so hashes are identical across runs and processes
+_rng = random.Random(0x5EED)
+PIECE_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(32)) for _ in range(4))
+SIDE_KEY = _rng.getrandbits(64)  # XORed in when RED is to move
+
+
+class TranspositionTable:
+    """
+    Bounded hash table of search results keyed by Zobrist hash.
+
+    Each slot holds one entry tuple (key, depth, score, flag, best_move,
+    generation). The full key is kept to reject index collisions. A slot is
+    overwritten when it is empty, holds a result from an earlier search, or
+    holds a result searched no deeper than the new one.
+
+    Attributes:
+      size: Number of slots (rounded up to a power of two)
+      generation: Search counter bumped by new_search()
+      hits: Probes that found an entry for the key
+      probes: Total probes
+    """
+
+    def __init__(self, size=1 << 18):
+        """
+        Initialize an empty table.
+
+        Args:
+          size: Number of entries to hold (default: 262144)
+        """
+        self.size = 1 << max(0, (size - 1).bit_length())
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def new_search(self):
+        """Mark existing entries as belonging to a previous search."""
+        self.generation += 1
+        self.hits = 0
+        self.probes = 0
+
+    def clear(self):
+        """Drop every entry."""
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Returns:
+          tuple: (key, depth, score, flag, best_move, generation), or None
+        """
+        self.probes += 1
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        """Record the result of searching the position `key` to `depth`."""
+        index = key & self.mask
+        old = self.entries[index]
+        if old is None or old[5] != self.generation or old[1] <= depth:
+            self.entries[index] = (key, depth, score, flag, best_move, self.generation)